@@ -1,168 +1,559 @@
-from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-from fastapi import APIRouter, Query
-
-from ..models.db import SessionLocal
-from ..models.approvals import upsert_approval, get_approvals_map
-from ..schemas.reviews import ApproveRequest
-from ..services.hostaway_adapter import (
-    load_hostaway_reviews,
-    fetch_hostaway_live_reviews,
-    normalize_hostaway_items,
+import hashlib
+from dataclasses import replace
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..models.db import get_session
+from ..models.approvals import (
+    get_approvals_for,
+    upsert_approval,
+    upsert_approvals,
+)
+from ..models.category_drift import get_drift_alerts
+from ..models.feed_versions import get_feed_version
+from ..models.listing_stats import list_listings
+from ..models.review_search import build_fts_query
+from ..models.review_stats import compute_review_stats
+from ..models.review_trends import compute_review_trends
+from ..models.reviews import (
+    ReviewFilters,
+    decode_cursor,
+    encode_cursor,
+    query_review_page,
+    query_reviews,
 )
-from ..config import HOSTAWAY_LIVE_MODE
-from ..services.google_places import (
-    find_place_id_by_text,
-    fetch_place_details,
-    normalize_google_reviews,
+from ..models.writer import db_writer
+from ..schemas.reviews import ApproveRequest, BulkApproveRequest
+from ..services.ingest import (
+    awarm_source,
+    ingest_source,
+    resolve_source,
+    stored_source,
 )
+from ..services.change_feed import change_feed
+from ..services.export import (
+    EXPORT_MEDIA_TYPES,
+    STREAMERS,
+    iter_review_chunks,
+    parquet_available,
+)
+from ..services.google_cache import cached_place_details, cached_place_id
+from ..services.google_places import normalize_google_reviews
+from ..services.metrics import stage_timer
+from ..services.response_cache import response_cache
+from ..services.review_index import review_index
 
 
 router = APIRouter()
 
+# Page size when a request names no ``limit``; every list endpoint is paged
+DEFAULT_PAGE_SIZE = 200
+MAX_PAGE_SIZE = 1000
 
-@router.get("/reviews/hostaway")
-def get_hostaway_reviews(
+
+def _json(payload: Dict[str, Any]) -> JSONResponse:
+    """Render the body in the calling thread and time it as the serialize stage.
+
+    Rows are plain JSON types already, so FastAPI's encoder pass is skipped.
+    """
+    with stage_timer("serialize"):
+        return JSONResponse(payload)
+
+
+def _cached_json(
+    source: str, key: Hashable, render: Callable[[], Dict[str, Any]]
+) -> Response:
+    """Serve the body cached for ``key`` or render, serialize and cache it.
+
+    The generation is read before rendering, so a body built while the data
+    changed is never stored.
+    """
+    body = response_cache.get(source, key)
+    if body is not None:
+        return Response(content=body, media_type="application/json")
+    generation = response_cache.generation(source)
+    response = _json(render())
+    response_cache.put(source, key, generation, bytes(response.body))
+    return response
+
+
+def _parse_iso_ts(date_str: Optional[str]) -> Optional[float]:
+    if not date_str:
+        return None
+    try:
+        dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
+    except Exception:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def review_filters(
     listingId: Optional[str] = Query(default=None),
     startDate: Optional[str] = Query(default=None),
     endDate: Optional[str] = Query(default=None),
+    channel: Optional[str] = Query(default=None),
     type: Optional[str] = Query(default=None),  # host_to_guest | guest_to_host
     status: Optional[str] = Query(default=None),
     minRating: Optional[float] = Query(default=None),
     approved: Optional[bool] = Query(default=None),
     source: Optional[str] = Query(default=None, description="mock|live|auto"),
-) -> Dict[str, Any]:
-    """Return normalized Hostaway reviews with optional server-side filtering."""
-    session = SessionLocal()
+    q: Optional[str] = Query(
+        default=None,
+        description='Full-text search: words, "exact phrases", prefix*, AND/OR/NOT',
+    ),
+) -> ReviewFilters:
+    """Shared query parameters for endpoints filtering the review store.
+
+    ``source`` holds the requested source; handlers resolve it with
+    ``resolve_source`` before querying.
+    """
     try:
-        approvals = get_approvals_map(session)
-        use_source = (source or ("live" if HOSTAWAY_LIVE_MODE else "auto")).lower()
-
-        if use_source == "mock":
-            reviews = load_hostaway_reviews(approvals)
-        elif use_source == "live":
-            live_items = fetch_hostaway_live_reviews()
-            # If empty (sandbox), return empty normalized list
-            reviews = normalize_hostaway_items(live_items, approvals)
-        else:  # auto: try live, fall back to mock if empty
-            live_items = fetch_hostaway_live_reviews()
-            if live_items:
-                reviews = normalize_hostaway_items(live_items, approvals)
-            else:
-                reviews = load_hostaway_reviews(approvals)
-
-        def parse_iso(date_str: Optional[str]) -> Optional[datetime]:
-            if not date_str:
-                return None
+        text_query = build_fts_query(q)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return ReviewFilters(
+        source=source or "",
+        listing_id=listingId,
+        channel=channel,
+        review_type=type,
+        status=status,
+        min_rating=minRating,
+        approved=approved,
+        start_ts=_parse_iso_ts(startDate),
+        end_ts=_parse_iso_ts(endDate),
+        text_query=text_query,
+    )
+
+
+@router.get("/reviews/hostaway")
+async def get_hostaway_reviews(
+    filters: ReviewFilters = Depends(review_filters),
+    sort: Optional[str] = Query(
+        default=None,
+        description="date_desc|date_asc|rating_desc|rating_asc|relevance "
+        "(default: relevance with q, else date_desc)",
+    ),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Return normalized Hostaway reviews with optional server-side filtering.
+
+    Results are paged (``limit``, default DEFAULT_PAGE_SIZE); follow
+    ``nextCursor`` until it is null.
+    With ``q``, rows also carry a highlighted ``snippet`` of the matching text.
+    """
+    sort = sort or ("relevance" if filters.text_query else "date_desc")
+    with stage_timer("upstream"):
+        await awarm_source(filters.source)
+
+    def load() -> Response:
+        resolved = replace(filters, source=resolve_source(session, filters.source))
+
+        def render() -> Dict[str, Any]:
+            try:
+                with stage_timer("filter"):
+                    page = review_index.query(
+                        session, resolved, sort=sort, limit=limit, cursor=cursor
+                    )
+                    if page is None:
+                        page = query_review_page(
+                            session, resolved, sort=sort, limit=limit, cursor=cursor
+                        )
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            rows, next_cursor = page
+            return {"status": "success", "result": rows, "nextCursor": next_cursor}
+
+        key = ("hostaway", resolved, sort, limit, cursor)
+        return _cached_json(resolved.source, key, render)
+
+    return await run_in_threadpool(load)
+
+
+@router.get("/reviews/stats")
+async def get_review_stats(
+    filters: ReviewFilters = Depends(review_filters),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Portfolio and per-listing KPIs for the same filters as /reviews/hostaway."""
+    with stage_timer("upstream"):
+        await awarm_source(filters.source)
+
+    def load() -> Response:
+        resolved = replace(filters, source=resolve_source(session, filters.source))
+
+        def render() -> Dict[str, Any]:
+            with stage_timer("filter"):
+                stats = compute_review_stats(session, resolved)
+            return {"status": "success", "result": stats}
+
+        return _cached_json(resolved.source, ("stats", resolved), render)
+
+    return await run_in_threadpool(load)
+
+
+@router.get("/reviews/trends")
+async def get_review_trends(
+    filters: ReviewFilters = Depends(review_filters),
+    bucket: str = Query(default="month", description="day|week|month"),
+    window: int = Query(
+        default=1, ge=1, le=366, description="Rolling window, in buckets"
+    ),
+    groupBy: str = Query(default="portfolio", description="portfolio|listing"),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Review count, mean rating and category means per time bucket.
+
+    Takes the same filters as /reviews/hostaway. With ``window`` > 1 each
+    point also carries rolling means over the last ``window`` buckets.
+    """
+    if groupBy not in {"portfolio", "listing"}:
+        raise HTTPException(status_code=400, detail="groupBy must be portfolio|listing")
+    with stage_timer("upstream"):
+        await awarm_source(filters.source)
+
+    def load() -> Response:
+        resolved = replace(filters, source=resolve_source(session, filters.source))
+
+        def render() -> Dict[str, Any]:
+            try:
+                with stage_timer("filter"):
+                    trends = compute_review_trends(
+                        session,
+                        resolved,
+                        bucket=bucket,
+                        window=window,
+                        by_listing=groupBy == "listing",
+                    )
+            except ValueError as exc:
+                raise HTTPException(status_code=400, detail=str(exc))
+            return {"status": "success", "result": trends}
+
+        key = ("trends", resolved, bucket, window, groupBy)
+        return _cached_json(resolved.source, key, render)
+
+    return await run_in_threadpool(load)
+
+
+@router.get("/listings")
+async def get_listings(
+    source: Optional[str] = Query(default=None, description="mock|live|auto"),
+    q: Optional[str] = Query(default=None, description="Listing name prefix"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None),
+    session: Session = Depends(get_session),
+) -> JSONResponse:
+    """Listings with review counts, average rating and last review date.
+
+    Read from the maintained per-listing rollups; no review rows are loaded.
+    Paged by name like ``/reviews/hostaway``: follow ``nextCursor``.
+    """
+    with stage_timer("upstream"):
+        await awarm_source(source)
+
+    def load() -> JSONResponse:
+        store_source = resolve_source(session, source)
+        after = None
+        if cursor:
             try:
-                return datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            except Exception:
-                return None
-
-        start_dt = parse_iso(startDate)
-        end_dt = parse_iso(endDate)
-
-        filtered: List[Dict[str, Any]] = []
-        for r in reviews:
-            if listingId and r["listing_id"] != listingId:
-                continue
-            if type and r["type"] != type:
-                continue
-            if status and r["status"] != status:
-                continue
-            if minRating is not None:
-                if r["rating_overall"] is None or r["rating_overall"] < float(
-                    minRating
-                ):
-                    continue
-            if approved is not None and r.get("approved") is not None:
-                if bool(r["approved"]) != bool(approved):
-                    continue
-
-            # Date filtering
-            if start_dt or end_dt:
-                r_dt = parse_iso(r.get("submitted_at"))
-                if r_dt is None:
-                    continue
-                if start_dt and r_dt < start_dt:
-                    continue
-                if end_dt and r_dt > end_dt:
-                    continue
-
-            filtered.append(r)
-
-        return {"status": "success", "result": filtered}
-    finally:
-        session.close()
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Malformed cursor")
+            if len(after) != 2 or not all(isinstance(v, str) for v in after):
+                raise HTTPException(status_code=400, detail="Malformed cursor")
+        with stage_timer("filter"):
+            rows = list_listings(
+                session, store_source, name_prefix=q, limit=limit + 1, after=after
+            )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(
+                [rows[-1]["listing_name"], rows[-1]["listing_id"]]
+            )
+        return _json({"status": "success", "result": rows, "nextCursor": next_cursor})
+
+    return await run_in_threadpool(load)
+
+
+@router.get("/alerts")
+async def get_alerts(
+    source: Optional[str] = Query(default=None, description="mock|live|auto"),
+    listingId: Optional[str] = Query(default=None),
+    category: Optional[str] = Query(default=None, description="e.g. cleanliness"),
+    direction: Optional[str] = Query(default=None, description="down|up"),
+    flaggedOnly: bool = Query(default=True, description="false: every tracked row"),
+    session: Session = Depends(get_session),
+) -> JSONResponse:
+    """Listings whose recent category scores drifted from their baseline.
+
+    Read from the drift statistics maintained at ingest; largest deviation
+    first. ``direction=down`` keeps only sliding scores.
+    """
+    if direction not in {None, "down", "up"}:
+        raise HTTPException(status_code=400, detail="direction must be down|up")
+    with stage_timer("upstream"):
+        await awarm_source(source)
+
+    def load() -> JSONResponse:
+        store_source = resolve_source(session, source)
+        with stage_timer("filter"):
+            rows = get_drift_alerts(
+                session,
+                store_source,
+                listing_id=listingId,
+                category=category,
+                direction=direction,
+                flagged_only=flaggedOnly,
+            )
+        return _json({"status": "success", "result": rows})
+
+    return await run_in_threadpool(load)
+
+
+@router.get("/reviews/export")
+async def export_reviews(
+    filters: ReviewFilters = Depends(review_filters),
+    format: str = Query(default="ndjson", description="ndjson|csv|parquet"),
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """Stream every matching review in chunks; memory stays flat in the row count."""
+    if format not in STREAMERS:
+        raise HTTPException(status_code=400, detail="format must be ndjson|csv|parquet")
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=501, detail="parquet export requires the pyarrow package"
+        )
+    with stage_timer("upstream"):
+        await awarm_source(filters.source)
+
+    source = await run_in_threadpool(resolve_source, session, filters.source)
+    resolved = replace(filters, source=source)
+    filename = f"reviews-{resolved.source}.{format}"
+    return StreamingResponse(
+        STREAMERS[format](iter_review_chunks(resolved)),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/events")
+async def review_events(
+    request: Request,
+    source: Optional[str] = Query(
+        default=None, description="mock|live|auto; omit for every source"
+    ),
+    lastEventId: Optional[str] = Query(
+        default=None, description="Resume point when the header cannot be set"
+    ),
+    last_event_id: Optional[str] = Header(default=None),
+    session: Session = Depends(get_session),
+) -> StreamingResponse:
+    """Server-sent events for approval changes and new or changed reviews.
+
+    Events: ``approval`` (review_id, listing_id, approved), ``review`` (the
+    review as stored) and ``reset`` (the resume point is gone: refetch).
+    Reconnecting with ``Last-Event-ID`` replays what was missed from the
+    change log.
+    """
+    raw_id = last_event_id or lastEventId
+    try:
+        resume_id = int(raw_id) if raw_id else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer")
+    store_source = None
+    if source:
+        with stage_timer("upstream"):
+            await awarm_source(source)
+        store_source = await run_in_threadpool(resolve_source, session, source)
+    return StreamingResponse(
+        change_feed.stream(store_source, resume_id, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/reviews/google")
-def get_google_reviews(
+async def get_google_reviews(
     query: Optional[str] = Query(
         default=None, description="Text to find the place (e.g., property name + city)"
     ),
     placeId: Optional[str] = Query(default=None),
     listingId: Optional[str] = Query(default=None),
-) -> Dict[str, Any]:
-    session = SessionLocal()
-    try:
-        approvals = get_approvals_map(session)
-        pid = placeId or (find_place_id_by_text(query) if query else None)
-        if not pid:
-            return {"status": "success", "result": []}
-        place = fetch_place_details(pid)
-        # ensure place_id in result for stable IDs
-        if place and not place.get("place_id"):
-            place["place_id"] = pid
-        normalized = normalize_google_reviews(
-            place, approvals_map=approvals, listing_id=listingId
+    refresh: bool = Query(default=False, description="Bypass the Places cache"),
+    session: Session = Depends(get_session),
+) -> JSONResponse:
+    with stage_timer("upstream"):
+        pid = placeId or (
+            await cached_place_id(query, refresh=refresh) if query else None
         )
-        return {"status": "success", "result": normalized}
-    finally:
-        session.close()
+        place = await cached_place_details(pid, refresh=refresh) if pid else {}
+    if not pid:
+        return _json({"status": "success", "result": []})
+    # ensure place_id in result for stable IDs
+    if place and not place.get("place_id"):
+        place["place_id"] = pid
+    with stage_timer("normalize"):
+        normalized = normalize_google_reviews(place, listing_id=listingId)
+
+    def load() -> JSONResponse:
+        with stage_timer("approvals"):
+            approvals = get_approvals_for(session, (r["review_id"] for r in normalized))
+        for r in normalized:
+            r["approved"] = approvals.get(r["review_id"], False)
+        return _json({"status": "success", "result": normalized})
+
+    return await run_in_threadpool(load)
 
 
 @router.post("/reviews/approve")
 def approve_review(payload: ApproveRequest) -> Dict[str, Any]:
-    session = SessionLocal()
-    try:
-        upsert_approval(
-            session=session,
-            review_id=str(payload.review_id),
-            approved=bool(payload.approved),
-            channel=payload.channel or "hostaway",
-            listing_id=payload.listing_id,
+    with stage_timer("approvals"):
+        db_writer.run(
+            lambda session: upsert_approval(
+                session,
+                review_id=str(payload.review_id),
+                approved=bool(payload.approved),
+                channel=payload.channel or "hostaway",
+                listing_id=payload.listing_id,
+                commit=False,
+            )
+        )
+    return {"status": "success"}
+
+
+@router.post("/reviews/approve/bulk")
+def approve_reviews_bulk(payload: BulkApproveRequest) -> Dict[str, Any]:
+    """Apply many approval changes in a single transaction."""
+    items = [
+        {
+            "review_id": str(item.review_id),
+            "approved": bool(item.approved),
+            "channel": item.channel or "hostaway",
+            "listing_id": item.listing_id,
+        }
+        for item in payload.items
+    ]
+    with stage_timer("approvals"):
+        updated = db_writer.run(
+            lambda session: upsert_approvals(session, items, commit=False)
         )
-        return {"status": "success"}
-    finally:
-        session.close()
+    return {"status": "success", "result": {"updated": updated}}
+
+
+def _feed_validators(
+    session: Session, source: str, listing_id: Optional[str]
+) -> Tuple[str, Optional[str]]:
+    """Weak ETag and Last-Modified value of the selected feed for a listing."""
+    version, updated = get_feed_version(session, source, listing_id)
+    digest = hashlib.sha1(
+        f"{source}|{listing_id or '*'}|{version}".encode("utf-8")
+    ).hexdigest()[:20]
+    last_modified = format_datetime(updated, usegmt=True) if updated else None
+    return f'W/"{digest}"', last_modified
+
+
+def _not_modified(
+    etag: str,
+    last_modified: Optional[str],
+    if_none_match: Optional[str],
+    if_modified_since: Optional[str],
+) -> bool:
+    """Whether a conditional request may be answered with 304.
+
+    The ETag is authoritative: when If-None-Match is sent, If-Modified-Since
+    is ignored. Last-Modified has one-second resolution, so a feed changed
+    within the current second still counts as modified; another change in
+    that second would otherwise carry the same date and be missed.
+    """
+    if if_none_match is not None:
+        tags = {t.strip() for t in if_none_match.split(",")}
+        # Weak comparison: W/"x" and "x" name the same version
+        return "*" in tags or etag in tags or etag[2:] in tags
+    if if_modified_since and last_modified:
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        try:
+            modified = parsedate_to_datetime(last_modified)
+            return modified < now and modified <= parsedate_to_datetime(
+                if_modified_since
+            )
+        except (TypeError, ValueError):  # malformed or naive ("-0000") date
+            return False
+    return False
+
+
+def _cache_headers(etag: str, last_modified: Optional[str]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "public, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
 
 
 @router.get("/reviews/selected")
-def get_selected_reviews(
+async def get_selected_reviews(
     listingId: Optional[str] = Query(default=None),
     source: Optional[str] = Query(default=None, description="mock|live|auto"),
+    if_none_match: Optional[str] = Header(default=None),
+    if_modified_since: Optional[str] = Header(default=None),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Approved reviews for the public pages, with ETag/Last-Modified validators.
+
+    Conditional requests are answered from the per-listing feed version
+    alone: a match returns 304 without warming upstreams or querying reviews.
+    """
+    if if_none_match is not None or if_modified_since is not None:
+
+        def revalidate() -> Optional[Response]:
+            etag, last_modified = _feed_validators(
+                session, stored_source(session, source), listingId
+            )
+            if _not_modified(etag, last_modified, if_none_match, if_modified_since):
+                return Response(
+                    status_code=304, headers=_cache_headers(etag, last_modified)
+                )
+            return None
+
+        with stage_timer("revalidate"):
+            cached = await run_in_threadpool(revalidate)
+        if cached is not None:
+            return cached
+
+    with stage_timer("upstream"):
+        await awarm_source(source)
+
+    def load() -> JSONResponse:
+        store_source = resolve_source(session, source)
+        # Read the version first: a change landing in between only makes the
+        # next revalidation miss, never pins stale content to a new ETag
+        etag, last_modified = _feed_validators(session, store_source, listingId)
+        with stage_timer("filter"):
+            selected = query_reviews(
+                session,
+                ReviewFilters(source=store_source, listing_id=listingId, approved=True),
+            )
+        response = _json({"status": "success", "result": selected})
+        response.headers.update(_cache_headers(etag, last_modified))
+        return response
+
+    return await run_in_threadpool(load)
+
+
+@router.post("/reviews/ingest")
+def ingest_reviews(
+    source: str = Query(default="live", description="mock|live"),
 ) -> Dict[str, Any]:
-    session = SessionLocal()
-    try:
-        approvals = get_approvals_map(session)
-        use_source = (source or ("live" if HOSTAWAY_LIVE_MODE else "auto")).lower()
-
-        if use_source == "mock":
-            reviews = load_hostaway_reviews(approvals)
-        elif use_source == "live":
-            live_items = fetch_hostaway_live_reviews()
-            reviews = normalize_hostaway_items(live_items, approvals)
-        else:
-            live_items = fetch_hostaway_live_reviews()
-            if live_items:
-                reviews = normalize_hostaway_items(live_items, approvals)
-            else:
-                reviews = load_hostaway_reviews(approvals)
-        selected = [r for r in reviews if r.get("approved")]
-        if listingId:
-            selected = [r for r in selected if r["listing_id"] == listingId]
-        return {"status": "success", "result": selected}
-    finally:
-        session.close()
+    """Re-run the ingest step for a source, refreshing the review store."""
+    if source not in {"mock", "live"}:
+        raise HTTPException(status_code=400, detail="source must be mock or live")
+    count = ingest_source(source)
+    return {"status": "success", "result": {"source": source, "ingested": count}}
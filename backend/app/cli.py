@@ -0,0 +1,138 @@
+"""Maintenance commands, e.g. ``python -m backend.app.cli sync``.
+
+- ``sync``: page the Hostaway reviews feed into SQLite
+- ``sync-accounts``: fetch every HOSTAWAY_ACCOUNTS feed in parallel
+- ``listing-stats``: check or rebuild the per-listing rollups
+- ``snapshots``: rewrite every listing's static review snapshot
+- ``category-drift``: list drift alerts or replay the drift statistics
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import List, Optional
+
+from .config import HOSTAWAY_SYNC_CONCURRENCY, HOSTAWAY_SYNC_PAGE_SIZE
+from .models.category_drift import get_drift_alerts, rebuild_category_drift
+from .models.db import SessionLocal, create_db_and_tables
+from .models.listing_stats import check_listing_stats, rebuild_listing_stats
+from .models.sync_state import reset_sync_state
+from .services.hostaway_accounts import configured_accounts, ingest_accounts
+from .services.hostaway_sync import SYNC_NAME, sync_hostaway_reviews
+from .services.snapshots import snapshot_publisher
+
+
+def _cmd_sync(args: argparse.Namespace) -> int:
+    with SessionLocal() as session:
+        if args.full:
+            reset_sync_state(session, SYNC_NAME)
+        res = sync_hostaway_reviews(
+            session, page_size=args.page_size, concurrency=args.concurrency
+        )
+    print(
+        f"Synced {res.fetched} reviews over {res.pages} pages "
+        f"(high-water mark: {res.hwm_submitted_at} / {res.hwm_review_id})"
+    )
+    return 0
+
+
+def _cmd_sync_accounts(args: argparse.Namespace) -> int:
+    accounts = configured_accounts()
+    if not accounts:
+        print("HOSTAWAY_ACCOUNTS is not set")
+        return 1
+    results = ingest_accounts(accounts, page_size=args.page_size)
+    for r in results:
+        status = f"FAILED ({r.error})" if r.error else f"{r.written} reviews"
+        print(f"{r.name} [{r.account_id}]: {status} in {r.seconds:.1f}s")
+    return 1 if any(r.error for r in results) else 0
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    with SessionLocal() as session:
+        if args.rebuild:
+            count = rebuild_listing_stats(session)
+            print(f"Rebuilt listing_stats for {count} listings")
+            return 0
+        problems = check_listing_stats(session)
+    for p in problems:
+        print(f"MISMATCH {p['source']} {p['listing_id']}")
+        print(f"  expected: {p['expected']}")
+        print(f"  stored:   {p['stored']}")
+    print(f"{len(problems)} listing(s) out of sync")
+    return 1 if problems else 0
+
+
+def _cmd_snapshots(args: argparse.Namespace) -> int:
+    count = snapshot_publisher.publish_all()
+    print(f"Published {count} listing snapshots to {snapshot_publisher.root}")
+    return 0
+
+
+def _cmd_drift(args: argparse.Namespace) -> int:
+    with SessionLocal() as session:
+        if args.rebuild:
+            count = rebuild_category_drift(session)
+            print(f"Rebuilt category_drift for {count} listing categories")
+            return 0
+        alerts = get_drift_alerts(session, args.source)
+    for a in alerts:
+        print(
+            f"{a['direction'].upper():4} {a['listing_name']} / {a['category']}: "
+            f"recent {a['recent_mean']} vs baseline {a['baseline_mean']} "
+            f"(z={a['z_score']})"
+        )
+    print(f"{len(alerts)} alert(s)")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.cli")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sync = sub.add_parser("sync", help="Page the Hostaway reviews feed into SQLite")
+    sync.add_argument(
+        "--full", action="store_true", help="Ignore the stored high-water mark"
+    )
+    sync.add_argument("--page-size", type=int, default=HOSTAWAY_SYNC_PAGE_SIZE)
+    sync.add_argument("--concurrency", type=int, default=HOSTAWAY_SYNC_CONCURRENCY)
+    sync.set_defaults(func=_cmd_sync)
+
+    accounts = sub.add_parser(
+        "sync-accounts", help="Fetch every HOSTAWAY_ACCOUNTS feed in parallel"
+    )
+    accounts.add_argument("--page-size", type=int, default=HOSTAWAY_SYNC_PAGE_SIZE)
+    accounts.set_defaults(func=_cmd_sync_accounts)
+
+    stats = sub.add_parser(
+        "listing-stats", help="Check (default) or rebuild the listing_stats rollups"
+    )
+    stats.add_argument(
+        "--rebuild", action="store_true", help="Recompute every row from reviews"
+    )
+    stats.set_defaults(func=_cmd_stats)
+
+    snaps = sub.add_parser(
+        "snapshots", help="Rewrite every listing's static review snapshot"
+    )
+    snaps.set_defaults(func=_cmd_snapshots)
+
+    drift = sub.add_parser(
+        "category-drift", help="List drift alerts (default) or replay the statistics"
+    )
+    drift.add_argument("--source", default="mock", help="Review source to list")
+    drift.add_argument(
+        "--rebuild", action="store_true", help="Replay every review in time order"
+    )
+    drift.set_defaults(func=_cmd_drift)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    create_db_and_tables()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
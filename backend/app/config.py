@@ -9,19 +9,99 @@ APP_DIR = Path(__file__).resolve().parent
 BACKEND_DIR = APP_DIR.parent
 DATA_DIR = BACKEND_DIR / "data"
 
-# SQLite database file path
-DB_PATH = APP_DIR / "app.db"
+# SQLite database file path (override with DB_PATH, e.g. for tests)
+DB_PATH = Path(os.getenv("DB_PATH", str(APP_DIR / "app.db")))
+# Tuned storage: WAL journal so readers never block behind the writer, plus
+# connection pool sizing. Set DB_TUNED=false for SQLite's defaults.
+DB_TUNED = os.getenv("DB_TUNED", "true").lower() in {"1", "true", "yes"}
+DB_MMAP_SIZE = int(os.getenv("DB_MMAP_SIZE", str(256 * 1024 * 1024)))
+DB_BUSY_TIMEOUT_MS = int(os.getenv("DB_BUSY_TIMEOUT_MS", "5000"))
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+# Writes queued while the single writer thread is busy share one commit
+DB_WRITER_MAX_BATCH = int(os.getenv("DB_WRITER_MAX_BATCH", "64"))
 
 # External configuration
 HOSTAWAY_ACCOUNT_ID = os.getenv("HOSTAWAY_ACCOUNT_ID", "61148")
 HOSTAWAY_API_KEY = os.getenv("HOSTAWAY_API_KEY", "")
 GOOGLE_PLACES_API_KEY = os.getenv("GOOGLE_PLACES_API_KEY", "")
+# Persistent Places cache: query -> place_id mappings rarely change, details do
+GOOGLE_PLACE_ID_TTL = float(os.getenv("GOOGLE_PLACE_ID_TTL", str(30 * 24 * 3600)))
+GOOGLE_DETAILS_TTL = float(os.getenv("GOOGLE_DETAILS_TTL", "3600"))
+GOOGLE_CACHE_MAX_ENTRIES = int(os.getenv("GOOGLE_CACHE_MAX_ENTRIES", "1000"))
 HOSTAWAY_LIVE_MODE = os.getenv("HOSTAWAY_LIVE_MODE", "false").lower() in {
     "1",
     "true",
     "yes",
 }
 HOSTAWAY_API_BASE = os.getenv("HOSTAWAY_API_BASE", "https://api.hostaway.com/v1")
+# Live Hostaway payload cache: served fresh for TTL seconds, then served stale
+# (while refreshing in the background) for up to STALE_TTL more seconds
+HOSTAWAY_CACHE_TTL = float(os.getenv("HOSTAWAY_CACHE_TTL", "300"))
+HOSTAWAY_CACHE_STALE_TTL = float(os.getenv("HOSTAWAY_CACHE_STALE_TTL", "3600"))
+# Paginated full-account sync; an interval > 0 schedules it at API startup and
+# makes it the source of live reviews instead of the single-request fetch
+HOSTAWAY_SYNC_PAGE_SIZE = int(os.getenv("HOSTAWAY_SYNC_PAGE_SIZE", "100"))
+HOSTAWAY_SYNC_CONCURRENCY = int(os.getenv("HOSTAWAY_SYNC_CONCURRENCY", "4"))
+HOSTAWAY_SYNC_INTERVAL = float(os.getenv("HOSTAWAY_SYNC_INTERVAL", "0"))
+# Incremental syncs re-read this many seconds behind the high-water mark: the
+# feed has no updated-at field, so edits are only seen while in this window
+HOSTAWAY_SYNC_OVERLAP = float(os.getenv("HOSTAWAY_SYNC_OVERLAP", str(7 * 86400)))
+# Several Hostaway accounts (e.g. one per city), as a JSON list such as
+# [{"id": "61148", "key": "...", "name": "london", "rate": 5}]. When set, live
+# reviews come from every listed account instead of HOSTAWAY_ACCOUNT_ID.
+HOSTAWAY_ACCOUNTS = os.getenv("HOSTAWAY_ACCOUNTS", "")
+# Default per-account request rate (requests/second) and overall fetch budget
+HOSTAWAY_ACCOUNT_RATE = float(os.getenv("HOSTAWAY_ACCOUNT_RATE", "5"))
+HOSTAWAY_ACCOUNT_TIMEOUT = float(os.getenv("HOSTAWAY_ACCOUNT_TIMEOUT", "120"))
+
+# In-memory columnar copy of the review store answering /reviews/hostaway
+# filters without SQL; patched per listing after ingests and approvals
+REVIEW_INDEX_ENABLED = os.getenv("REVIEW_INDEX_ENABLED", "true").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+
+# LRU of rendered /reviews/hostaway and /reviews/stats bodies, keyed by the
+# filters; entries are invalidated per source when its data changes
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_MAX_BYTES = int(
+    os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+)
+
+# Category score drift: a listing's last DRIFT_WINDOW scores per category are
+# compared with its earlier history and flagged at DRIFT_Z_THRESHOLD standard
+# errors, once DRIFT_MIN_BASELINE older scores exist (GET /api/alerts)
+DRIFT_WINDOW = int(os.getenv("DRIFT_WINDOW", "10"))
+DRIFT_EWMA_ALPHA = float(os.getenv("DRIFT_EWMA_ALPHA", "0.2"))
+DRIFT_MIN_BASELINE = int(os.getenv("DRIFT_MIN_BASELINE", "20"))
+DRIFT_Z_THRESHOLD = float(os.getenv("DRIFT_Z_THRESHOLD", "3.0"))
+DRIFT_MIN_STD = float(os.getenv("DRIFT_MIN_STD", "0.5"))
+
+# Change feed (GET /api/events): rows kept in the change log for resuming with
+# Last-Event-ID, keep-alive interval and lifetime of one stream (clients
+# reconnect and resume)
+CHANGE_LOG_RETAIN = int(os.getenv("CHANGE_LOG_RETAIN", "10000"))
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+EVENTS_MAX_STREAM_SECONDS = float(os.getenv("EVENTS_MAX_STREAM_SECONDS", "300"))
+
+# Response compression: brotli (if installed) or gzip above this body size
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Static snapshots of each listing's approved reviews, served at /snapshots and
+# rewritten for just the affected listings after approvals and ingests. Off by
+# default: it writes files, so a deployment opts in and points SNAPSHOT_DIR at
+# a writable data directory
+SNAPSHOTS_ENABLED = os.getenv("SNAPSHOTS_ENABLED", "false").lower() in {
+    "1",
+    "true",
+    "yes",
+}
+SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", str(BACKEND_DIR / "snapshots")))
+SNAPSHOT_HTML = os.getenv("SNAPSHOT_HTML", "true").lower() in {"1", "true", "yes"}
 
 # Frontend may consume the API at this base URL; Streamlit can override via env
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
@@ -1,12 +1,30 @@
+import threading
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from fastapi.staticfiles import StaticFiles
 
 from .api.reviews import router as reviews_router
-from .models.db import create_db_and_tables
+from .config import HOSTAWAY_SYNC_INTERVAL, SNAPSHOT_DIR, SNAPSHOTS_ENABLED
+from .models.category_drift import ensure_category_drift
+from .models.db import SessionLocal, create_db_and_tables
+from .models.listing_stats import ensure_listing_stats
+from .models.writer import db_writer
+from .services.compression import CompressionMiddleware
+from .services.hostaway_cache import hostaway_cache
+from .services.hostaway_sync import run_sync_forever
+from .services.http_client import close_http_client, start_http_client
+from .services.ingest import ingest_source
+from .services.metrics import MetricsMiddleware, render_metrics
+from .services.response_cache import response_cache
+from .services.snapshots import snapshot_publisher
 
 
 app = FastAPI(title="Flex Living Reviews API")
 
+_sync_stop = threading.Event()
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -14,11 +32,50 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     create_db_and_tables()
+    with SessionLocal() as session:
+        ensure_listing_stats(session)
+        ensure_category_drift(session)
+    db_writer.start()
+    if SNAPSHOTS_ENABLED:
+        # Listen before ingesting so its changes are published too; starting
+        # also creates SNAPSHOT_DIR
+        snapshot_publisher.start()
+        snapshot_publisher.publish_all()
+    # Populate the review store so read endpoints never normalize per request
+    ingest_source("mock")
+    if HOSTAWAY_SYNC_INTERVAL <= 0:
+        ingest_source("live")
+    if HOSTAWAY_SYNC_INTERVAL > 0:
+        threading.Thread(
+            target=run_sync_forever,
+            args=(HOSTAWAY_SYNC_INTERVAL, _sync_stop),
+            name="hostaway-sync",
+            daemon=True,
+        ).start()
+
+
+@app.on_event("startup")
+async def open_http_client() -> None:
+    await start_http_client()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    _sync_stop.set()
+    db_writer.stop()
+    snapshot_publisher.stop()
+
+
+@app.on_event("shutdown")
+async def close_shared_http_client() -> None:
+    await close_http_client()
 
 
 @app.get("/health")
@@ -26,4 +83,32 @@ def health() -> dict:
     return {"status": "ok"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Request, pipeline-stage and upstream metrics in Prometheus text format."""
+    return PlainTextResponse(
+        render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/metrics/cache")
+def cache_metrics() -> dict:
+    return {
+        "status": "success",
+        "result": {
+            "hostaway": hostaway_cache.snapshot(),
+            "responses": response_cache.snapshot(),
+        },
+    }
+
+
 app.include_router(reviews_router, prefix="/api")
+
+if SNAPSHOTS_ENABLED:
+    # Plain files: public pages read these without touching the DB or upstreams.
+    # The directory is created by the publisher at startup, not on import
+    app.mount(
+        "/snapshots",
+        StaticFiles(directory=SNAPSHOT_DIR, check_dir=False),
+        name="snapshots",
+    )
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-from typing import Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from sqlalchemy import Boolean, Column, DateTime, String
+from sqlalchemy import Boolean, Column, DateTime, String, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from sqlalchemy.sql import func
 
 from .db import Base
 
 
+# Stay well below SQLite's bound-parameter limit for IN (...) lists and
+# multi-row inserts
+_BATCH_SIZE = 500
+
+
 class Approval(Base):
     __tablename__ = "approvals"
 
@@ -28,17 +34,126 @@ def upsert_approval(
     approved: bool,
     channel: str = "hostaway",
     listing_id: Optional[str] = None,
+    commit: bool = True,
 ) -> None:
-    obj = session.get(Approval, review_id)
-    if obj is None:
-        obj = Approval(review_id=review_id)
-        session.add(obj)
-    obj.approved = bool(approved)
-    obj.channel = channel
-    obj.listing_id = listing_id
-    session.commit()
+    upsert_approvals(
+        session,
+        [
+            {
+                "review_id": review_id,
+                "approved": approved,
+                "channel": channel,
+                "listing_id": listing_id,
+            }
+        ],
+        commit=commit,
+    )
+
+
+def upsert_approvals(
+    session: Session, items: Iterable[Dict[str, Any]], *, commit: bool = True
+) -> int:
+    """Insert or update many approvals in one transaction.
+
+    Each item has ``review_id``, ``approved`` and optional ``channel`` and
+    ``listing_id``. A review listed twice keeps its last value. Returns the
+    number of distinct reviews written. With ``commit=False`` the caller
+    commits (the DB writer batches several calls into one transaction).
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        rid = str(item["review_id"])
+        rows[rid] = {
+            "review_id": rid,
+            "approved": bool(item["approved"]),
+            "channel": item.get("channel") or "hostaway",
+            "listing_id": item.get("listing_id"),
+        }
+    values = list(rows.values())
+    _track_listing_stats(session, values)
+    for start in range(0, len(values), _BATCH_SIZE):
+        stmt = sqlite_insert(Approval).values(values[start : start + _BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Approval.review_id],
+            set_={
+                "approved": stmt.excluded.approved,
+                "channel": stmt.excluded.channel,
+                "listing_id": stmt.excluded.listing_id,
+                "updated_at": func.now(),
+            },
+        )
+        session.execute(stmt)
+    if commit:
+        session.commit()
+    return len(values)
+
+
+def _track_listing_stats(session: Session, values: List[Dict[str, Any]]) -> None:
+    """Move approved counts and feed versions for flags that actually flip.
+
+    Every flip is also appended to the change log, including approvals of
+    reviews that are not in the store (e.g. Google reviews; no source).
+    """
+    from .change_log import record_changes
+    from .feed_versions import bump_feed_versions
+    from .listing_stats import apply_approval_deltas
+    from .reviews import Review
+
+    deltas = []
+    changes: List[Dict[str, Any]] = []
+    for start in range(0, len(values), _BATCH_SIZE):
+        chunk = values[start : start + _BATCH_SIZE]
+        ids = [v["review_id"] for v in chunk]
+        previous = get_approvals_for(session, ids)
+        wanted = {v["review_id"]: v["approved"] for v in chunk}
+        stmt = select(Review.source, Review.listing_id, Review.review_id).where(
+            Review.review_id.in_(ids)
+        )
+        stored = set()
+        for source, listing_id, rid in session.execute(stmt):
+            stored.add(rid)
+            if wanted[rid] != previous.get(rid, False):
+                deltas.append(((source, listing_id), 1 if wanted[rid] else -1))
+                changes.append(
+                    {
+                        "kind": "approval",
+                        "source": source,
+                        "review_id": rid,
+                        "listing_id": listing_id,
+                        "approved": wanted[rid],
+                    }
+                )
+        for v in chunk:
+            rid = v["review_id"]
+            if rid not in stored and wanted[rid] != previous.get(rid, False):
+                changes.append(
+                    {
+                        "kind": "approval",
+                        "source": None,
+                        "review_id": rid,
+                        "listing_id": v.get("listing_id"),
+                        "approved": wanted[rid],
+                    }
+                )
+    apply_approval_deltas(session, deltas)
+    bump_feed_versions(session, (key for key, _ in deltas))
+    record_changes(session, changes)
 
 
 def get_approvals_map(session: Session) -> Dict[str, bool]:
-    rows = session.query(Approval).all()
-    return {str(r.review_id): bool(r.approved) for r in rows}
+    """Every recorded approval; prefer ``get_approvals_for`` on read paths."""
+    rows = session.execute(select(Approval.review_id, Approval.approved))
+    return {str(rid): bool(flag) for rid, flag in rows}
+
+
+def get_approvals_for(session: Session, review_ids: Iterable[str]) -> Dict[str, bool]:
+    """Approval flags for just ``review_ids`` (missing IDs are unapproved)."""
+    ids = list(dict.fromkeys(str(rid) for rid in review_ids))
+    out: Dict[str, bool] = {}
+    for start in range(0, len(ids), _BATCH_SIZE):
+        stmt = select(Approval.review_id, Approval.approved).where(
+            Approval.review_id.in_(ids[start : start + _BATCH_SIZE])
+        )
+        out.update((str(rid), bool(flag)) for rid, flag in session.execute(stmt))
+    return out
+
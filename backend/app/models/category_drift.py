@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    and_,
+    delete,
+    select,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from ..config import (
+    DRIFT_EWMA_ALPHA,
+    DRIFT_MIN_BASELINE,
+    DRIFT_MIN_STD,
+    DRIFT_WINDOW,
+    DRIFT_Z_THRESHOLD,
+)
+from .db import Base
+
+
+class CategoryDrift(Base):
+    """Streaming score statistics per listing and rating category.
+
+    Every new review updates its listing's rows in O(1): an EWMA, a rolling
+    window of the last DRIFT_WINDOW scores (running sum and sum of squares)
+    and a baseline mean/variance (Welford) of the scores that have left the
+    window. A row is flagged when the window mean sits DRIFT_Z_THRESHOLD
+    standard errors away from the baseline.
+    """
+
+    __tablename__ = "category_drift"
+
+    source = Column(String, primary_key=True)
+    listing_id = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    ewma = Column(Float, nullable=False, default=0.0)
+    recent = Column(JSON, nullable=False, default=list)  # oldest first
+    recent_sum = Column(Float, nullable=False, default=0.0)
+    recent_sumsq = Column(Float, nullable=False, default=0.0)
+    baseline_count = Column(Integer, nullable=False, default=0)
+    baseline_mean = Column(Float, nullable=False, default=0.0)
+    baseline_m2 = Column(Float, nullable=False, default=0.0)
+    z_score = Column(Float, nullable=True)
+    flagged = Column(Boolean, nullable=False, default=False)
+    flagged_since = Column(String, nullable=True)  # submitted_at that raised it
+    last_review_at = Column(String, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (Index("ix_category_drift_flagged", "source", "flagged"),)
+
+
+Key = Tuple[str, str, str]  # (source, listing_id, category)
+
+_STATE_FIELDS = (
+    "count",
+    "ewma",
+    "recent",
+    "recent_sum",
+    "recent_sumsq",
+    "baseline_count",
+    "baseline_mean",
+    "baseline_m2",
+    "z_score",
+    "flagged",
+    "flagged_since",
+    "last_review_at",
+)
+
+
+@dataclass
+class DriftState:
+    """Plain-Python copy of one row, updated in place while ingesting."""
+
+    count: int = 0
+    ewma: float = 0.0
+    recent: List[float] = field(default_factory=list)
+    recent_sum: float = 0.0
+    recent_sumsq: float = 0.0
+    baseline_count: int = 0
+    baseline_mean: float = 0.0
+    baseline_m2: float = 0.0
+    z_score: Optional[float] = None
+    flagged: bool = False
+    flagged_since: Optional[str] = None
+    last_review_at: Optional[str] = None
+
+    def add(
+        self,
+        value: float,
+        submitted_at: Optional[str] = None,
+        *,
+        window: int = DRIFT_WINDOW,
+        alpha: float = DRIFT_EWMA_ALPHA,
+    ) -> None:
+        """Fold one score in; constant work whatever the history length."""
+        self.ewma = (
+            value if self.count == 0 else self.ewma + alpha * (value - self.ewma)
+        )
+        self.count += 1
+        self.recent.append(value)
+        self.recent_sum += value
+        self.recent_sumsq += value * value
+        if len(self.recent) > window:
+            # The oldest score leaves the window and joins the baseline
+            old = self.recent.pop(0)
+            self.recent_sum -= old
+            self.recent_sumsq -= old * old
+            self.baseline_count += 1
+            delta = old - self.baseline_mean
+            self.baseline_mean += delta / self.baseline_count
+            self.baseline_m2 += delta * (old - self.baseline_mean)
+        self.last_review_at = submitted_at or self.last_review_at
+        self._evaluate(window)
+
+    @property
+    def recent_mean(self) -> Optional[float]:
+        return self.recent_sum / len(self.recent) if self.recent else None
+
+    @property
+    def recent_std(self) -> Optional[float]:
+        n = len(self.recent)
+        if n < 2:
+            return None
+        var = (self.recent_sumsq - self.recent_sum * self.recent_sum / n) / (n - 1)
+        return math.sqrt(max(var, 0.0))  # running sums can dip just below 0
+
+    @property
+    def baseline_std(self) -> Optional[float]:
+        if self.baseline_count < 2:
+            return None
+        return math.sqrt(self.baseline_m2 / (self.baseline_count - 1))
+
+    def _evaluate(self, window: int) -> None:
+        if len(self.recent) < window or self.baseline_count < DRIFT_MIN_BASELINE:
+            self.z_score, self.flagged, self.flagged_since = None, False, None
+            return
+        # Standard error of a window mean; the floor keeps a near-constant
+        # baseline from flagging a single point of movement
+        std = max(self.baseline_std or 0.0, DRIFT_MIN_STD)
+        z = (self.recent_mean - self.baseline_mean) / (std / math.sqrt(window))
+        self.z_score = round(z, 3)
+        flagged = abs(z) >= DRIFT_Z_THRESHOLD
+        if flagged and not self.flagged:
+            self.flagged_since = self.last_review_at
+        elif not flagged:
+            self.flagged_since = None
+        self.flagged = flagged
+
+
+def _ordered(reviews: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Reviews oldest first (undated last), so a batch streams in time order."""
+    return sorted(
+        reviews,
+        key=lambda r: (
+            r.get("submitted_ts") is None,
+            r.get("submitted_ts") or 0,
+            str(r.get("review_id")),
+        ),
+    )
+
+
+def _load_states(
+    session: Session, source: str, listing_ids: Iterable[str]
+) -> Dict[Key, DriftState]:
+    listing_ids = list(set(listing_ids))
+    states: Dict[Key, DriftState] = {}
+    for start in range(0, len(listing_ids), 500):
+        stmt = select(
+            CategoryDrift.listing_id,
+            CategoryDrift.category,
+            *(getattr(CategoryDrift, f) for f in _STATE_FIELDS),
+        ).where(
+            CategoryDrift.source == source,
+            CategoryDrift.listing_id.in_(listing_ids[start : start + 500]),
+        )
+        for row in session.execute(stmt):
+            values = {f: getattr(row, f) for f in _STATE_FIELDS}
+            values["recent"] = list(values["recent"] or [])
+            states[(source, row.listing_id, row.category)] = DriftState(**values)
+    return states
+
+
+def _write_states(session: Session, states: Dict[Key, DriftState]) -> None:
+    if not states:
+        return
+    stmt = sqlite_insert(CategoryDrift)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            CategoryDrift.source,
+            CategoryDrift.listing_id,
+            CategoryDrift.category,
+        ],
+        set_={f: stmt.excluded[f] for f in _STATE_FIELDS} | {"updated_at": func.now()},
+    )
+    # One statement, many parameter sets: compiled once per batch
+    session.execute(
+        stmt,
+        [
+            {
+                "source": source,
+                "listing_id": listing_id,
+                "category": category,
+                **{f: getattr(state, f) for f in _STATE_FIELDS},
+            }
+            for (source, listing_id, category), state in states.items()
+        ],
+    )
+
+
+def _replay(
+    reviews: Iterable[Dict[str, Any]],
+    states: Dict[Key, DriftState],
+    source: str,
+) -> Dict[Key, DriftState]:
+    """Fold ``reviews`` into ``states`` oldest first; returns the states touched."""
+    touched: Dict[Key, DriftState] = {}
+    for review in _ordered(reviews):
+        for category, value in (review.get("category_ratings") or {}).items():
+            key = (source, review["listing_id"], category)
+            state = states.get(key)
+            if state is None:
+                state = states[key] = DriftState()
+            state.add(float(value), review.get("submitted_at"))
+            touched[key] = state
+    return touched
+
+
+def _stored_reviews(
+    session: Session, source: Optional[str] = None, listing_ids: Iterable[str] = ()
+) -> List[Dict[str, Any]]:
+    """Stored reviews with the fields drift needs, for all or some listings."""
+    from .reviews import Review
+
+    stmt = select(
+        Review.source,
+        Review.review_id,
+        Review.listing_id,
+        Review.category_ratings,
+        Review.submitted_at,
+        Review.submitted_ts,
+    )
+    if source is None:
+        return [dict(row._mapping) for row in session.execute(stmt)]
+    listing_ids = list(listing_ids)
+    out: List[Dict[str, Any]] = []
+    for start in range(0, len(listing_ids), 500):
+        chunk = stmt.where(
+            Review.source == source,
+            Review.listing_id.in_(listing_ids[start : start + 500]),
+        )
+        out.extend(dict(row._mapping) for row in session.execute(chunk))
+    return out
+
+
+def apply_category_drift(
+    session: Session,
+    source: str,
+    reviews: Iterable[Dict[str, Any]],
+    late: Optional[Set[str]] = None,
+) -> int:
+    """Fold newly ingested reviews into the drift rows; returns rows written.
+
+    Reviews are applied oldest first within the batch. Only first sightings
+    should be passed, and they must already be stored: a review older than
+    what its listing has seen (a sync storing newest-first waves) cannot be
+    streamed in, so that listing is replayed from the stored rows instead.
+    Given a ``late`` set, such listings (and those already in it) are added
+    to it and skipped, for the caller to replay once after its last batch.
+    Edits to stored reviews are left to ``rebuild_category_drift``. Does not
+    commit.
+    """
+    from .reviews import iso_to_epoch
+
+    reviews = [r for r in reviews if r.get("category_ratings")]
+    if not reviews:
+        return 0
+    deferred = late is not None
+    late = late if late is not None else set()
+    states = _load_states(session, source, (r["listing_id"] for r in reviews))
+    seen_until: Dict[Key, Optional[int]] = {}
+    for review in reviews:
+        ts = review.get("submitted_ts")
+        if ts is None or review["listing_id"] in late:
+            continue
+        for category in review["category_ratings"]:
+            key = (source, review["listing_id"], category)
+            if key not in states:
+                continue
+            if key not in seen_until:
+                seen_until[key] = iso_to_epoch(states[key].last_review_at)
+            if seen_until[key] is not None and ts < seen_until[key]:
+                late.add(review["listing_id"])
+                break
+
+    touched = _replay(
+        (r for r in reviews if r["listing_id"] not in late), states, source
+    )
+    _write_states(session, touched)
+    if deferred:
+        return len(touched)
+    return len(touched) + replay_category_drift(session, source, late)
+
+
+def replay_category_drift(
+    session: Session, source: str, listing_ids: Iterable[str]
+) -> int:
+    """Recompute the drift rows of some listings from their stored reviews.
+
+    For callers that store reviews out of time order and collect the
+    listings that could not be streamed (``upsert_reviews(..., late_drift=)``).
+    Returns rows written; does not commit.
+    """
+    listing_ids = list(set(listing_ids))
+    if not listing_ids:
+        return 0
+    for start in range(0, len(listing_ids), 500):
+        session.execute(
+            delete(CategoryDrift).where(
+                CategoryDrift.source == source,
+                CategoryDrift.listing_id.in_(listing_ids[start : start + 500]),
+            )
+        )
+    states = _replay(_stored_reviews(session, source, listing_ids), {}, source)
+    _write_states(session, states)
+    return len(states)
+
+
+def rebuild_category_drift(session: Session) -> int:
+    """Replay every stored review in time order; returns rows written."""
+    by_source: Dict[str, List[Dict[str, Any]]] = {}
+    for review in _stored_reviews(session):
+        by_source.setdefault(review["source"], []).append(review)
+    session.execute(delete(CategoryDrift))
+    written = 0
+    for source, reviews in by_source.items():
+        written += apply_category_drift(session, source, reviews)
+    session.commit()
+    return written
+
+
+def ensure_category_drift(session: Session) -> None:
+    """Backfill drift rows once for stores created before the table existed."""
+    from .reviews import Review
+
+    if session.execute(select(CategoryDrift.listing_id).limit(1)).first() is None:
+        if session.execute(select(Review.review_id).limit(1)).first() is not None:
+            rebuild_category_drift(session)
+
+
+def _as_alert(obj: CategoryDrift, listing_name: Optional[str]) -> Dict[str, Any]:
+    state = DriftState(**{f: getattr(obj, f) for f in _STATE_FIELDS})
+
+    def _round(value: Optional[float]) -> Optional[float]:
+        return None if value is None else round(value, 2)
+
+    return {
+        "listing_id": obj.listing_id,
+        "listing_name": listing_name or obj.listing_id,
+        "category": obj.category,
+        "direction": "down" if (obj.z_score or 0) < 0 else "up",
+        "z_score": obj.z_score,
+        "recent_mean": _round(state.recent_mean),
+        "recent_std": _round(state.recent_std),
+        "recent_count": len(state.recent),
+        "baseline_mean": _round(obj.baseline_mean),
+        "baseline_std": _round(state.baseline_std),
+        "baseline_count": obj.baseline_count,
+        "ewma": _round(obj.ewma),
+        "review_count": obj.count,
+        "flagged": bool(obj.flagged),
+        "flagged_since": obj.flagged_since,
+        "last_review_at": obj.last_review_at,
+    }
+
+
+def get_drift_alerts(
+    session: Session,
+    source: str,
+    *,
+    listing_id: Optional[str] = None,
+    category: Optional[str] = None,
+    direction: Optional[str] = None,
+    flagged_only: bool = True,
+) -> List[Dict[str, Any]]:
+    """Drift rows of ``source``, largest deviation first.
+
+    ``direction`` is ``down`` (scores sliding) or ``up``; by default only
+    flagged rows are returned.
+    """
+    from .listing_stats import ListingStats
+
+    stmt = (
+        select(CategoryDrift, ListingStats.listing_name)
+        .outerjoin(
+            ListingStats,
+            and_(
+                ListingStats.source == CategoryDrift.source,
+                ListingStats.listing_id == CategoryDrift.listing_id,
+            ),
+        )
+        .where(CategoryDrift.source == source)
+    )
+    if flagged_only:
+        stmt = stmt.where(CategoryDrift.flagged.is_(True))
+    if listing_id:
+        stmt = stmt.where(CategoryDrift.listing_id == listing_id)
+    if category:
+        stmt = stmt.where(CategoryDrift.category == category)
+    if direction == "down":
+        stmt = stmt.where(CategoryDrift.z_score < 0)
+    elif direction == "up":
+        stmt = stmt.where(CategoryDrift.z_score > 0)
+    stmt = stmt.order_by(
+        func.abs(func.coalesce(CategoryDrift.z_score, 0.0)).desc(),
+        CategoryDrift.listing_id,
+        CategoryDrift.category,
+    )
+    return [_as_alert(obj, name) for obj, name in session.execute(stmt)]
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import Boolean, Column, DateTime, Integer, String, delete, event, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from ..config import CHANGE_LOG_RETAIN
+from .db import Base
+
+
+class ChangeLog(Base):
+    """Append-only log of committed review and approval changes.
+
+    One small row per change; ``id`` is the event ID clients resume from
+    with ``Last-Event-ID``. Review rows carry no content (the feed reads the
+    current review when sending) and only the newest CHANGE_LOG_RETAIN rows
+    are kept.
+    """
+
+    __tablename__ = "change_log"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    kind = Column(String, nullable=False)  # review | approval
+    source = Column(String, nullable=True)  # None: approval of an unstored review
+    review_id = Column(String, nullable=False)
+    listing_id = Column(String, nullable=True)
+    approved = Column(Boolean, nullable=True)  # approval rows only
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # AUTOINCREMENT: IDs are never reused, even after pruning, so a client's
+    # Last-Event-ID always means the same point in the log
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+# Called after each commit that logged changes; listeners read the log themselves
+ChangeListener = Callable[[], None]
+_listeners: List[ChangeListener] = []
+
+_INFO_KEY = "change_log_written"
+
+
+def record_changes(session: Session, changes: Iterable[Dict[str, Any]]) -> None:
+    """Append ``changes`` (ChangeLog column dicts without ``id``); no commit.
+
+    Rows beyond CHANGE_LOG_RETAIN are pruned in the same transaction, and
+    listeners registered with ``add_change_listener`` are woken once it
+    commits.
+    """
+    rows = [
+        {
+            "kind": c["kind"],
+            "source": c.get("source"),
+            "review_id": c["review_id"],
+            "listing_id": c.get("listing_id"),
+            "approved": c.get("approved"),
+        }
+        for c in changes
+    ]
+    if not rows:
+        return
+    session.execute(ChangeLog.__table__.insert(), rows)
+    prune_change_log(session)
+    session.info[_INFO_KEY] = True
+
+
+def latest_change_id(session: Session) -> int:
+    return int(
+        session.execute(select(func.coalesce(func.max(ChangeLog.id), 0))).scalar()
+    )
+
+
+def oldest_change_id(session: Session) -> Optional[int]:
+    return session.execute(select(func.min(ChangeLog.id))).scalar()
+
+
+def changes_after(
+    session: Session, after_id: int, source: Optional[str] = None, limit: int = 500
+) -> List[Dict[str, Any]]:
+    """Up to ``limit`` changes with ``id > after_id``, oldest first.
+
+    With ``source``, approvals of reviews outside the store (no source) are
+    still included.
+    """
+    stmt = select(ChangeLog).where(ChangeLog.id > after_id)
+    if source:
+        stmt = stmt.where((ChangeLog.source == source) | ChangeLog.source.is_(None))
+    stmt = stmt.order_by(ChangeLog.id).limit(limit)
+    return [
+        {
+            "id": obj.id,
+            "kind": obj.kind,
+            "source": obj.source,
+            "review_id": obj.review_id,
+            "listing_id": obj.listing_id,
+            "approved": obj.approved,
+        }
+        for obj in session.scalars(stmt)
+    ]
+
+
+def prune_change_log(session: Session, retain: int = CHANGE_LOG_RETAIN) -> int:
+    """Drop all but the newest ``retain`` rows; returns rows deleted. No commit."""
+    cutoff = latest_change_id(session) - retain
+    if cutoff <= 0:
+        return 0
+    return session.execute(delete(ChangeLog).where(ChangeLog.id <= cutoff)).rowcount
+
+
+def add_change_listener(listener: ChangeListener) -> None:
+    """Call ``listener()`` after each commit that logged changes.
+
+    Runs on the committing thread, so listeners should only hand off.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_change_listener(listener: ChangeListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session: Session) -> None:
+    if not session.info.pop(_INFO_KEY, False) or not _listeners:
+        return
+    for listener in list(_listeners):
+        listener()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
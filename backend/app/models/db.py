@@ -2,10 +2,17 @@ from __future__ import annotations
 
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
-from ..config import DB_PATH
+from ..config import (
+    DB_BUSY_TIMEOUT_MS,
+    DB_MAX_OVERFLOW,
+    DB_MMAP_SIZE,
+    DB_PATH,
+    DB_POOL_SIZE,
+    DB_TUNED,
+)
 
 
 class Base(DeclarativeBase):
@@ -18,17 +25,72 @@ engine = create_engine(
     future=True,
     echo=False,
     connect_args={"check_same_thread": False},
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
 )
 
+
+@event.listens_for(engine, "connect")
+def _tune_sqlite(dbapi_conn, _record) -> None:
+    """Per-connection pragmas: WAL lets readers run alongside the one writer."""
+    if not DB_TUNED:
+        return
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={int(DB_MMAP_SIZE)}")
+        cursor.execute(f"PRAGMA busy_timeout={int(DB_BUSY_TIMEOUT_MS)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
 SessionLocal = sessionmaker(
     bind=engine, autoflush=False, autocommit=False, future=True, class_=Session
 )
 
 
 def create_db_and_tables() -> None:
-    from . import approvals  # noqa: F401  # ensure models are imported
+    from . import (  # noqa: F401  # ensure models are imported
+        approvals,
+        category_drift,
+        change_log,
+        feed_versions,
+        google_cache,
+        listing_stats,
+        reviews,
+        sync_state,
+    )
 
+    reviews.migrate_review_ids(engine)
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+
+    from .review_search import create_review_fts
+
+    create_review_fts(engine)
+
+
+def _add_missing_columns() -> None:
+    """Add nullable columns introduced after a table was first created.
+
+    ``create_all`` never alters existing tables, so a store created by an
+    older version would otherwise lack them.
+    """
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {c["name"] for c in insp.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                ddl = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {ddl}")
+                )
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, String, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from .db import Base
+
+
+class FeedVersion(Base):
+    """Content version of each listing's served reviews.
+
+    Bumped in the same transaction as any review insert/change or approval
+    flip for the listing, so public feeds can be revalidated from this table
+    alone. Versions only ever increase.
+    """
+
+    __tablename__ = "feed_versions"
+
+    source = Column(String, primary_key=True)
+    listing_id = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+Key = Tuple[str, str]  # (source, listing_id)
+
+# Called with the keys changed by each committed transaction
+FeedListener = Callable[[Set[Key]], None]
+_listeners: List[FeedListener] = []
+
+_INFO_KEY = "changed_feeds"
+
+# Three bound parameters per row; stay well below SQLite's limit
+_BATCH_SIZE = 500
+
+
+def bump_feed_versions(session: Session, keys: Iterable[Key]) -> None:
+    """Increment the version of every ``(source, listing_id)``; no commit.
+
+    Listeners registered with ``add_feed_listener`` hear about the keys once
+    the transaction commits.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    session.info.setdefault(_INFO_KEY, set()).update(keys)
+    values = [{"source": s, "listing_id": lid, "version": 1} for s, lid in keys]
+    for start in range(0, len(values), _BATCH_SIZE):
+        stmt = sqlite_insert(FeedVersion).values(values[start : start + _BATCH_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FeedVersion.source, FeedVersion.listing_id],
+            set_={"version": FeedVersion.version + 1, "updated_at": func.now()},
+        )
+        session.execute(stmt)
+
+
+def get_feed_version(
+    session: Session, source: str, listing_id: Optional[str] = None
+) -> Tuple[int, Optional[datetime]]:
+    """``(version, last_modified)`` of one listing, or of the whole source.
+
+    The source-wide version is the sum over its listings, which changes
+    whenever any of them does. ``last_modified`` is UTC, or None if nothing
+    was recorded yet.
+    """
+    stmt = select(
+        func.coalesce(func.sum(FeedVersion.version), 0),
+        func.max(FeedVersion.updated_at),
+    ).where(FeedVersion.source == source)
+    if listing_id:
+        stmt = stmt.where(FeedVersion.listing_id == listing_id)
+    version, updated = session.execute(stmt).one()
+    if isinstance(updated, str):  # aggregate results skip the DateTime type
+        updated = datetime.fromisoformat(updated)
+    if updated is not None and updated.tzinfo is None:
+        updated = updated.replace(tzinfo=timezone.utc)
+    return int(version), updated
+
+
+def add_feed_listener(listener: FeedListener) -> None:
+    """Call ``listener(keys)`` after each commit that changed feeds.
+
+    Listeners run on the committing (usually the DB writer) thread, so they
+    should only hand the keys off.
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def remove_feed_listener(listener: FeedListener) -> None:
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session: Session) -> None:
+    keys = session.info.pop(_INFO_KEY, None)
+    if not keys:
+        return
+    for listener in list(_listeners):
+        listener(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changes(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
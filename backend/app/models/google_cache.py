@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    Float,
+    Index,
+    String,
+    delete,
+    func,
+    select,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .db import Base
+
+
+class GoogleCacheEntry(Base):
+    """Cached Google Places response, keyed by kind (place_id | details)."""
+
+    __tablename__ = "google_cache"
+
+    kind = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    payload = Column(JSON, nullable=True)
+    fetched_at = Column(Float, nullable=False)  # epoch seconds
+    accessed_at = Column(Float, nullable=False)
+
+    __table_args__ = (Index("ix_google_cache_accessed", "accessed_at"),)
+
+
+def cache_lookup(session: Session, kind: str, key: str, ttl: float) -> Optional[Any]:
+    """Return the cached payload if younger than ``ttl`` seconds; read only."""
+    entry = session.get(GoogleCacheEntry, (kind, key))
+    if entry is None or time.time() - entry.fetched_at > ttl:
+        return None
+    return entry.payload
+
+
+def cache_touch(session: Session, kind: str, key: str, *, commit: bool = True) -> None:
+    """Mark an entry as used now, for LRU eviction."""
+    session.execute(
+        update(GoogleCacheEntry)
+        .where(GoogleCacheEntry.kind == kind, GoogleCacheEntry.key == key)
+        .values(accessed_at=time.time())
+    )
+    if commit:
+        session.commit()
+
+
+def cache_get(session: Session, kind: str, key: str, ttl: float) -> Optional[Any]:
+    """Return the cached payload if younger than ``ttl`` seconds, else None."""
+    payload = cache_lookup(session, kind, key, ttl)
+    if payload is not None:
+        cache_touch(session, kind, key)
+    return payload
+
+
+def cache_put(
+    session: Session,
+    kind: str,
+    key: str,
+    payload: Any,
+    *,
+    max_entries: int,
+    commit: bool = True,
+) -> None:
+    """Store ``payload`` and evict least recently used rows beyond ``max_entries``."""
+    now = time.time()
+    stmt = sqlite_insert(GoogleCacheEntry).values(
+        kind=kind, key=key, payload=payload, fetched_at=now, accessed_at=now
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[GoogleCacheEntry.kind, GoogleCacheEntry.key],
+        set_={"payload": payload, "fetched_at": now, "accessed_at": now},
+    )
+    session.execute(stmt)
+    count = session.execute(select(func.count()).select_from(GoogleCacheEntry)).scalar()
+    if count and count > max_entries:
+        oldest = (
+            select(GoogleCacheEntry.accessed_at)
+            .order_by(GoogleCacheEntry.accessed_at.desc())
+            .offset(max_entries - 1)
+            .limit(1)
+            .scalar_subquery()
+        )
+        session.execute(
+            delete(GoogleCacheEntry).where(GoogleCacheEntry.accessed_at < oldest)
+        )
+    if commit:
+        session.commit()
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Integer,
+    String,
+    delete,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from .db import Base
+
+
+class ListingStats(Base):
+    """Running per-listing totals, maintained incrementally.
+
+    Ingest and approval changes apply deltas to these rows instead of
+    re-aggregating reviews; ``rebuild_listing_stats`` recomputes them from
+    scratch and ``check_listing_stats`` reports drift between the two.
+    """
+
+    __tablename__ = "listing_stats"
+
+    source = Column(String, primary_key=True)
+    listing_id = Column(String, primary_key=True)
+    listing_name = Column(String, nullable=False)
+    channel = Column(String, nullable=False, default="hostaway")
+    review_count = Column(Integer, nullable=False, default=0)
+    rated_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Float, nullable=False, default=0.0)
+    approved_count = Column(Integer, nullable=False, default=0)
+    category_sums = Column(JSON, nullable=False, default=dict)
+    category_counts = Column(JSON, nullable=False, default=dict)
+    last_review_ts = Column(Integer, nullable=True)
+    last_review_at = Column(String, nullable=True)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+# Review columns a listing's totals depend on
+CONTRIBUTING_FIELDS = (
+    "listing_id",
+    "listing_name",
+    "channel",
+    "rating_overall",
+    "category_ratings",
+    "submitted_at",
+    "submitted_ts",
+)
+
+Key = Tuple[str, str]  # (source, listing_id)
+
+
+def _empty(source: str, listing_id: str) -> ListingStats:
+    return ListingStats(
+        source=source,
+        listing_id=listing_id,
+        listing_name=listing_id,
+        channel="hostaway",
+        review_count=0,
+        rated_count=0,
+        rating_sum=0.0,
+        approved_count=0,
+        category_sums={},
+        category_counts={},
+    )
+
+
+def _load(session: Session, keys: Iterable[Key]) -> Dict[Key, ListingStats]:
+    out: Dict[Key, ListingStats] = {}
+    for source, listing_id in set(keys):
+        obj = session.get(ListingStats, (source, listing_id))
+        if obj is None:
+            obj = _empty(source, listing_id)
+            session.add(obj)
+        out[(source, listing_id)] = obj
+    return out
+
+
+def _contribute(stats: ListingStats, review: Dict[str, Any], sign: int) -> None:
+    stats.review_count += sign
+    rating = review.get("rating_overall")
+    if rating is not None:
+        stats.rated_count += sign
+        stats.rating_sum += sign * float(rating)
+    categories = review.get("category_ratings") or {}
+    if categories:
+        # Reassign rather than mutate so SQLAlchemy sees the JSON change
+        sums = dict(stats.category_sums or {})
+        counts = dict(stats.category_counts or {})
+        for name, value in categories.items():
+            sums[name] = sums.get(name, 0.0) + sign * float(value)
+            counts[name] = counts.get(name, 0) + sign
+            if counts[name] <= 0:
+                sums.pop(name, None)
+                counts.pop(name, None)
+        stats.category_sums, stats.category_counts = sums, counts
+    if review.get("approved"):
+        stats.approved_count += sign
+    if sign > 0:
+        stats.listing_name = review.get("listing_name") or stats.listing_name
+        stats.channel = review.get("channel") or stats.channel
+        ts = review.get("submitted_ts")
+        latest = stats.last_review_ts
+        if ts is not None and (latest is None or ts > latest):
+            stats.last_review_ts = ts
+            stats.last_review_at = review.get("submitted_at")
+
+
+def apply_review_changes(
+    session: Session,
+    source: str,
+    changes: Iterable[Tuple[Optional[Dict[str, Any]], Dict[str, Any]]],
+) -> None:
+    """Apply ``(old, new)`` review pairs from an ingest; ``old`` is None for inserts.
+
+    Both dicts carry CONTRIBUTING_FIELDS plus the review's ``approved`` flag.
+    The new rows must already be stored: listings that lose their latest
+    review are re-read. Does not commit.
+    """
+    pairs = [
+        (old, new)
+        for old, new in changes
+        if old is None or any(old.get(f) != new.get(f) for f in CONTRIBUTING_FIELDS)
+    ]
+    if not pairs:
+        return
+    keys = [(source, new["listing_id"]) for _, new in pairs]
+    keys += [(source, old["listing_id"]) for old, _ in pairs if old is not None]
+    rows = _load(session, keys)
+    # Listings whose latest review moved away or got an earlier date: the
+    # running maximum cannot be lowered by a delta
+    stale = set()
+    for old, new in pairs:
+        if old is not None:
+            key = (source, old["listing_id"])
+            ts = old.get("submitted_ts")
+            if (
+                ts is not None
+                and ts == rows[key].last_review_ts
+                and (
+                    new["listing_id"] != old["listing_id"]
+                    or new.get("submitted_ts") is None
+                    or new["submitted_ts"] < ts
+                )
+            ):
+                stale.add(key)
+            _contribute(rows[key], old, -1)
+        _contribute(rows[(source, new["listing_id"])], new, +1)
+    for key in stale:
+        _refresh_last_review(session, rows[key])
+    session.flush()
+
+
+def _refresh_last_review(session: Session, stats: ListingStats) -> None:
+    """Re-read a listing's latest review date; its new rows must be stored."""
+    from .reviews import Review
+
+    latest = session.execute(
+        select(Review.submitted_ts, Review.submitted_at)
+        .where(
+            Review.source == stats.source,
+            Review.listing_id == stats.listing_id,
+            Review.submitted_ts.is_not(None),
+        )
+        .order_by(Review.submitted_ts.desc())
+        .limit(1)
+    ).first()
+    stats.last_review_ts = latest.submitted_ts if latest else None
+    stats.last_review_at = latest.submitted_at if latest else None
+
+
+def apply_approval_deltas(session: Session, deltas: Iterable[Tuple[Key, int]]) -> None:
+    """Adjust approved counts by ``(source, listing_id) -> +1/-1``; no commit."""
+    totals: Dict[Key, int] = {}
+    for key, delta in deltas:
+        totals[key] = totals.get(key, 0) + delta
+    totals = {k: d for k, d in totals.items() if d}
+    for key, stats in _load(session, totals).items():
+        stats.approved_count += totals[key]
+    session.flush()
+
+
+def get_listing_stats(
+    session: Session, source: str, listing_id: Optional[str] = None
+) -> List[ListingStats]:
+    stmt = select(ListingStats).where(
+        ListingStats.source == source, ListingStats.review_count > 0
+    )
+    if listing_id:
+        stmt = stmt.where(ListingStats.listing_id == listing_id)
+    return list(session.scalars(stmt.order_by(ListingStats.listing_name)))
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def list_listings(
+    session: Session,
+    source: str,
+    name_prefix: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[str, str]] = None,
+) -> List[Dict[str, Any]]:
+    """Listing index rows for pickers, ordered by name.
+
+    ``name_prefix`` matches the start of the listing name, case-insensitively;
+    ``after`` is the ``(listing_name, listing_id)`` of the previous page's last
+    row.
+    """
+    stmt = select(ListingStats).where(
+        ListingStats.source == source, ListingStats.review_count > 0
+    )
+    if name_prefix:
+        pattern = _escape_like(name_prefix.lower()) + "%"
+        stmt = stmt.where(
+            func.lower(ListingStats.listing_name).like(pattern, escape="\\")
+        )
+    if after is not None:
+        stmt = stmt.where(
+            tuple_(ListingStats.listing_name, ListingStats.listing_id) > tuple_(*after)
+        )
+    stmt = stmt.order_by(ListingStats.listing_name, ListingStats.listing_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [
+        {
+            "listing_id": obj.listing_id,
+            "listing_name": obj.listing_name,
+            "channel": obj.channel,
+            "review_count": obj.review_count,
+            "approved_count": obj.approved_count,
+            "average_rating": (
+                round(obj.rating_sum / obj.rated_count, 2) if obj.rated_count else None
+            ),
+            "last_review_at": obj.last_review_at,
+        }
+        for obj in session.scalars(stmt)
+    ]
+
+
+def _recompute(session: Session) -> Dict[Key, Dict[str, Any]]:
+    """Aggregate every stored review from scratch (rebuild/check only)."""
+    from .approvals import Approval
+    from .reviews import Review
+
+    stmt = select(
+        Review.source,
+        *(getattr(Review, f) for f in CONTRIBUTING_FIELDS),
+        func.coalesce(Approval.approved, False).label("approved"),
+    ).outerjoin(Approval, Approval.review_id == Review.review_id)
+    fresh: Dict[Key, ListingStats] = {}
+    for row in session.execute(stmt):
+        review = dict(row._mapping)
+        key = (review["source"], review["listing_id"])
+        if key not in fresh:
+            fresh[key] = _empty(*key)
+        _contribute(fresh[key], review, +1)
+    return {key: _as_dict(obj) for key, obj in fresh.items()}
+
+
+def _as_dict(obj: ListingStats) -> Dict[str, Any]:
+    return {
+        "listing_name": obj.listing_name,
+        "channel": obj.channel,
+        "review_count": obj.review_count,
+        "rated_count": obj.rated_count,
+        "rating_sum": round(obj.rating_sum, 6),
+        "approved_count": obj.approved_count,
+        "category_sums": {
+            k: round(v, 6) for k, v in (obj.category_sums or {}).items()
+        },
+        "category_counts": dict(obj.category_counts or {}),
+        "last_review_ts": obj.last_review_ts,
+        "last_review_at": obj.last_review_at,
+    }
+
+
+def check_listing_stats(session: Session) -> List[Dict[str, Any]]:
+    """Compare stored rollups with a full recompute; returns mismatching keys."""
+    expected = _recompute(session)
+    stored = {
+        (obj.source, obj.listing_id): _as_dict(obj)
+        for obj in session.scalars(select(ListingStats))
+        if obj.review_count > 0
+    }
+    problems: List[Dict[str, Any]] = []
+    for key in sorted(set(expected) | set(stored)):
+        want, have = expected.get(key), stored.get(key)
+        if want != have:
+            problems.append(
+                {
+                    "source": key[0],
+                    "listing_id": key[1],
+                    "expected": want,
+                    "stored": have,
+                }
+            )
+    return problems
+
+
+def rebuild_listing_stats(session: Session) -> int:
+    """Replace every rollup row with a full recompute; returns listings written."""
+    expected = _recompute(session)
+    session.execute(delete(ListingStats))
+    for (source, listing_id), values in expected.items():
+        session.add(ListingStats(source=source, listing_id=listing_id, **values))
+    session.commit()
+    return len(expected)
+
+
+def ensure_listing_stats(session: Session) -> None:
+    """Backfill rollups once for stores created before the table existed."""
+    from .reviews import Review
+
+    if session.execute(select(ListingStats.listing_id).limit(1)).first() is None:
+        if session.execute(select(Review.review_id).limit(1)).first() is not None:
+            rebuild_listing_stats(session)
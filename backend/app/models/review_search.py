@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import html
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, func, inspect, literal_column, table, text
+from sqlalchemy.engine import Engine
+
+
+FTS_TABLE = "reviews_fts"
+
+# External-content FTS5 index over the review store, keyed by ``reviews.id``
+# (a rowid alias, so VACUUM cannot renumber it). Triggers keep it in step
+# with every insert/upsert/delete on ``reviews``, so ingest needs no extra work.
+_FTS_DDL = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        text_public, listing_name, author_name,
+        content='reviews', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_ai AFTER INSERT ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text_public, listing_name, author_name)
+        VALUES (new.id, new.text_public, new.listing_name, new.author_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_ad AFTER DELETE ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}(
+            {FTS_TABLE}, rowid, text_public, listing_name, author_name
+        )
+        VALUES ('delete', old.id, old.text_public, old.listing_name,
+                old.author_name);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS reviews_fts_au
+    AFTER UPDATE OF text_public, listing_name, author_name ON reviews BEGIN
+        INSERT INTO {FTS_TABLE}(
+            {FTS_TABLE}, rowid, text_public, listing_name, author_name
+        )
+        VALUES ('delete', old.id, old.text_public, old.listing_name,
+                old.author_name);
+        INSERT INTO {FTS_TABLE}(rowid, text_public, listing_name, author_name)
+        VALUES (new.id, new.text_public, new.listing_name, new.author_name);
+    END
+    """,
+)
+
+
+def drop_review_fts(engine: Engine) -> None:
+    """Drop the FTS index and its triggers, e.g. before ``reviews`` is rebuilt."""
+    with engine.begin() as conn:
+        for trigger in ("reviews_fts_ai", "reviews_fts_ad", "reviews_fts_au"):
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+def create_review_fts(engine: Engine) -> None:
+    """Create the FTS index and triggers, backfilling it for an existing store."""
+    existed = inspect(engine).has_table(FTS_TABLE)
+    with engine.begin() as conn:
+        for ddl in _FTS_DDL:
+            conn.execute(text(ddl))
+        if not existed:
+            rebuild = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            conn.execute(text(rebuild))
+
+
+# "quoted phrase" | AND/OR/NOT | bare term, optionally with a trailing * (prefix)
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+
+def build_fts_query(q: Optional[str]) -> Optional[str]:
+    """Turn user input into a safe FTS5 MATCH expression.
+
+    Supports ``"exact phrases"``, ``prefix*`` terms and AND/OR/NOT; everything
+    else is quoted so punctuation such as ``check-in`` cannot break the
+    query syntax. Returns None when nothing searchable remains.
+
+    FTS5 has no unary NOT, so a NOT without a term before it (``NOT noise``,
+    ``a OR NOT b``) raises ValueError rather than being dropped, which would
+    turn an exclusion into a match.
+    """
+    parts: List[str] = []
+    for phrase, word in _TOKEN_RE.findall(q or ""):
+        if phrase:
+            parts.append('"' + phrase.replace('"', "") + '"')
+        elif word in _OPERATORS:
+            if parts and parts[-1] not in _OPERATORS:
+                parts.append(word)
+            elif word == "NOT":
+                raise ValueError(
+                    "NOT must follow a search term, e.g. 'clean NOT noise'"
+                )
+        else:
+            prefix = word.endswith("*")
+            term = word.rstrip("*").replace('"', "")
+            if term:
+                parts.append(f'"{term}"' + ("*" if prefix else ""))
+    while parts and parts[-1] in _OPERATORS:
+        parts.pop()
+    return " ".join(parts) or None
+
+
+fts_table = table(FTS_TABLE, column("rowid"))
+fts = literal_column(FTS_TABLE)
+fts_rank = func.bm25(fts)
+# Control characters stand in for the highlight tags so the text between
+# them can be HTML-escaped before the tags are put in
+_MARK_OPEN, _MARK_CLOSE = "\x02", "\x03"
+fts_snippet = func.snippet(fts, 0, _MARK_OPEN, _MARK_CLOSE, "…", 12)
+
+
+def render_snippet(raw: Optional[str]) -> Optional[str]:
+    """HTML-safe snippet: review text escaped, matches wrapped in ``<mark>``."""
+    if raw is None:
+        return None
+    return (
+        html.escape(raw, quote=False)
+        .replace(_MARK_OPEN, "<mark>")
+        .replace(_MARK_CLOSE, "</mark>")
+    )
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+from sqlalchemy import Float, case, cast, false, func, select, true
+from sqlalchemy.orm import Session
+
+from .approvals import Approval
+from .reviews import Review, ReviewFilters
+
+
+def _filtered(filters: ReviewFilters, *columns: Any):
+    stmt = (
+        select(*columns)
+        .select_from(Review)
+        .outerjoin(Approval, Approval.review_id == Review.review_id)
+    )
+    return filters.apply(stmt)
+
+
+def _summary(
+    count: int,
+    rated: int,
+    rating_sum: float,
+    approved: int,
+    median: Optional[float],
+    categories: Dict[str, List[float]],
+    by_type: Dict[str, int],
+    by_status: Dict[str, int],
+) -> Dict[str, Any]:
+    return {
+        "count": count,
+        "rated_count": rated,
+        # Exact total, so clients combining rows need not undo the rounding
+        "rating_sum": rating_sum,
+        "mean_rating": round(rating_sum / rated, 2) if rated else None,
+        "median_rating": median,
+        "approved_count": approved,
+        "approval_rate": round(approved / count, 4) if count else None,
+        "category_means": {
+            name: round(total / n, 2) for name, (total, n) in sorted(categories.items())
+        },
+        "by_type": dict(by_type),
+        "by_status": dict(by_status),
+    }
+
+
+def compute_review_stats(session: Session, filters: ReviewFilters) -> Dict[str, Any]:
+    """Portfolio and per-listing aggregates for reviews matching ``filters``.
+
+    Counts, sums and category means are grouped in SQL; medians come from a
+    single vectorized pass over the rating column only, so no review text is
+    loaded.
+    """
+    approved_int = case((func.coalesce(Approval.approved, false()), 1), else_=0)
+    base = _filtered(
+        filters,
+        Review.listing_id,
+        func.max(Review.listing_name).label("listing_name"),
+        func.count().label("count"),
+        func.count(Review.rating_overall).label("rated"),
+        func.coalesce(func.sum(Review.rating_overall), 0.0).label("rating_sum"),
+        func.sum(approved_int).label("approved"),
+    ).group_by(Review.listing_id)
+    listing_rows = session.execute(base).all()
+
+    categories: Dict[str, Dict[str, List[float]]] = defaultdict(dict)
+    cat = func.json_each(Review.category_ratings).table_valued("key", "value")
+    cat_stmt = (
+        _filtered(
+            filters,
+            Review.listing_id,
+            cat.c.key,
+            func.sum(cast(cat.c.value, Float)),
+            func.count(cat.c.value),
+        )
+        .join(cat, true())
+        .group_by(Review.listing_id, cat.c.key)
+    )
+    for listing_id, name, total, n in session.execute(cat_stmt):
+        categories[listing_id][name] = [float(total or 0.0), int(n)]
+
+    breakdowns: Dict[str, Dict[str, Dict[str, int]]] = {
+        "type": defaultdict(dict),
+        "status": defaultdict(dict),
+    }
+    for field, column in (("type", Review.type), ("status", Review.status)):
+        stmt = _filtered(filters, Review.listing_id, column, func.count()).group_by(
+            Review.listing_id, column
+        )
+        for listing_id, value, n in session.execute(stmt):
+            breakdowns[field][listing_id][value] = int(n)
+
+    ratings = pd.DataFrame(
+        session.execute(
+            _filtered(filters, Review.listing_id, Review.rating_overall).where(
+                Review.rating_overall.is_not(None)
+            )
+        ).all(),
+        columns=["listing_id", "rating"],
+    )
+    medians = ratings.groupby("listing_id")["rating"].median().to_dict()
+
+    listings: List[Dict[str, Any]] = []
+    totals = {"count": 0, "rated": 0, "rating_sum": 0.0, "approved": 0}
+    portfolio_categories: Dict[str, List[float]] = defaultdict(lambda: [0.0, 0])
+    portfolio_types: Dict[str, int] = defaultdict(int)
+    portfolio_status: Dict[str, int] = defaultdict(int)
+    for row in listing_rows:
+        lid = row.listing_id
+        median = medians.get(lid)
+        listings.append(
+            {
+                "listing_id": lid,
+                "listing_name": row.listing_name,
+                **_summary(
+                    int(row.count),
+                    int(row.rated),
+                    float(row.rating_sum),
+                    int(row.approved or 0),
+                    float(median) if median is not None else None,
+                    categories.get(lid, {}),
+                    breakdowns["type"].get(lid, {}),
+                    breakdowns["status"].get(lid, {}),
+                ),
+            }
+        )
+        totals["count"] += int(row.count)
+        totals["rated"] += int(row.rated)
+        totals["rating_sum"] += float(row.rating_sum)
+        totals["approved"] += int(row.approved or 0)
+        for name, (total, n) in categories.get(lid, {}).items():
+            portfolio_categories[name][0] += total
+            portfolio_categories[name][1] += n
+        for value, n in breakdowns["type"].get(lid, {}).items():
+            portfolio_types[value] += n
+        for value, n in breakdowns["status"].get(lid, {}).items():
+            portfolio_status[value] += n
+
+    portfolio_median = float(ratings["rating"].median()) if len(ratings) else None
+    portfolio = _summary(
+        totals["count"],
+        totals["rated"],
+        totals["rating_sum"],
+        totals["approved"],
+        portfolio_median,
+        portfolio_categories,
+        portfolio_types,
+        portfolio_status,
+    )
+    listings.sort(key=lambda x: x["listing_name"] or "")
+    return {"portfolio": portfolio, "listings": listings}
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlalchemy import Float, cast, func, literal, true
+from sqlalchemy.orm import Session
+
+from .reviews import Review, ReviewFilters
+from .review_stats import _filtered
+
+# Bucket name -> (SQLite date modifiers, pandas frequency). Weeks start on
+# Monday: 'weekday 0' moves to the next Sunday (or stays), '-6 days' back.
+BUCKETS = {
+    "day": ((), "D"),
+    "week": (("weekday 0", "-6 days"), "7D"),
+    "month": (("start of month",), "MS"),
+}
+
+PORTFOLIO = "portfolio"
+
+
+def _bucket_expr(bucket: str):
+    modifiers, _ = BUCKETS[bucket]
+    return func.date(Review.submitted_ts, "unixepoch", *modifiers)
+
+
+def _rolling_mean(totals: np.ndarray, counts: np.ndarray, window: int) -> np.ndarray:
+    """Rolling ``sum(totals) / sum(counts)`` down each column; NaN if no count."""
+    pad = np.zeros((window - 1, totals.shape[1]))
+    sums, ns = (
+        sliding_window_view(np.vstack([pad, m]), window, axis=0).sum(axis=-1)
+        for m in (totals, counts)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(ns > 0, sums / ns, np.nan).round(2)
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if value != value else value  # NaN -> None
+
+
+def compute_review_trends(
+    session: Session,
+    filters: ReviewFilters,
+    *,
+    bucket: str = "month",
+    window: int = 1,
+    by_listing: bool = False,
+) -> Dict[str, Any]:
+    """Time series of review count, mean rating and category means.
+
+    Counts and sums are grouped by bucket (and listing) in SQL; rolling means
+    over the last ``window`` buckets are weighted by rated reviews and come
+    from one vectorized pass over a bucket x series matrix. Only non-empty
+    buckets are returned, but empty ones still count towards the window.
+    Raises ValueError for an unknown bucket or a window below 1.
+    """
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket}")
+    if window < 1:
+        raise ValueError("window must be at least 1")
+    bucket_col = _bucket_expr(bucket).label("bucket")
+    series_col = (Review.listing_id if by_listing else literal(PORTFOLIO)).label(
+        "series"
+    )
+
+    base = _filtered(
+        filters,
+        series_col,
+        bucket_col,
+        func.count().label("count"),
+        func.count(Review.rating_overall).label("rated"),
+        func.coalesce(func.sum(Review.rating_overall), 0.0).label("rating_sum"),
+    ).where(Review.submitted_ts.is_not(None))
+    if by_listing:
+        base = base.add_columns(func.max(Review.listing_name).label("name"))
+    rows = session.execute(base.group_by(series_col, bucket_col)).all()
+    result: Dict[str, Any] = {"bucket": bucket, "window": window, "series": []}
+    if not rows:
+        return result
+
+    # Rows arrive as (series, "YYYY-MM-DD"); every bucket gets a position in
+    # the full date range and every series a column code
+    full_index = pd.date_range(
+        min(r.bucket for r in rows),
+        max(r.bucket for r in rows),
+        freq=BUCKETS[bucket][1],
+    )
+    labels = full_index.strftime("%Y-%m-%d").tolist()
+    position = {label: i for i, label in enumerate(labels)}
+    codes: Dict[str, int] = {}
+    for r in rows:
+        codes.setdefault(r.series, len(codes))
+    names = {r.series: r.name for r in rows} if by_listing else {}
+
+    cat = func.json_each(Review.category_ratings).table_valued("key", "value")
+    cat_stmt = (
+        _filtered(
+            filters,
+            series_col,
+            bucket_col,
+            cat.c.key,
+            func.sum(cast(cat.c.value, Float)),
+            func.count(cat.c.value),
+        )
+        .join(cat, true())
+        .where(Review.submitted_ts.is_not(None))
+        .group_by(series_col, bucket_col, cat.c.key)
+    )
+    cat_rows = session.execute(cat_stmt).all()
+
+    cat_means: Dict[tuple, Dict[str, float]] = {}
+    for s, b, key, total, n in sorted(cat_rows, key=lambda r: r[2]):
+        cat_means.setdefault((s, b), {})[key] = round(float(total) / int(n), 2)
+
+    # Rolling means: one dense bucket x series matrix per measure, read back
+    # at each emitted point's (position, code)
+    rolled: Dict[str, np.ndarray] = {}
+    if window > 1:
+        shape = (len(labels), len(codes))
+        at = (
+            np.fromiter((position[r.bucket] for r in rows), np.int64, len(rows)),
+            np.fromiter((codes[r.series] for r in rows), np.int64, len(rows)),
+        )
+        sums, rated = np.zeros(shape), np.zeros(shape)
+        sums[at] = [float(r.rating_sum) for r in rows]
+        rated[at] = [r.rated for r in rows]
+        rolled["rating"] = _rolling_mean(sums, rated, window)[at]
+        totals: Dict[str, np.ndarray] = {}
+        counts: Dict[str, np.ndarray] = {}
+        for s, b, key, total, n in cat_rows:
+            if key not in totals:
+                totals[key], counts[key] = np.zeros(shape), np.zeros(shape)
+            cell = (position[b], codes[s])
+            totals[key][cell] = total
+            counts[key][cell] = n
+        for key in sorted(totals):
+            rolled[key] = _rolling_mean(totals[key], counts[key], window)[at]
+        rolled = {name: values.tolist() for name, values in rolled.items()}
+        cat_keys = [key for key in rolled if key != "rating"]
+
+    series: Dict[str, List[Dict[str, Any]]] = {}
+    for i, r in sorted(enumerate(rows), key=lambda ir: (ir[1].series, ir[1].bucket)):
+        point: Dict[str, Any] = {
+            "bucket": r.bucket,
+            "count": int(r.count),
+            "rated_count": int(r.rated),
+            "mean_rating": (
+                round(float(r.rating_sum) / r.rated, 2) if r.rated else None
+            ),
+            "category_means": cat_means.get((r.series, r.bucket), {}),
+        }
+        if window > 1:
+            point["rolling_mean_rating"] = _optional(rolled["rating"][i])
+            point["rolling_category_means"] = {
+                key: rolled[key][i]
+                for key in cat_keys
+                if rolled[key][i] == rolled[key][i]
+            }
+        series.setdefault(r.series, []).append(point)
+
+    for s, points in series.items():
+        entry: Dict[str, Any] = {"listing_id": None if s == PORTFOLIO else s}
+        if by_listing:
+            entry["listing_name"] = names.get(s)
+        entry["points"] = points
+        result["series"].append(entry)
+    return result
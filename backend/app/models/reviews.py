@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+    false,
+    func,
+    inspect,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from .approvals import Approval, get_approvals_for
+from .category_drift import apply_category_drift
+from .change_log import record_changes
+from .db import Base
+from .feed_versions import bump_feed_versions
+from .listing_stats import CONTRIBUTING_FIELDS, apply_review_changes
+from .review_search import fts, fts_rank, fts_snippet, fts_table, render_snippet
+
+
+class Review(Base):
+    """Normalized review as served by the API (minus the approval flag).
+
+    Rows are written by the ingest step and read by the API endpoints; the
+    ``approved`` flag is joined in from the approvals table at query time.
+    """
+
+    __tablename__ = "reviews"
+
+    # INTEGER PRIMARY KEY aliases the rowid, so the FTS index can key on it:
+    # an implicit rowid may be renumbered by VACUUM
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String, nullable=False)  # mock | live
+    review_id = Column(String, nullable=False)
+    listing_id = Column(String, nullable=False)
+    listing_name = Column(String, nullable=False)
+    channel = Column(String, nullable=False, default="hostaway")
+    type = Column(String, nullable=False)
+    status = Column(String, nullable=False)
+    rating_overall = Column(Float, nullable=True)
+    category_ratings = Column(JSON, nullable=False, default=dict)
+    text_public = Column(Text, nullable=True)
+    submitted_at = Column(String, nullable=False)  # ISO 8601 UTC, as served
+    submitted_ts = Column(Integer, nullable=True)  # epoch seconds, for filtering
+    author_name = Column(String, nullable=True)
+    account_id = Column(String, nullable=True)  # multi-account Hostaway only
+    ingested_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    __table_args__ = (
+        UniqueConstraint("source", "review_id", name="uq_reviews_source_review"),
+        Index("ix_reviews_source_submitted", "source", "submitted_ts"),
+        Index("ix_reviews_source_listing", "source", "listing_id", "submitted_ts"),
+        Index("ix_reviews_source_type", "source", "type"),
+        Index("ix_reviews_source_status", "source", "status"),
+        Index("ix_reviews_source_rating", "source", "rating_overall"),
+    )
+
+
+def migrate_review_ids(engine: Engine) -> bool:
+    """Give a store created before ``reviews.id`` existed its id column.
+
+    SQLite cannot add a primary key in place, so the table is recreated and
+    its rows copied in their rowid order; the old FTS index and triggers are
+    dropped and rebuilt by ``create_review_fts``. Returns True if it ran.
+    """
+    insp = inspect(engine)
+    if not insp.has_table("reviews"):
+        return False
+    if "id" in {c["name"] for c in insp.get_columns("reviews")}:
+        return False
+    from .review_search import drop_review_fts
+
+    table = Review.__table__
+    columns = ", ".join(c.name for c in table.columns if c.name != "id")
+    indexes = [index["name"] for index in insp.get_indexes("reviews")]
+    drop_review_fts(engine)
+    with engine.begin() as conn:
+        for name in indexes:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        conn.execute(text("ALTER TABLE reviews RENAME TO reviews_legacy"))
+        table.create(conn)
+        conn.execute(
+            text(
+                f"INSERT INTO reviews ({columns}) "
+                f"SELECT {columns} FROM reviews_legacy ORDER BY rowid"
+            )
+        )
+        conn.execute(text("DROP TABLE reviews_legacy"))
+    return True
+
+REVIEW_FIELDS = (
+    "review_id",
+    "listing_id",
+    "listing_name",
+    "channel",
+    "type",
+    "status",
+    "rating_overall",
+    "category_ratings",
+    "text_public",
+    "submitted_at",
+    "author_name",
+    "account_id",
+)
+
+# Columns read back from existing rows: rollup inputs plus everything served
+_EXISTING_FIELDS = tuple(dict.fromkeys((*CONTRIBUTING_FIELDS, *REVIEW_FIELDS[1:])))
+
+# Rows per batch: bounds the IN (...) lookup of existing rows below SQLite's
+# bound-parameter limit
+_UPSERT_CHUNK = 500
+
+
+def iso_to_epoch(value: Optional[str]) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    except Exception:
+        return None
+
+
+def upsert_reviews(
+    session: Session,
+    reviews: Iterable[Dict[str, Any]],
+    *,
+    source: str,
+    commit: bool = True,
+    late_drift: Optional[Set[str]] = None,
+) -> int:
+    """Insert new reviews and update changed ones; returns rows written.
+
+    Per-listing rollups in listing_stats and, for first-seen reviews, the
+    category drift statistics are adjusted, the feed version of every
+    listing whose served reviews changed is bumped and each new or changed
+    review is appended to the change log, in the same transaction.
+    Pass ``commit=False`` when the caller (e.g. the DB writer) commits, and
+    a ``late_drift`` set when it stores batches out of time order (e.g. a
+    sync storing newest-first pages): listings whose new reviews are older
+    than their drift rows are collected there for one
+    ``replay_category_drift`` at the end instead of being replayed per call.
+    """
+    # Keyed by review_id: a repeated ID keeps its last version, since one
+    # INSERT ... ON CONFLICT statement cannot touch the same row twice
+    by_id = {
+        str(r.get("review_id")): {
+            "source": source,
+            **{k: r.get(k) for k in REVIEW_FIELDS},
+            "category_ratings": r.get("category_ratings") or {},
+            "submitted_ts": iso_to_epoch(r.get("submitted_at")),
+        }
+        for r in reviews
+    }
+    rows = list(by_id.values())
+    # One single-row statement run with many parameter sets (executemany):
+    # compiled once instead of once per multi-row VALUES chunk
+    upsert = sqlite_insert(Review)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[Review.source, Review.review_id],
+        set_={
+            col: upsert.excluded[col] for col in (*REVIEW_FIELDS[1:], "submitted_ts")
+        }
+        | {"ingested_at": func.now()},
+    )
+    inserted: List[Dict[str, Any]] = []
+    logged: List[Dict[str, Any]] = []
+    written = 0
+    for start in range(0, len(rows), _UPSERT_CHUNK):
+        chunk = rows[start : start + _UPSERT_CHUNK]
+        ids = [r["review_id"] for r in chunk]
+        existing = {
+            row.review_id: dict(row._mapping)
+            for row in session.execute(
+                select(
+                    Review.review_id,
+                    *(getattr(Review, f) for f in _EXISTING_FIELDS),
+                ).where(Review.source == source, Review.review_id.in_(ids))
+            )
+        }
+        # Unchanged rows are left alone: no write, no FTS trigger, no new
+        # ingested_at
+        changed = [
+            (existing.get(row["review_id"]), row)
+            for row in chunk
+            if row["review_id"] not in existing
+            or any(existing[row["review_id"]][f] != row[f] for f in REVIEW_FIELDS[1:])
+        ]
+        if not changed:
+            continue
+        approvals = get_approvals_for(session, [row["review_id"] for _, row in changed])
+        changes = []
+        touched = set()
+        for old, row in changed:
+            flag = approvals.get(row["review_id"], False)
+            touched.add((source, row["listing_id"]))
+            logged.append(
+                {
+                    "kind": "review",
+                    "source": source,
+                    "review_id": row["review_id"],
+                    "listing_id": row["listing_id"],
+                }
+            )
+            if old is not None:
+                touched.add((source, old["listing_id"]))
+            changes.append(
+                (
+                    {**old, "approved": flag} if old is not None else None,
+                    {**row, "approved": flag},
+                )
+            )
+        session.execute(upsert, [row for _, row in changed])
+        written += len(changed)
+        apply_review_changes(session, source, changes)
+        inserted.extend(new for old, new in changes if old is None)
+        bump_feed_versions(session, touched)
+    if not written:
+        if commit:
+            session.commit()  # ends the read transaction
+        return 0
+    # Once per call: every listing's drift rows are read and written one time
+    apply_category_drift(session, source, inserted, late_drift)
+    record_changes(session, logged)
+    if commit:
+        session.commit()
+    return written
+
+
+def has_reviews(session: Session, source: str) -> bool:
+    stmt = select(Review.review_id).where(Review.source == source).limit(1)
+    return session.execute(stmt).first() is not None
+
+
+def review_select():
+    """Base select yielding rows in the NormalizedReview shape."""
+    approved = func.coalesce(Approval.approved, false()).label("approved")
+    return select(*(getattr(Review, k) for k in REVIEW_FIELDS), approved).outerjoin(
+        Approval, Approval.review_id == Review.review_id
+    )
+
+
+@dataclass(frozen=True)
+class ReviewFilters:
+    """Filter predicates shared by the review read endpoints."""
+
+    source: str
+    listing_id: Optional[str] = None
+    channel: Optional[str] = None
+    review_type: Optional[str] = None
+    status: Optional[str] = None
+    min_rating: Optional[float] = None
+    approved: Optional[bool] = None
+    start_ts: Optional[float] = None
+    end_ts: Optional[float] = None
+    # FTS5 MATCH expression, already passed through build_fts_query
+    text_query: Optional[str] = None
+
+    def apply(self, stmt):
+        if self.text_query:
+            stmt = stmt.join(fts_table, fts_table.c.rowid == Review.id).where(
+                fts.op("MATCH")(self.text_query)
+            )
+        stmt = stmt.where(Review.source == self.source)
+        if self.listing_id:
+            stmt = stmt.where(Review.listing_id == self.listing_id)
+        if self.channel:
+            stmt = stmt.where(Review.channel == self.channel)
+        if self.review_type:
+            stmt = stmt.where(Review.type == self.review_type)
+        if self.status:
+            stmt = stmt.where(Review.status == self.status)
+        if self.min_rating is not None:
+            stmt = stmt.where(Review.rating_overall >= float(self.min_rating))
+        if self.approved is not None:
+            approved_col = func.coalesce(Approval.approved, false())
+            stmt = stmt.where(approved_col == bool(self.approved))
+        if self.start_ts is not None:
+            stmt = stmt.where(Review.submitted_ts >= self.start_ts)
+        if self.end_ts is not None:
+            stmt = stmt.where(Review.submitted_ts <= self.end_ts)
+        return stmt
+
+
+# Sort name -> (key columns, descending). Every key ends with the primary key so
+# the ordering is total and a keyset cursor identifies exactly one position.
+_RATING_KEY = func.coalesce(Review.rating_overall, -1.0)
+SORT_KEYS: Dict[str, Tuple[Tuple[Any, ...], bool]] = {
+    "date_desc": ((Review.submitted_ts, Review.review_id), True),
+    "date_asc": ((Review.submitted_ts, Review.review_id), False),
+    "rating_desc": ((_RATING_KEY, Review.submitted_ts, Review.review_id), True),
+    "rating_asc": ((_RATING_KEY, Review.submitted_ts, Review.review_id), False),
+    # Only valid with a text query: best bm25 match first
+    "relevance": ((fts_rank, Review.submitted_ts, Review.review_id), False),
+}
+
+
+# JSON types a cursor may hold per key position of each sort (bool excluded
+# separately): numbers for ratings and ranks, int or null for timestamps
+_NUMBER = (int, float)
+_TS = (int, type(None))
+CURSOR_TYPES: Dict[str, Tuple[Tuple[type, ...], ...]] = {
+    "date_desc": (_TS, (str,)),
+    "date_asc": (_TS, (str,)),
+    "rating_desc": (_NUMBER, _TS, (str,)),
+    "rating_asc": (_NUMBER, _TS, (str,)),
+    "relevance": (_NUMBER, _TS, (str,)),
+}
+
+
+def encode_cursor(values: List[Any]) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    if not isinstance(values, list):
+        raise ValueError("Malformed cursor")
+    return values
+
+
+def query_review_page(
+    session: Session,
+    filters: ReviewFilters,
+    *,
+    sort: str = "date_desc",
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one keyset-paginated page of reviews and the cursor for the next.
+
+    Raises ValueError for an unknown sort or a cursor that does not match it.
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort: {sort}")
+    if sort == "relevance" and not filters.text_query:
+        raise ValueError("sort=relevance requires a text query")
+    keys, descending = SORT_KEYS[sort]
+    stmt = filters.apply(review_select())
+    if filters.text_query:
+        stmt = stmt.add_columns(fts_snippet.label("snippet"))
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise ValueError("Cursor does not match sort")
+        for value, types in zip(values, CURSOR_TYPES[sort]):
+            if isinstance(value, bool) or not isinstance(value, types):
+                raise ValueError("Malformed cursor")
+        key_tuple, value_tuple = tuple_(*keys), tuple_(*values)
+        stmt = stmt.where(
+            key_tuple < value_tuple if descending else key_tuple > value_tuple
+        )
+    stmt = stmt.order_by(*(k.desc() if descending else k.asc() for k in keys))
+    if limit is not None:
+        stmt = stmt.add_columns(*(k.label(f"_k{i}") for i, k in enumerate(keys)))
+        stmt = stmt.limit(limit + 1)
+
+    rows = session.execute(stmt).all()
+    next_cursor: Optional[str] = None
+    if limit is not None and len(rows) > limit:
+        last = rows[limit - 1]._mapping
+        next_cursor = encode_cursor([last[f"_k{i}"] for i in range(len(keys))])
+        rows = rows[:limit]
+    return [_row_to_dict(row) for row in rows], next_cursor
+
+
+def query_reviews(session: Session, filters: ReviewFilters) -> List[Dict[str, Any]]:
+    """Return every review matching ``filters``, newest first."""
+    rows, _ = query_review_page(session, filters)
+    return rows
+
+
+def _row_to_dict(row: Any) -> Dict[str, Any]:
+    out = {k: v for k, v in row._mapping.items() if not k.startswith("_k")}
+    out["category_ratings"] = out.get("category_ratings") or {}
+    out["approved"] = bool(out.get("approved"))
+    if "snippet" in out:
+        out["snippet"] = render_snippet(out["snippet"])
+    return out
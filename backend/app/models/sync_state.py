@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, String
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from .db import Base
+
+
+class SyncState(Base):
+    """High-water mark of an incremental upstream sync, one row per feed."""
+
+    __tablename__ = "sync_state"
+
+    name = Column(String, primary_key=True)
+    hwm_submitted_at = Column(String, nullable=True)  # upstream submittedAt
+    hwm_review_id = Column(Integer, nullable=True)
+    last_fetched = Column(Integer, nullable=False, default=0)
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
+def get_sync_state(session: Session, name: str) -> Optional[SyncState]:
+    return session.get(SyncState, name)
+
+
+def save_sync_state(
+    session: Session,
+    name: str,
+    *,
+    hwm_submitted_at: Optional[str],
+    hwm_review_id: Optional[int],
+    last_fetched: int,
+    commit: bool = True,
+) -> None:
+    obj = session.get(SyncState, name)
+    if obj is None:
+        obj = SyncState(name=name)
+        session.add(obj)
+    obj.hwm_submitted_at = hwm_submitted_at
+    obj.hwm_review_id = hwm_review_id
+    obj.last_fetched = last_fetched
+    if commit:
+        session.commit()
+
+
+def reset_sync_state(session: Session, name: str) -> None:
+    obj = session.get(SyncState, name)
+    if obj is not None:
+        session.delete(obj)
+        session.commit()
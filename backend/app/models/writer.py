@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from ..config import DB_WRITER_MAX_BATCH
+from .db import SessionLocal
+
+
+T = TypeVar("T")
+Job = Tuple[Callable[[Session], Any], Future]
+
+
+class DbWriter:
+    """Serializes every write through one thread that batches commits.
+
+    ``run(fn)`` queues ``fn(session)`` and blocks until its batch has been
+    committed. Jobs queued while the writer is busy share one transaction, so
+    a burst of approval clicks costs a single fsync. Jobs must not commit
+    themselves; if any job in a batch fails, the batch is rolled back and its
+    jobs are retried one transaction each, so only the failing job reports
+    the error.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker = SessionLocal,
+        max_batch: int = DB_WRITER_MAX_BATCH,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch = max_batch
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="db-writer", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """Finish queued jobs and stop the thread; ``run`` restarts it."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def submit(self, fn: Callable[[Session], T]) -> "Future[T]":
+        if threading.current_thread() is self._thread:
+            # A job waiting on another queued job would wait on itself
+            raise RuntimeError("DbWriter.submit called from the writer thread")
+        future: "Future[T]" = Future()
+        self.start()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn: Callable[[Session], T]) -> T:
+        """Queue ``fn(session)`` and wait for its committed result."""
+        return self.submit(fn).result()
+
+    def _loop(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch: List[Job] = [job]
+            stopping = False
+            while len(batch) < self._max_batch:
+                try:
+                    nxt = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stopping = True
+                    break
+                batch.append(nxt)
+            self._run_batch(batch)
+            if stopping:
+                return
+
+    def _run_batch(self, batch: List[Job]) -> None:
+        self.batches += 1
+        self.jobs += len(batch)
+        with self._session_factory() as session:
+            try:
+                results = [fn(session) for fn, _ in batch]
+                session.commit()
+            except Exception as exc:
+                session.rollback()
+                if len(batch) == 1:
+                    batch[0][1].set_exception(exc)
+                    return
+                for job in batch:
+                    self._run_alone(session, job)
+                return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    @staticmethod
+    def _run_alone(session: Session, job: Job) -> None:
+        fn, future = job
+        try:
+            result = fn(session)
+            session.commit()
+        except Exception as exc:
+            session.rollback()
+            future.set_exception(exc)
+        else:
+            future.set_result(result)
+
+
+db_writer = DbWriter()
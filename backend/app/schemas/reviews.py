@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +15,8 @@ class NormalizedReview(BaseModel):
     text_public: Optional[str] = None
     submitted_at: str
     author_name: Optional[str] = None
+    # Hostaway account the review came from; None for single-account feeds
+    account_id: Optional[str] = None
     approved: bool = False
 
 
@@ -23,3 +25,7 @@ class ApproveRequest(BaseModel):
     approved: bool
     channel: Optional[str] = "hostaway"
     listing_id: Optional[str] = None
+
+
+class BulkApproveRequest(BaseModel):
+    items: List[ApproveRequest] = Field(default_factory=list)
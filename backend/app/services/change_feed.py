@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import EVENTS_HEARTBEAT_SECONDS, EVENTS_MAX_STREAM_SECONDS
+from ..models.change_log import (
+    add_change_listener,
+    changes_after,
+    latest_change_id,
+    oldest_change_id,
+)
+from ..models.db import SessionLocal
+from ..models.reviews import Review, review_select
+
+# Changes read from the log per round trip
+_READ_BATCH = 500
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MS = 3000
+
+Event = Tuple[int, str, Dict[str, Any]]  # (id, event name, data)
+
+
+def format_event(event_id: Optional[int], name: str, data: Dict[str, Any]) -> str:
+    """One ``text/event-stream`` frame."""
+    head = f"id: {event_id}\n" if event_id is not None else ""
+    payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return f"{head}event: {name}\ndata: {payload}\n\n"
+
+
+def resume_point(
+    last_event_id: Optional[int], latest: int, oldest: Optional[int]
+) -> Tuple[int, bool]:
+    """``(cursor, reset)`` for a client resuming after ``last_event_id``.
+
+    New clients start at the head of the log. A client whose ID was pruned,
+    or is ahead of the log (e.g. the store was recreated), must refetch:
+    ``reset`` is True and it continues from the head.
+    """
+    if last_event_id is None:
+        return latest, False
+    if last_event_id > latest:
+        return latest, True
+    if last_event_id < latest and (oldest is None or last_event_id < oldest - 1):
+        return latest, True
+    return last_event_id, False
+
+
+def _hydrate(session, source: str, review_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    stmt = review_select().where(
+        Review.source == source, Review.review_id.in_(review_ids)
+    )
+    out: Dict[str, Dict[str, Any]] = {}
+    for row in session.execute(stmt):
+        review = dict(row._mapping)
+        review["category_ratings"] = review.get("category_ratings") or {}
+        review["approved"] = bool(review.get("approved"))
+        out[review["review_id"]] = review
+    return out
+
+
+def read_events(
+    session, source: Optional[str], after_id: int, limit: int = _READ_BATCH
+) -> Tuple[List[Event], int, bool]:
+    """Events after ``after_id``: ``(events, new cursor, more pending)``.
+
+    Review events carry the review as currently stored, so several changes
+    to one review all show its latest state.
+    """
+    changes = changes_after(session, after_id, source, limit)
+    if not changes:
+        return [], after_id, False
+    wanted: Dict[str, List[str]] = {}
+    for c in changes:
+        if c["kind"] == "review":
+            wanted.setdefault(c["source"], []).append(c["review_id"])
+    reviews = {
+        src: _hydrate(session, src, list(dict.fromkeys(ids)))
+        for src, ids in wanted.items()
+    }
+    events: List[Event] = []
+    for c in changes:
+        if c["kind"] == "review":
+            review = reviews[c["source"]].get(c["review_id"])
+            if review is not None:
+                events.append(
+                    (c["id"], "review", {"source": c["source"], "review": review})
+                )
+        else:
+            events.append(
+                (
+                    c["id"],
+                    "approval",
+                    {
+                        "source": c["source"],
+                        "review_id": c["review_id"],
+                        "listing_id": c["listing_id"],
+                        "approved": bool(c["approved"]),
+                    },
+                )
+            )
+    return events, changes[-1]["id"], len(changes) == limit
+
+
+class ChangeFeed:
+    """Wakes open event streams when a commit appends to the change log.
+
+    Commits happen on worker threads; each stream waits on an asyncio.Event
+    of its own loop, set thread-safely from the change-log listener.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+        self._lock = threading.Lock()
+
+    def notify(self) -> None:
+        with self._lock:
+            waiters = list(self._waiters)
+        for loop, wake in waiters:
+            try:
+                loop.call_soon_threadsafe(wake.set)
+            except RuntimeError:  # loop already closed
+                pass
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._waiters)
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Event]:
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            yield waiter[1]
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+    async def stream(
+        self,
+        source: Optional[str],
+        last_event_id: Optional[int],
+        is_disconnected=None,
+    ) -> AsyncIterator[str]:
+        """SSE frames for ``source`` from ``last_event_id`` on.
+
+        Sends a ``reset`` event when the client must refetch, keep-alive
+        comments every EVENTS_HEARTBEAT_SECONDS, and ends after
+        EVENTS_MAX_STREAM_SECONDS so the client reconnects with its
+        Last-Event-ID.
+        """
+
+        def _head() -> Tuple[int, Optional[int]]:
+            with SessionLocal() as session:
+                return latest_change_id(session), oldest_change_id(session)
+
+        def _read(after_id: int) -> Tuple[List[Event], int, bool]:
+            with SessionLocal() as session:
+                return read_events(session, source, after_id)
+
+        deadline = time.monotonic() + EVENTS_MAX_STREAM_SECONDS
+        with self.subscribe() as wake:
+            latest, oldest = await run_in_threadpool(_head)
+            cursor, reset = resume_point(last_event_id, latest, oldest)
+            yield f"retry: {RETRY_MS}\n\n"
+            if reset:
+                yield format_event(cursor, "reset", {"latest_id": cursor})
+            while True:
+                # Cleared before reading: a commit after this point wakes us
+                wake.clear()
+                events, cursor, more = await run_in_threadpool(_read, cursor)
+                for event_id, name, data in events:
+                    yield format_event(event_id, name, data)
+                if more:
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if is_disconnected is not None and await is_disconnected():
+                    return
+                try:
+                    await asyncio.wait_for(
+                        wake.wait(),
+                        min(EVENTS_HEARTBEAT_SECONDS, remaining),
+                    )
+                except asyncio.TimeoutError:
+                    if time.monotonic() < deadline:
+                        yield ": keep-alive\n\n"
+
+
+change_feed = ChangeFeed()
+add_change_listener(change_feed.notify)
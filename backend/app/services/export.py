@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..models.db import SessionLocal
+from ..models.reviews import REVIEW_FIELDS, ReviewFilters, query_review_page
+
+
+EXPORT_COLUMNS = (*REVIEW_FIELDS, "approved")
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "parquet": "application/vnd.apache.parquet",
+}
+EXPORT_CHUNK_SIZE = 1000
+
+
+def iter_review_chunks(
+    filters: ReviewFilters, chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield matching reviews newest first, one keyset page at a time.
+
+    Each page is a short query of its own, so no read transaction or cursor
+    stays open while the client consumes the stream.
+    """
+    cursor: Optional[str] = None
+    while True:
+        with SessionLocal() as session:
+            rows, cursor = query_review_page(
+                session, filters, limit=chunk_size, cursor=cursor
+            )
+        if rows:
+            yield rows
+        if not cursor:
+            return
+
+
+def ndjson_stream(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n"
+            for r in rows
+        ).encode("utf-8")
+
+
+def csv_stream(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(EXPORT_COLUMNS)
+    yield buf.getvalue().encode("utf-8")
+    for rows in chunks:
+        buf.seek(0)
+        buf.truncate()
+        for r in rows:
+            writer.writerow(
+                [
+                    json.dumps(r[c], separators=(",", ":"))
+                    if c == "category_ratings"
+                    else r[c]
+                    for c in EXPORT_COLUMNS
+                ]
+            )
+        yield buf.getvalue().encode("utf-8")
+
+
+class _DrainableSink(io.RawIOBase):
+    """Write-only file whose buffered bytes can be handed off between writes."""
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        self._buf += data
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def drain(self) -> bytes:
+        out, self._buf = bytes(self._buf), bytearray()
+        return out
+
+
+def parquet_stream(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[bytes]:
+    """Write one Parquet row group per chunk, yielding bytes as they are produced.
+
+    Requires the optional ``pyarrow`` package; check ``parquet_available`` first.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("review_id", pa.string()),
+            ("listing_id", pa.string()),
+            ("listing_name", pa.string()),
+            ("channel", pa.string()),
+            ("type", pa.string()),
+            ("status", pa.string()),
+            ("rating_overall", pa.float64()),
+            ("category_ratings", pa.map_(pa.string(), pa.float64())),
+            ("text_public", pa.string()),
+            ("submitted_at", pa.string()),
+            ("author_name", pa.string()),
+            ("account_id", pa.string()),
+            ("approved", pa.bool_()),
+        ]
+    )
+    sink = _DrainableSink()
+    writer = pq.ParquetWriter(sink, schema)
+    try:
+        for rows in chunks:
+            columns = {c: [r[c] for r in rows] for c in EXPORT_COLUMNS}
+            columns["category_ratings"] = [
+                list(r["category_ratings"].items()) for r in rows
+            ]
+            writer.write_table(pa.table(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+STREAMERS = {"ndjson": ndjson_stream, "csv": csv_stream, "parquet": parquet_stream}
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from ..config import (
+    GOOGLE_CACHE_MAX_ENTRIES,
+    GOOGLE_DETAILS_TTL,
+    GOOGLE_PLACE_ID_TTL,
+)
+from ..models.db import SessionLocal
+from ..models.google_cache import cache_lookup, cache_put, cache_touch
+from ..models.writer import db_writer
+from .google_places import afetch_place_details, afind_place_id_by_text
+
+
+def _query_key(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _read(kind: str, key: str, ttl: float) -> Optional[Any]:
+    with SessionLocal() as session:
+        payload = cache_lookup(session, kind, key, ttl)
+    if payload is not None:
+        # The LRU timestamp is bookkeeping; do not make the read wait for it
+        db_writer.submit(lambda s: cache_touch(s, kind, key, commit=False))
+    return payload
+
+
+def _write(kind: str, key: str, payload: Any) -> None:
+    db_writer.run(
+        lambda s: cache_put(
+            s,
+            kind,
+            key,
+            payload,
+            max_entries=GOOGLE_CACHE_MAX_ENTRIES,
+            commit=False,
+        )
+    )
+
+
+async def cached_place_id(query: str, *, refresh: bool = False) -> Optional[str]:
+    """Resolve ``query`` to a place_id, memoized for GOOGLE_PLACE_ID_TTL."""
+    key = _query_key(query)
+    if not refresh:
+        hit = await run_in_threadpool(_read, "place_id", key, GOOGLE_PLACE_ID_TTL)
+        if hit:
+            return hit
+    place_id = await afind_place_id_by_text(query)
+    # Failed lookups are not cached so a fixed key/quota takes effect at once
+    if place_id:
+        await run_in_threadpool(_write, "place_id", key, place_id)
+    return place_id
+
+
+async def cached_place_details(
+    place_id: str, *, refresh: bool = False
+) -> Dict[str, Any]:
+    """Place details for ``place_id``, cached for GOOGLE_DETAILS_TTL."""
+    if not refresh:
+        hit = await run_in_threadpool(_read, "details", place_id, GOOGLE_DETAILS_TTL)
+        if hit:
+            return hit
+    place = await afetch_place_details(place_id)
+    if place:
+        await run_in_threadpool(_write, "details", place_id, place)
+    return place
@@ -7,6 +7,8 @@ from typing import Any, Dict, List, Optional
 import requests
 
 from ..config import GOOGLE_PLACES_API_KEY
+from .http_client import get_http_client
+from .metrics import track_upstream
 
 
 PLACES_FIND_URL = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
@@ -33,7 +35,9 @@ def find_place_id_by_text(query: str) -> Optional[str]:
         "key": GOOGLE_PLACES_API_KEY,
     }
     try:
-        resp = requests.get(PLACES_FIND_URL, params=params, timeout=15)
+        with track_upstream("google") as call:
+            resp = requests.get(PLACES_FIND_URL, params=params, timeout=15)
+            call.outcome = str(resp.status_code)
         data = resp.json()
         candidates = data.get("candidates") or []
         if not candidates:
@@ -52,7 +56,51 @@ def fetch_place_details(place_id: str) -> Dict[str, Any]:
         "key": GOOGLE_PLACES_API_KEY,
     }
     try:
-        resp = requests.get(PLACES_DETAILS_URL, params=params, timeout=20)
+        with track_upstream("google") as call:
+            resp = requests.get(PLACES_DETAILS_URL, params=params, timeout=20)
+            call.outcome = str(resp.status_code)
+        return resp.json().get("result", {})
+    except Exception:
+        return {}
+
+
+async def afind_place_id_by_text(query: str) -> Optional[str]:
+    """Async variant of ``find_place_id_by_text`` using the shared client."""
+    if not GOOGLE_PLACES_API_KEY:
+        return None
+    params = {
+        "input": query,
+        "inputtype": "textquery",
+        "fields": "place_id,name",
+        "key": GOOGLE_PLACES_API_KEY,
+    }
+    try:
+        client = await get_http_client()
+        with track_upstream("google") as call:
+            resp = await client.get(PLACES_FIND_URL, params=params, timeout=15)
+            call.outcome = str(resp.status_code)
+        candidates = resp.json().get("candidates") or []
+        if not candidates:
+            return None
+        return candidates[0].get("place_id")
+    except Exception:
+        return None
+
+
+async def afetch_place_details(place_id: str) -> Dict[str, Any]:
+    """Async variant of ``fetch_place_details`` using the shared client."""
+    if not GOOGLE_PLACES_API_KEY:
+        return {}
+    params = {
+        "place_id": place_id,
+        "fields": "name,rating,user_ratings_total,reviews",
+        "key": GOOGLE_PLACES_API_KEY,
+    }
+    try:
+        client = await get_http_client()
+        with track_upstream("google") as call:
+            resp = await client.get(PLACES_DETAILS_URL, params=params, timeout=20)
+            call.outcome = str(resp.status_code)
         return resp.json().get("result", {})
     except Exception:
         return {}
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ..config import (
+    HOSTAWAY_ACCOUNT_RATE,
+    HOSTAWAY_ACCOUNT_TIMEOUT,
+    HOSTAWAY_ACCOUNTS,
+    HOSTAWAY_SYNC_PAGE_SIZE,
+)
+from ..models.reviews import upsert_reviews
+from ..models.writer import db_writer
+from . import hostaway_adapter
+from .hostaway_adapter import normalize_hostaway_items_bulk
+from .http_client import DEFAULT_LIMITS, DEFAULT_TIMEOUT
+from .metrics import track_upstream
+
+
+logger = logging.getLogger(__name__)
+
+# Attempts per page after a 429/5xx, honouring Retry-After when present
+MAX_RETRIES = 3
+
+
+@dataclass(frozen=True)
+class HostawayAccount:
+    account_id: str
+    api_key: str
+    name: str = ""
+    base_url: str = ""  # empty: HOSTAWAY_API_BASE
+    rate: float = HOSTAWAY_ACCOUNT_RATE  # requests per second
+
+
+@dataclass
+class AccountResult:
+    account_id: str
+    name: str
+    fetched: int = 0
+    written: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def parse_accounts(raw: str) -> Tuple[HostawayAccount, ...]:
+    """Parse the HOSTAWAY_ACCOUNTS JSON list; raises ValueError if malformed."""
+    if not raw.strip():
+        return ()
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError as exc:
+        raise ValueError(f"HOSTAWAY_ACCOUNTS is not valid JSON: {exc}") from exc
+    if not isinstance(data, list):
+        raise ValueError("HOSTAWAY_ACCOUNTS must be a JSON list")
+    accounts: List[HostawayAccount] = []
+    for entry in data:
+        if not isinstance(entry, dict) or not entry.get("id") or not entry.get("key"):
+            raise ValueError("Each Hostaway account needs an 'id' and a 'key'")
+        accounts.append(
+            HostawayAccount(
+                account_id=str(entry["id"]),
+                api_key=str(entry["key"]),
+                name=str(entry.get("name") or entry["id"]),
+                base_url=str(entry.get("base_url") or ""),
+                rate=float(entry.get("rate") or HOSTAWAY_ACCOUNT_RATE),
+            )
+        )
+    ids = [a.account_id for a in accounts]
+    if len(set(ids)) != len(ids):
+        raise ValueError("HOSTAWAY_ACCOUNTS lists the same account twice")
+    return tuple(accounts)
+
+
+_parse_cached = lru_cache(maxsize=4)(parse_accounts)
+
+
+def configured_accounts() -> Tuple[HostawayAccount, ...]:
+    """Accounts from HOSTAWAY_ACCOUNTS; empty in single-account mode."""
+    return _parse_cached(HOSTAWAY_ACCOUNTS)
+
+
+class _Pacer:
+    """Spaces one account's requests at most ``rate`` per second."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+            now = self._next
+        self._next = now + self._interval
+
+
+def _retry_delay(resp: httpx.Response, attempt: int) -> float:
+    try:
+        return min(float(resp.headers.get("Retry-After", "")), 30.0)
+    except ValueError:
+        return 0.5 * 2**attempt
+
+
+async def _fetch_page(
+    client: httpx.AsyncClient,
+    account: HostawayAccount,
+    pacer: _Pacer,
+    *,
+    offset: int,
+    limit: int,
+) -> List[Dict[str, Any]]:
+    base = account.base_url or hostaway_adapter.HOSTAWAY_API_BASE
+    url = f"{base}/accounts/{account.account_id}/reviews"
+    headers = {
+        "Authorization": f"Bearer {account.api_key}",
+        "Content-Type": "application/json",
+    }
+    params = {
+        "limit": limit,
+        "offset": offset,
+        "sortBy": "submittedAt",
+        "sortOrder": "desc",
+    }
+    for attempt in range(MAX_RETRIES + 1):
+        await pacer.wait()
+        with track_upstream("hostaway") as call:
+            resp = await client.get(url, headers=headers, params=params)
+            call.outcome = str(resp.status_code)
+        retryable = resp.status_code == 429 or resp.status_code >= 500
+        if retryable and attempt < MAX_RETRIES:
+            await asyncio.sleep(_retry_delay(resp, attempt))
+            continue
+        resp.raise_for_status()
+        return resp.json().get("result", []) or []
+    return []  # unreachable: the last attempt returns or raises
+
+
+async def fetch_account_reviews(
+    client: httpx.AsyncClient,
+    account: HostawayAccount,
+    page_size: int = HOSTAWAY_SYNC_PAGE_SIZE,
+) -> List[Dict[str, Any]]:
+    """Every review of one account, page by page at the account's rate."""
+    pacer = _Pacer(account.rate)
+    items: List[Dict[str, Any]] = []
+    offset = 0
+    while True:
+        page = await _fetch_page(
+            client, account, pacer, offset=offset, limit=page_size
+        )
+        items.extend(page)
+        if len(page) < page_size:
+            return items
+        offset += page_size
+
+
+def _store(account: HostawayAccount, items: List[Dict[str, Any]]) -> int:
+    normalized = normalize_hostaway_items_bulk(items, account_id=account.account_id)
+    return db_writer.run(
+        lambda session: upsert_reviews(
+            session, normalized, source="live", commit=False
+        )
+    )
+
+
+async def aingest_accounts(
+    accounts: Sequence[HostawayAccount],
+    *,
+    page_size: int = HOSTAWAY_SYNC_PAGE_SIZE,
+    timeout: float = HOSTAWAY_ACCOUNT_TIMEOUT,
+) -> List[AccountResult]:
+    """Fetch all accounts concurrently into the live store.
+
+    Each account is stored as soon as its own feed is complete, so a slow
+    account delays nobody else; one that fails or exceeds ``timeout`` keeps
+    its previously stored reviews and reports the error in its result.
+    """
+
+    async def run(client: httpx.AsyncClient, account: HostawayAccount):
+        result = AccountResult(account.account_id, account.name)
+        start = time.perf_counter()
+        try:
+            items = await asyncio.wait_for(
+                fetch_account_reviews(client, account, page_size), timeout
+            )
+            result.fetched = len(items)
+            result.written = await asyncio.to_thread(_store, account, items)
+        except Exception as exc:
+            result.error = str(exc) or type(exc).__name__
+            logger.warning("Hostaway account %s failed: %s", account.name, result.error)
+        result.seconds = time.perf_counter() - start
+        return result
+
+    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS) as c:
+        return list(await asyncio.gather(*(run(c, a) for a in accounts)))
+
+
+def ingest_accounts(
+    accounts: Optional[Sequence[HostawayAccount]] = None, **kwargs: Any
+) -> List[AccountResult]:
+    """Blocking wrapper around ``aingest_accounts`` (configured accounts by default)."""
+    coro = aingest_accounts(
+        configured_accounts() if accounts is None else accounts, **kwargs
+    )
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Inside a running loop (e.g. a sync startup hook): run on a helper thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
@@ -4,10 +4,15 @@ import json
 import re
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
 import requests
 
 from ..config import DATA_DIR, HOSTAWAY_ACCOUNT_ID, HOSTAWAY_API_KEY, HOSTAWAY_API_BASE
+from .http_client import get_http_client
+from .metrics import track_upstream
 
 
 def _slugify(value: str) -> str:
@@ -74,38 +79,99 @@ def load_hostaway_reviews(
     return normalize_hostaway_items(items, approvals_map)
 
 
-def fetch_hostaway_live_reviews() -> List[Dict[str, Any]]:
-    """Fetch reviews from Hostaway API (sandbox/production depending on keys).
+def fetch_hostaway_live_payload(
+    etag: Optional[str] = None,
+) -> Tuple[int, List[Dict[str, Any]], Optional[str]]:
+    """Conditionally fetch raw Hostaway reviews.
 
-    Returns Hostaway raw payload list under result[], or empty list on errors.
+    Returns ``(status_code, items, etag)``; a 304 means the payload identified
+    by ``etag`` is still current. Errors surface as status 0 with no items.
     """
     if not HOSTAWAY_API_KEY or not HOSTAWAY_ACCOUNT_ID:
-        return []
+        return 0, [], None
 
     url = f"{HOSTAWAY_API_BASE}/accounts/{HOSTAWAY_ACCOUNT_ID}/reviews"
     headers = {
         "Authorization": f"Bearer {HOSTAWAY_API_KEY}",
         "Content-Type": "application/json",
     }
+    if etag:
+        headers["If-None-Match"] = etag
     try:
-        resp = requests.get(url, headers=headers, timeout=20)
+        with track_upstream("hostaway") as call:
+            resp = requests.get(url, headers=headers, timeout=20)
+            call.outcome = str(resp.status_code)
+        if resp.status_code == 304:
+            return 304, [], etag
         if resp.status_code != 200:
-            return []
+            return resp.status_code, [], None
         data = resp.json()
-        return data.get("result", []) or []
+        return 200, data.get("result", []) or [], resp.headers.get("ETag")
     except Exception:
-        return []
+        return 0, [], None
+
+
+async def afetch_hostaway_live_payload(
+    etag: Optional[str] = None,
+) -> Tuple[int, List[Dict[str, Any]], Optional[str]]:
+    """Async variant of ``fetch_hostaway_live_payload`` using the shared client."""
+    if not HOSTAWAY_API_KEY or not HOSTAWAY_ACCOUNT_ID:
+        return 0, [], None
+
+    url = f"{HOSTAWAY_API_BASE}/accounts/{HOSTAWAY_ACCOUNT_ID}/reviews"
+    headers = {
+        "Authorization": f"Bearer {HOSTAWAY_API_KEY}",
+        "Content-Type": "application/json",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    try:
+        client = await get_http_client()
+        with track_upstream("hostaway") as call:
+            resp = await client.get(url, headers=headers)
+            call.outcome = str(resp.status_code)
+        if resp.status_code == 304:
+            return 304, [], etag
+        if resp.status_code != 200:
+            return resp.status_code, [], None
+        data = resp.json()
+        return 200, data.get("result", []) or [], resp.headers.get("ETag")
+    except Exception:
+        return 0, [], None
+
+
+def fetch_hostaway_live_reviews() -> List[Dict[str, Any]]:
+    """Fetch reviews from Hostaway API (sandbox/production depending on keys).
+
+    Returns Hostaway raw payload list under result[], or empty list on errors.
+    """
+    _, items, _ = fetch_hostaway_live_payload()
+    return items
+
+
+def _namespace(account_id: Optional[str]) -> str:
+    """Prefix keeping IDs from different Hostaway accounts apart."""
+    return f"{account_id}:" if account_id else ""
 
 
 def normalize_hostaway_items(
-    items: List[Dict[str, Any]], approvals_map: Optional[Dict[str, bool]] = None
+    items: List[Dict[str, Any]],
+    approvals_map: Optional[Dict[str, bool]] = None,
+    account_id: Optional[str] = None,
 ) -> List[Dict[str, Any]]:
+    """Normalize raw Hostaway reviews, newest first.
+
+    With ``account_id`` (multi-account feeds) review and listing IDs are
+    namespaced as ``{account}:{id}`` and ``hostaway:{account}:{slug}``, so
+    equal IDs or listing names in two accounts never collide.
+    """
     approvals_map = approvals_map or {}
+    ns = _namespace(account_id)
     normalized: List[Dict[str, Any]] = []
     for item in items:
-        review_id = str(item.get("id"))
+        review_id = f"{ns}{item.get('id')}"
         listing_name = item.get("listingName") or "Unknown Listing"
-        listing_id = f"hostaway:{_slugify(listing_name)}"
+        listing_id = f"hostaway:{ns}{_slugify(listing_name)}"
         categories = item.get("reviewCategory") or []
         rating_overall = _compute_overall_rating(item.get("rating"), categories)
         normalized.append(
@@ -121,9 +187,107 @@ def normalize_hostaway_items(
                 "text_public": item.get("publicReview"),
                 "submitted_at": _to_iso_utc(item.get("submittedAt")),
                 "author_name": item.get("guestName") or None,
+                "account_id": account_id,
                 "approved": bool(approvals_map.get(review_id, False)),
             }
         )
 
     normalized.sort(key=lambda r: r.get("submitted_at", ""), reverse=True)
     return normalized
+
+
+def normalize_hostaway_items_bulk(
+    items: List[Dict[str, Any]],
+    approvals_map: Optional[Dict[str, bool]] = None,
+    account_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Column-wise equivalent of ``normalize_hostaway_items`` for large payloads.
+
+    Slugs and types are computed once per distinct value, timestamps are
+    parsed in one call and category means are array reductions. The output is
+    identical to the per-item function, including the order of ties.
+    """
+    approvals_map = approvals_map or {}
+    n = len(items)
+    if n == 0:
+        return []
+
+    ns = _namespace(account_id)
+    review_ids = [f"{ns}{item.get('id')}" for item in items]
+    names = [item.get("listingName") or "Unknown Listing" for item in items]
+    slugs = {name: f"hostaway:{ns}{_slugify(name)}" for name in set(names)}
+    raw_types = [item.get("type") for item in items]
+    types = {t: _normalize_type(t) for t in set(raw_types)}
+
+    submitted = pd.to_datetime(
+        pd.Series([item.get("submittedAt") for item in items], dtype=object),
+        format="%Y-%m-%d %H:%M:%S",
+    )
+    if submitted.isna().any():
+        raise ValueError("every Hostaway review needs a submittedAt timestamp")
+    seconds = submitted.to_numpy(dtype="datetime64[s]")
+    submitted_at = np.char.add(np.datetime_as_string(seconds, unit="s"), "Z")
+
+    # Flatten every category rating once: owner index, value, name
+    owners: List[int] = []
+    values: List[float] = []
+    category_maps: List[Dict[str, float]] = []
+    for i, item in enumerate(items):
+        cats: Dict[str, float] = {}
+        for c in item.get("reviewCategory") or []:
+            rating = c.get("rating")
+            if rating is None:
+                continue
+            value = float(rating)
+            owners.append(i)
+            values.append(value)
+            cats[str(c.get("category") or "unknown")] = value
+        category_maps.append(cats)
+    counts = np.bincount(np.asarray(owners, dtype=np.int64), minlength=n)
+    sums = np.bincount(
+        np.asarray(owners, dtype=np.int64),
+        weights=np.asarray(values, dtype=np.float64),
+        minlength=n,
+    )
+
+    top_level = pd.Series([item.get("rating") for item in items], dtype=object)
+    has_top = top_level.notna().to_numpy()
+    top = pd.to_numeric(top_level, errors="coerce").to_numpy(dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = sums / counts
+    # A present-but-unparseable top-level rating yields None, like the
+    # per-item path; only reviews without one fall back to the category mean.
+    overall = np.where(has_top, top, np.where(counts > 0, means, np.nan))
+    from_categories = ~has_top & (counts > 0)
+
+    order = np.argsort(-seconds.astype(np.int64), kind="stable")
+    overall_list = overall.tolist()
+    from_categories_list = from_categories.tolist()
+    submitted_list = submitted_at.tolist()
+    normalized: List[Dict[str, Any]] = []
+    for i in order.tolist():
+        item = items[i]
+        rating = overall_list[i]
+        if rating != rating:  # NaN
+            rating = None
+        elif from_categories_list[i]:
+            # Python's round() is correctly rounded; np.round is not always
+            rating = round(rating, 2)
+        normalized.append(
+            {
+                "review_id": review_ids[i],
+                "listing_id": slugs[names[i]],
+                "listing_name": names[i],
+                "channel": "hostaway",
+                "type": types[raw_types[i]],
+                "status": item.get("status") or "unknown",
+                "rating_overall": rating,
+                "category_ratings": category_maps[i],
+                "text_public": item.get("publicReview"),
+                "submitted_at": submitted_list[i],
+                "author_name": item.get("guestName") or None,
+                "account_id": account_id,
+                "approved": bool(approvals_map.get(review_ids[i], False)),
+            }
+        )
+    return normalized
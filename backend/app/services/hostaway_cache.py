@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from ..config import HOSTAWAY_CACHE_STALE_TTL, HOSTAWAY_CACHE_TTL
+from .hostaway_adapter import afetch_hostaway_live_payload, fetch_hostaway_live_payload
+
+
+# (etag) -> (status_code, items, etag); see fetch_hostaway_live_payload
+LoadResult = Tuple[int, List[Dict[str, Any]], Optional[str]]
+Loader = Callable[[Optional[str]], LoadResult]
+AsyncLoader = Callable[[Optional[str]], Awaitable[LoadResult]]
+
+
+@dataclass
+class CachedPayload:
+    items: List[Dict[str, Any]]
+    etag: Optional[str]
+    fetched_at: float
+    # Bumped whenever upstream returns a new body, so consumers can tell
+    # whether anything changed since they last looked
+    version: int
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    upstream_calls: int = 0
+    not_modified: int = 0
+    errors: int = 0
+    background_refreshes: int = 0
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    # Async followers, woken from whichever thread finishes the refresh
+    waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = field(
+        default_factory=list
+    )
+
+
+class PayloadCache:
+    """In-process TTL cache for one upstream payload.
+
+    - Fresh entries (younger than ``ttl``) are served as-is.
+    - Stale entries (up to ``ttl + stale_ttl``) are served immediately while a
+      background thread revalidates them with the stored ETag.
+    - Missing or expired entries block on a refresh.
+
+    Concurrent refreshes are collapsed into a single upstream call, shared by
+    sync (``get``) and async (``aget``) callers. Upstream errors keep the
+    previous entry, so a flaky upstream degrades to stale data.
+    """
+
+    def __init__(
+        self,
+        loader: Loader,
+        *,
+        ttl: float,
+        stale_ttl: float,
+        aloader: Optional[AsyncLoader] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._loader = loader
+        self._aloader = aloader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entry: Optional[CachedPayload] = None
+        self._flight: Optional[_Flight] = None
+        self.stats = CacheStats()
+
+    def get(self) -> Optional[CachedPayload]:
+        entry = self._lookup()
+        return entry if entry is not None else self.refresh()
+
+    async def aget(self) -> Optional[CachedPayload]:
+        """Like ``get`` but awaits a missing entry without blocking a thread."""
+        entry = self._lookup()
+        return entry if entry is not None else await self.arefresh()
+
+    def refresh(self) -> Optional[CachedPayload]:
+        """Revalidate with upstream now; joins an in-flight refresh if any."""
+        flight, leader = self._join_flight()
+        if leader:
+            self._run_refresh(flight)
+        else:
+            flight.done.wait()
+        return self._entry
+
+    async def arefresh(self) -> Optional[CachedPayload]:
+        if self._aloader is None:
+            return await asyncio.to_thread(self.refresh)
+        flight, leader = self._join_flight()
+        if not leader:
+            loop = asyncio.get_running_loop()
+            waiter: "asyncio.Future[None]" = loop.create_future()
+            with self._lock:
+                if flight.done.is_set():
+                    return self._entry
+                flight.waiters.append((loop, waiter))
+            await waiter
+            return self._entry
+        current = self._entry
+        try:
+            result = await self._aloader(current.etag if current else None)
+            self._store(current, result)
+        finally:
+            self._finish(flight)
+        return self._entry
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entry = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            entry = self._entry
+            age = self._age(entry)
+            return {
+                **self.stats.__dict__,
+                "cached": entry is not None,
+                "age_seconds": round(age, 3) if entry is not None else None,
+                "version": entry.version if entry is not None else 0,
+                "items": len(entry.items) if entry is not None else 0,
+                "ttl_seconds": self.ttl,
+                "stale_ttl_seconds": self.stale_ttl,
+            }
+
+    def _lookup(self) -> Optional[CachedPayload]:
+        """Return a servable entry, or None when the caller must refresh."""
+        with self._lock:
+            entry = self._entry
+            age = self._age(entry)
+            if entry is not None and age < self.ttl:
+                self.stats.hits += 1
+                return entry
+            if entry is not None and age < self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                if self._flight is None:
+                    self.stats.background_refreshes += 1
+                    self._start_background_refresh()
+                return entry
+            self.stats.misses += 1
+            return None
+
+    def _join_flight(self) -> Tuple[_Flight, bool]:
+        with self._lock:
+            if self._flight is not None:
+                return self._flight, False
+            flight = self._flight = _Flight()
+            return flight, True
+
+    def _age(self, entry: Optional[CachedPayload]) -> float:
+        return self._clock() - entry.fetched_at if entry is not None else float("inf")
+
+    def _start_background_refresh(self) -> None:
+        # Called with the lock held: claim the flight before the thread starts
+        flight = self._flight = _Flight()
+        threading.Thread(
+            target=self._run_refresh, args=(flight,), daemon=True
+        ).start()
+
+    def _run_refresh(self, flight: _Flight) -> None:
+        try:
+            current = self._entry
+            self._store(current, self._loader(current.etag if current else None))
+        finally:
+            self._finish(flight)
+
+    def _store(self, current: Optional[CachedPayload], result: LoadResult) -> None:
+        status, items, etag = result
+        with self._lock:
+            self.stats.upstream_calls += 1
+            now = self._clock()
+            if status == 304 and current is not None:
+                self.stats.not_modified += 1
+                self._entry = CachedPayload(
+                    current.items, current.etag, now, current.version
+                )
+            elif status == 200:
+                version = current.version + 1 if current is not None else 1
+                self._entry = CachedPayload(items, etag, now, version)
+            else:
+                self.stats.errors += 1
+                if current is None:
+                    # Cache the empty result too so a down upstream is not
+                    # retried by every request
+                    self._entry = CachedPayload([], None, now, 0)
+
+    def _finish(self, flight: _Flight) -> None:
+        with self._lock:
+            if self._flight is flight:
+                self._flight = None
+            flight.done.set()
+            waiters, flight.waiters = flight.waiters, []
+        for loop, waiter in waiters:
+            loop.call_soon_threadsafe(_resolve, waiter)
+
+
+def _resolve(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+hostaway_cache = PayloadCache(
+    fetch_hostaway_live_payload,
+    aloader=afetch_hostaway_live_payload,
+    ttl=HOSTAWAY_CACHE_TTL,
+    stale_ttl=HOSTAWAY_CACHE_STALE_TTL,
+)
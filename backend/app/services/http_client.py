@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+
+
+# One pooled client per process, opened at app startup and closed at shutdown
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+DEFAULT_TIMEOUT = httpx.Timeout(20.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to the loop that opened them; a new loop (e.g.
+    # a test client without lifespan) gets its own client and the old one is
+    # closed
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        old, old_loop = _client, _client_loop
+        _client = httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, limits=DEFAULT_LIMITS)
+        _client_loop = loop
+        if old is not None and not old.is_closed:
+            await _close_client(old, old_loop)
+    return _client
+
+
+async def _close_client(
+    client: httpx.AsyncClient, loop: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close ``client`` on the loop that owns its connections."""
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        await client.aclose()
+    except RuntimeError:
+        # Its loop is closed: the client is marked closed, and the sockets
+        # are released with their transports
+        pass
+
+
+async def close_http_client() -> None:
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+    _client, _client_loop = None, None
+
+
+async def get_http_client() -> httpx.AsyncClient:
+    """Return the shared client, creating it if startup has not run (e.g. tests)."""
+    return await start_http_client()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy.orm import Session
+
+from ..config import HOSTAWAY_LIVE_MODE, HOSTAWAY_SYNC_INTERVAL
+from ..models.reviews import has_reviews, upsert_reviews
+from ..models.writer import db_writer
+from .hostaway_accounts import configured_accounts, ingest_accounts
+from .hostaway_adapter import load_hostaway_reviews, normalize_hostaway_items_bulk
+from .hostaway_cache import CachedPayload, hostaway_cache
+from .metrics import stage_timer
+
+
+_loaded_sources: Set[str] = set()
+_load_lock = threading.Lock()
+# Version of the cached live payload last written to the store
+_live_version = 0
+
+
+def _store(reviews: List[Dict[str, Any]], source: str) -> int:
+    return db_writer.run(
+        lambda session: upsert_reviews(session, reviews, source=source, commit=False)
+    )
+
+
+def ingest_source(source: str) -> int:
+    """Fetch, normalize and store reviews for ``source`` (mock | live).
+
+    Live reviews are revalidated against Hostaway, bypassing the cache TTL;
+    with HOSTAWAY_ACCOUNTS set, every configured account is fetched in
+    parallel instead. The write goes through the DB writer thread. Returns
+    the number of reviews written to the store.
+    """
+    if source == "mock":
+        with stage_timer("normalize"):
+            normalized = load_hostaway_reviews()
+        written = _store(normalized, "mock")
+    elif source == "live" and configured_accounts():
+        written = sum(r.written for r in ingest_accounts())
+    elif source == "live":
+        written = _ingest_live_payload(hostaway_cache.refresh())
+    else:
+        raise ValueError(f"Unknown review source: {source}")
+    _loaded_sources.add(source)
+    return written
+
+
+def _ingest_live_payload(payload: Optional[CachedPayload]) -> int:
+    global _live_version
+    if payload is None:
+        return 0
+    with stage_timer("normalize"):
+        normalized = normalize_hostaway_items_bulk(payload.items)
+    written = _store(normalized, "live")
+    _live_version = payload.version
+    return written
+
+
+def ensure_ingested(source: str) -> None:
+    """Make sure the store reflects ``source`` before it is read.
+
+    Mock data is ingested once per process. Live data goes through the shared
+    Hostaway cache and is only re-ingested when the cached payload changed,
+    unless the scheduled sync or multi-account ingest maintains it instead.
+    """
+    if source == "live":
+        if HOSTAWAY_SYNC_INTERVAL > 0 or configured_accounts():
+            return
+        payload = hostaway_cache.get()
+        if payload is None or payload.version == _live_version:
+            return
+        with _load_lock:
+            if payload.version != _live_version:
+                _ingest_live_payload(payload)
+        return
+    if source in _loaded_sources:
+        return
+    with _load_lock:
+        if source in _loaded_sources:
+            return
+        ingest_source(source)
+
+
+async def awarm_source(source: Optional[str]) -> None:
+    """Await any live Hostaway fetch ``source`` needs before the store is read.
+
+    Async handlers call this first so an upstream wait never occupies a worker
+    thread; the subsequent ``resolve_source`` call then hits the warm cache.
+    """
+    use_source = (source or ("live" if HOSTAWAY_LIVE_MODE else "auto")).lower()
+    if use_source == "mock" or HOSTAWAY_SYNC_INTERVAL > 0 or configured_accounts():
+        return
+    await hostaway_cache.aget()
+
+
+def resolve_source(session: Session, source: Optional[str]) -> str:
+    """Map the requested source (mock|live|auto) to the stored source to read.
+
+    ``auto`` reads live reviews when any were ingested and falls back to mock.
+    """
+    use_source = (source or ("live" if HOSTAWAY_LIVE_MODE else "auto")).lower()
+    if use_source == "mock":
+        ensure_ingested("mock")
+        return "mock"
+    ensure_ingested("live")
+    if use_source == "live" or has_reviews(session, "live"):
+        return "live"
+    ensure_ingested("mock")
+    return "mock"
+
+
+def stored_source(session: Session, source: Optional[str]) -> str:
+    """Like ``resolve_source`` but only reads the store: never ingests or fetches.
+
+    Used to revalidate conditional requests without touching upstreams.
+    """
+    use_source = (source or ("live" if HOSTAWAY_LIVE_MODE else "auto")).lower()
+    if use_source in {"mock", "live"}:
+        return use_source
+    return "live" if has_reviews(session, "live") else "mock"
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()) -> None:
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in values:
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {_num(value)}")
+        return lines
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``observe`` is a bisect and three additions."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (+Inf last), sum, count]
+        self._series: Dict[Labels, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                counts = [0] * (len(self.buckets) + 1)
+                series = self._series[labels] = [counts, 0.0, 0]
+            series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted(
+                (key, (list(s[0]), s[1], s[2])) for key, s in self._series.items()
+            )
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total, count) in snapshot:
+            cumulative = 0
+            for bound, n in zip((*self.buckets, float("inf")), counts):
+                cumulative += n
+                le = _label_text(self.labels, key, f'le="{_num(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            label_text = _label_text(self.labels, key)
+            lines.append(f"{self.name}_sum{label_text} {_num(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte",
+    ("method", "route", "status"),
+)
+http_response_size = Histogram(
+    "http_response_size_bytes",
+    "Response body size",
+    ("method", "route"),
+    buckets=SIZE_BUCKETS,
+)
+stage_duration = Histogram(
+    "review_stage_duration_seconds",
+    "Time spent in each review pipeline stage",
+    ("stage",),
+)
+upstream_requests = Counter(
+    "upstream_requests_total",
+    "Calls made to upstream APIs by outcome",
+    ("upstream", "outcome"),
+)
+upstream_duration = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of upstream API calls",
+    ("upstream",),
+)
+
+REGISTRY = (
+    http_request_duration,
+    http_response_size,
+    stage_duration,
+    upstream_requests,
+    upstream_duration,
+)
+
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format (version 0.0.4)."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Record the wall time of a pipeline stage (approvals, upstream, ...)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_duration.observe(time.perf_counter() - start, stage)
+
+
+class _UpstreamCall:
+    outcome = "error"
+
+
+@contextmanager
+def track_upstream(upstream: str) -> Iterator[_UpstreamCall]:
+    """Time one upstream call; set ``.outcome`` on the yielded object.
+
+    The outcome defaults to ``error`` so exceptions are counted as such.
+    """
+    call = _UpstreamCall()
+    start = time.perf_counter()
+    try:
+        yield call
+    finally:
+        upstream_duration.observe(time.perf_counter() - start, upstream)
+        upstream_requests.inc(upstream, call.outcome)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status and body size per route.
+
+    Routes are labelled by their path template, so path parameters do not
+    create new series; requests matching no route share one label.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        state = {"status": 500, "size": 0, "done": False}
+
+        async def send_wrapper(message) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["size"] += len(message.get("body", b""))
+                if not message.get("more_body", False):
+                    state["done"] = True
+                    self._record(scope, state, start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not state["done"]:
+                self._record(scope, state, start)
+
+    @staticmethod
+    def _record(scope, state, start: float) -> None:
+        # Newer FastAPI versions keep included routers' routes unprefixed and
+        # record the full template on the effective route context instead.
+        context = (scope.get("fastapi") or {}).get("effective_route_context")
+        path = (
+            getattr(context, "path", None)
+            or getattr(scope.get("route"), "path", None)
+            or "<unmatched>"
+        )
+        method = scope.get("method", "")
+        http_request_duration.observe(
+            time.perf_counter() - start, method, path, str(state["status"])
+        )
+        http_response_size.observe(state["size"], method, path)
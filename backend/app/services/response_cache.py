@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from ..config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRIES
+from ..models.feed_versions import add_feed_listener
+from .review_index import review_index
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stale: int = 0  # entries dropped because their source's data changed
+    evictions: int = 0
+
+
+class ResponseCache:
+    """LRU of serialized response bodies keyed by endpoint and filters.
+
+    Every entry records the data generation of its source when it was
+    rendered. Committed review or approval changes (reported through feed
+    versions) bump the generation of just the sources they touched, so a
+    lookup never returns a body rendered from older data and unrelated
+    sources keep their entries.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[int, bytes]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = ResponseCacheStats()
+
+    def generation(self, source: str) -> int:
+        with self._lock:
+            return self._generations.get(source, 0)
+
+    def bump(self, keys: Iterable[Tuple[str, str]]) -> None:
+        """Feed listener: advance the generation of every touched source."""
+        sources = {source for source, _ in keys}
+        with self._lock:
+            for source in sources:
+                self._generations[source] = self._generations.get(source, 0) + 1
+
+    def get(self, source: str, key: Hashable) -> Optional[bytes]:
+        full_key = (source, key)
+        with self._lock:
+            entry = self._entries.get(full_key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            generation, body = entry
+            if generation != self._generations.get(source, 0):
+                self._drop(full_key)
+                self.stats.stale += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(full_key)
+            self.stats.hits += 1
+            return body
+
+    def put(self, source: str, key: Hashable, generation: int, body: bytes) -> None:
+        """Store ``body`` rendered at ``generation`` (read before rendering)."""
+        if self.max_entries <= 0 or len(body) > self.max_bytes:
+            return
+        full_key = (source, key)
+        with self._lock:
+            if generation != self._generations.get(source, 0):
+                return  # data changed while rendering
+            if full_key in self._entries:
+                self._drop(full_key)
+            self._entries[full_key] = (generation, body)
+            self._bytes += len(body)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats.evictions += 1
+
+    def _drop(self, full_key: Hashable) -> None:
+        _, body = self._entries.pop(full_key)
+        self._bytes -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.stats.hits,
+                "misses": self.stats.misses,
+                "stale": self.stats.stale,
+                "evictions": self.stats.evictions,
+                "generations": dict(self._generations),
+            }
+
+
+response_cache = ResponseCache()
+
+
+def _on_feed_change(keys: Iterable[Tuple[str, str]]) -> None:
+    """Invalidate the review index, then advance the cache generations.
+
+    Bodies are rendered from the index. If the generation moved first, a
+    request could read the new generation, render from the outdated index
+    and cache that body as current.
+    """
+    keys = list(keys)
+    review_index.invalidate(keys)
+    response_cache.bump(keys)
+
+
+add_feed_listener(_on_feed_change)
@@ -0,0 +1,478 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import false, func, select
+from sqlalchemy.orm import Session
+
+from ..config import REVIEW_INDEX_ENABLED
+from ..models.approvals import Approval
+from ..models.reviews import (
+    CURSOR_TYPES,
+    REVIEW_FIELDS,
+    Review,
+    ReviewFilters,
+    decode_cursor,
+    encode_cursor,
+)
+
+Key = Tuple[str, str]  # (source, listing_id)
+Page = Tuple[List[Dict[str, Any]], Optional[str]]
+
+# Sorts the index answers; relevance needs the FTS index and stays in SQL
+INDEX_SORTS = ("date_desc", "date_asc", "rating_desc", "rating_asc")
+
+# What the index holds per review, in (submitted_ts, review_id) order; the
+# returned page's full rows are read from SQL by review_id
+_INDEX_COLUMNS = (
+    Review.review_id,
+    Review.submitted_ts,
+    Review.listing_id,
+    Review.channel,
+    Review.type,
+    Review.status,
+    Review.rating_overall,
+    func.coalesce(Approval.approved, false()),
+)
+# review_ids per IN (...) when loading a page's rows
+_PAYLOAD_CHUNK = 500
+
+
+@dataclass(frozen=True)
+class _Codes:
+    """Categorical column: small integer codes plus the code of each value."""
+
+    codes: np.ndarray  # int32
+    lookup: Dict[Optional[str], int]
+
+    @staticmethod
+    def _encode(lookup: Dict[Optional[str], int], values: Sequence) -> np.ndarray:
+        return np.fromiter(
+            (lookup.setdefault(v, len(lookup)) for v in values),
+            dtype=np.int32,
+            count=len(values),
+        )
+
+    @classmethod
+    def of(cls, values: Sequence[Optional[str]]) -> "_Codes":
+        lookup: Dict[Optional[str], int] = {}
+        return cls(cls._encode(lookup, values), lookup)
+
+    def _encoded(self, values: Sequence) -> Tuple[Dict[Optional[str], int], Any]:
+        # New values are coded in a copy: the index being replaced may still
+        # be read by queries that picked it up earlier
+        lookup = self.lookup
+        if any(v not in lookup for v in values):
+            lookup = dict(lookup)
+        return lookup, self._encode(lookup, values)
+
+    def patched(self, positions: np.ndarray, values: Sequence) -> "_Codes":
+        lookup, new = self._encoded(values)
+        codes = self.codes.copy()
+        codes[positions] = new
+        return _Codes(codes, lookup)
+
+    def spliced(self, keep: np.ndarray, at: np.ndarray, values: Sequence) -> "_Codes":
+        lookup, new = self._encoded(values)
+        return _Codes(np.insert(self.codes[keep], at, new), lookup)
+
+    def mask(self, value: str, lo: int, hi: int) -> Optional[np.ndarray]:
+        """Rows in [lo, hi) equal to ``value``; None if no row has it."""
+        code = self.lookup.get(value)
+        if code is None:
+            return None
+        return self.codes[lo:hi] == code
+
+
+@dataclass(frozen=True)
+class _Rows:
+    """``_INDEX_COLUMNS`` of loaded reviews as column arrays, in load order."""
+
+    ids: np.ndarray  # object (str)
+    ts: np.ndarray  # int64 epoch seconds
+    rating: np.ndarray  # float64, NaN when unrated
+    approved: np.ndarray  # bool
+    listing: Tuple[str, ...]
+    channel: Tuple[str, ...]
+    type: Tuple[str, ...]
+    status: Tuple[str, ...]
+
+    @classmethod
+    def of(cls, rows: List[Tuple[Any, ...]]) -> Optional["_Rows"]:
+        """Columns of ``rows``, or None if a review has no timestamp."""
+        ids, ts, listing, channel, rtype, status, rating, approved = (
+            tuple(zip(*rows)) or ((),) * len(_INDEX_COLUMNS)
+        )
+        if any(t is None for t in ts):
+            return None
+        return cls(
+            ids=np.array(ids, dtype=object),
+            ts=np.array(ts, dtype=np.int64),
+            # None becomes NaN, which compares False as NULL does in SQL
+            rating=np.array(rating, dtype=np.float64),
+            approved=np.array(approved, dtype=bool),
+            listing=listing,
+            channel=channel,
+            type=rtype,
+            status=status,
+        )
+
+
+def _bisect(columns: Sequence[np.ndarray], key: Sequence[Any], right: bool) -> int:
+    """Insertion point of ``key`` among rows sorted by ``columns`` in turn."""
+    lo, hi = 0, len(columns[0])
+    for column, value in zip(columns[:-1], key):
+        window = column[lo:hi]
+        lo, hi = (
+            lo + int(np.searchsorted(window, value, "left")),
+            lo + int(np.searchsorted(window, value, "right")),
+        )
+    side = "right" if right else "left"
+    return lo + int(np.searchsorted(columns[-1][lo:hi], key[-1], side))
+
+
+def _plain(value: Any) -> Any:
+    """A NumPy scalar as the Python value JSON can encode."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _rating_order(
+    ids: np.ndarray, ts: np.ndarray, rating: np.ndarray
+) -> Dict[str, Any]:
+    """Fields of the rating sorts: (coalesce(rating, -1), ts, review_id)."""
+    rating_key = np.where(np.isnan(rating), -1.0, rating)
+    # Positions already follow (ts, review_id), so a stable sort on the
+    # rating alone yields the full (rating, ts, review_id) order
+    order = np.argsort(rating_key, kind="stable")
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return {
+        "rating_order": order,
+        "rating_rank": rank,
+        "rating_columns": (rating_key[order], ts[order], ids[order]),
+    }
+
+
+@dataclass(frozen=True)
+class _SourceIndex:
+    """Immutable columns of one source, sorted by (submitted_ts, review_id).
+
+    Changed listings produce a new index that shares every column it did not
+    have to touch: approval flips and edits patch copies of the affected
+    columns, added or removed reviews are spliced in at their sort position.
+    """
+
+    ids: np.ndarray  # object (str)
+    ts: np.ndarray  # int64 epoch seconds
+    rating: np.ndarray  # float64, NaN when unrated
+    approved: np.ndarray  # bool
+    listing: _Codes
+    channel: _Codes
+    type: _Codes
+    status: _Codes
+    # Rating sorts: positions in (coalesce(rating, -1), ts, review_id) order,
+    # each position's rank in it, and the sort key columns in that order
+    rating_order: np.ndarray
+    rating_rank: np.ndarray
+    rating_columns: Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+    @classmethod
+    def build(cls, rows: List[Tuple[Any, ...]]) -> Optional["_SourceIndex"]:
+        """Index of ``rows`` loaded in (submitted_ts, review_id) order."""
+        loaded = _Rows.of(rows)
+        if loaded is None:
+            return None
+        return cls(
+            ids=loaded.ids,
+            ts=loaded.ts,
+            rating=loaded.rating,
+            approved=loaded.approved,
+            listing=_Codes.of(loaded.listing),
+            channel=_Codes.of(loaded.channel),
+            type=_Codes.of(loaded.type),
+            status=_Codes.of(loaded.status),
+            **_rating_order(loaded.ids, loaded.ts, loaded.rating),
+        )
+
+    def updated(
+        self, listing_ids: Set[str], rows: List[Tuple[Any, ...]]
+    ) -> Optional["_SourceIndex"]:
+        """This index with ``listing_ids`` replaced by their reloaded ``rows``."""
+        fresh = _Rows.of(rows)
+        if fresh is None:
+            return None
+        lookup = self.listing.lookup
+        codes = [lookup[listing] for listing in listing_ids if listing in lookup]
+        stale = np.isin(self.listing.codes, codes)
+        old = np.flatnonzero(stale)
+        if (
+            len(old) == len(fresh.ids)
+            and np.array_equal(self.ts[old], fresh.ts)
+            and bool((self.ids[old] == fresh.ids).all())
+        ):
+            return self._patched(old, fresh)
+        return self._spliced(np.flatnonzero(~stale), fresh)
+
+    def _patched(self, positions: np.ndarray, fresh: _Rows) -> "_SourceIndex":
+        # Same reviews at the same positions: only their values changed
+        approved = self.approved.copy()
+        approved[positions] = fresh.approved
+        patched = replace(
+            self,
+            approved=approved,
+            channel=self.channel.patched(positions, fresh.channel),
+            type=self.type.patched(positions, fresh.type),
+            status=self.status.patched(positions, fresh.status),
+        )
+        if np.array_equal(self.rating[positions], fresh.rating, equal_nan=True):
+            return patched
+        rating = self.rating.copy()
+        rating[positions] = fresh.rating
+        return replace(
+            patched, rating=rating, **_rating_order(self.ids, self.ts, rating)
+        )
+
+    def _spliced(self, keep: np.ndarray, fresh: _Rows) -> "_SourceIndex":
+        # Both sides are in (ts, review_id) order: place each fresh row by
+        # timestamp, then by review_id among kept rows with the same one
+        kept_ts, kept_ids = self.ts[keep], self.ids[keep]
+        at = np.searchsorted(kept_ts, fresh.ts, "left")
+        ends = np.searchsorted(kept_ts, fresh.ts, "right")
+        for i in np.flatnonzero(at < ends).tolist():
+            at[i] += int(np.searchsorted(kept_ids[at[i] : ends[i]], fresh.ids[i]))
+        ids = np.insert(kept_ids, at, fresh.ids)
+        ts = np.insert(kept_ts, at, fresh.ts)
+        rating = np.insert(self.rating[keep], at, fresh.rating)
+        return _SourceIndex(
+            ids=ids,
+            ts=ts,
+            rating=rating,
+            approved=np.insert(self.approved[keep], at, fresh.approved),
+            listing=self.listing.spliced(keep, at, fresh.listing),
+            channel=self.channel.spliced(keep, at, fresh.channel),
+            type=self.type.spliced(keep, at, fresh.type),
+            status=self.status.spliced(keep, at, fresh.status),
+            **_rating_order(ids, ts, rating),
+        )
+
+    def _matching(self, filters: ReviewFilters) -> np.ndarray:
+        """Positions matching ``filters``, ascending."""
+        lo, hi = 0, len(self.ids)
+        # Date range by binary search over the sorted timestamps
+        if filters.start_ts is not None:
+            lo = int(np.searchsorted(self.ts, np.ceil(filters.start_ts), "left"))
+        if filters.end_ts is not None:
+            hi = int(np.searchsorted(self.ts, np.floor(filters.end_ts), "right"))
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+
+        mask = np.ones(hi - lo, dtype=bool)
+        for column, value in (
+            (self.listing, filters.listing_id),
+            (self.channel, filters.channel),
+            (self.type, filters.review_type),
+            (self.status, filters.status),
+        ):
+            if value:
+                eq = column.mask(value, lo, hi)
+                if eq is None:
+                    return np.empty(0, dtype=np.int64)
+                mask &= eq
+        if filters.min_rating is not None:
+            # NaN compares False, as NULL does in SQL
+            mask &= self.rating[lo:hi] >= float(filters.min_rating)
+        if filters.approved is not None:
+            mask &= self.approved[lo:hi] == bool(filters.approved)
+        return np.flatnonzero(mask) + lo
+
+    def page(
+        self,
+        filters: ReviewFilters,
+        sort: str,
+        limit: Optional[int],
+        cursor: Optional[str],
+    ) -> Tuple[np.ndarray, Optional[str]]:
+        """Positions of one page of matches, and the cursor for the next."""
+        positions = self._matching(filters)
+        by_rating = sort.startswith("rating")
+        descending = sort.endswith("desc")
+        # Matches as ranks in the sort order, ascending
+        if by_rating:
+            columns = self.rating_columns
+            ranks = np.sort(self.rating_rank[positions])
+        else:
+            columns = (self.ts, self.ids)
+            ranks = positions
+        if cursor:
+            key = decode_cursor(cursor)
+            if len(key) != len(columns):
+                raise ValueError("Cursor does not match sort")
+            for value, types in zip(key, CURSOR_TYPES[sort]):
+                if isinstance(value, bool) or not isinstance(value, types):
+                    raise ValueError("Malformed cursor")
+            if None in key:
+                # Compares as NULL in SQL: nothing lies beyond it
+                ranks = ranks[:0]
+            elif descending:
+                ranks = ranks[ranks < _bisect(columns, key, right=False)]
+            else:
+                ranks = ranks[ranks >= _bisect(columns, key, right=True)]
+        if descending:
+            ranks = ranks[::-1]
+
+        next_cursor: Optional[str] = None
+        if limit is not None and len(ranks) > limit:
+            last = int(ranks[limit - 1])
+            next_cursor = encode_cursor([_plain(column[last]) for column in columns])
+            ranks = ranks[:limit]
+        return (self.rating_order[ranks] if by_rating else ranks), next_cursor
+
+
+class ReviewIndex:
+    """Hot in-process copy of the review store for filtered listing reads.
+
+    One columnar ``_SourceIndex`` per source, loaded from SQLite on first use.
+    It holds only the filter and sort columns; the rows of a returned page
+    are read from SQL by review_id. Committed review or approval changes
+    (reported through feed versions) mark their listings dirty; the next
+    query reloads just those listings' columns and patches or splices them
+    into a new index; queries arriving meanwhile wait for that instead of
+    reading the outdated index. Queries it cannot answer exactly (text
+    search, relevance sort, rows without a timestamp) return None so the
+    caller falls back to SQL.
+    """
+
+    def __init__(self) -> None:
+        self._indexes: Dict[str, Optional[_SourceIndex]] = {}
+        self._dirty: Dict[str, Set[str]] = {}
+        # Sources with a build in flight, and one lock per source that
+        # queries wait on instead of reading the index being replaced
+        self._building: Set[str] = set()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def invalidate(self, keys: Iterable[Key]) -> None:
+        # Recorded even for sources not built yet, so a change committed while
+        # the first build is loading is picked up by the next query
+        with self._lock:
+            for source, listing_id in keys:
+                self._dirty.setdefault(source, set()).add(listing_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+            self._dirty.clear()
+
+    def _load(
+        self, session: Session, source: str, listing_ids: Optional[Set[str]] = None
+    ) -> List[Tuple[Any, ...]]:
+        stmt = (
+            select(*_INDEX_COLUMNS)
+            .outerjoin(Approval, Approval.review_id == Review.review_id)
+            .where(Review.source == source)
+            .order_by(Review.submitted_ts, Review.review_id)
+        )
+        if listing_ids is not None:
+            stmt = stmt.where(Review.listing_id.in_(listing_ids))
+        return [tuple(row) for row in session.execute(stmt)]
+
+    def _rows(
+        self,
+        session: Session,
+        source: str,
+        index: _SourceIndex,
+        positions: np.ndarray,
+    ) -> List[Dict[str, Any]]:
+        """Full rows at ``positions``, in order, with the index's approval flag.
+
+        A row deleted since the index was built is left out; the commit that
+        deleted it has already queued the listing for reloading.
+        """
+        ids = index.ids[positions].tolist()
+        by_id: Dict[str, Any] = {}
+        for start in range(0, len(ids), _PAYLOAD_CHUNK):
+            stmt = select(*(getattr(Review, k) for k in REVIEW_FIELDS)).where(
+                Review.source == source,
+                Review.review_id.in_(ids[start : start + _PAYLOAD_CHUNK]),
+            )
+            by_id.update((row.review_id, row) for row in session.execute(stmt))
+        return [
+            {
+                **by_id[review_id]._mapping,
+                "category_ratings": by_id[review_id].category_ratings or {},
+                "approved": approved,
+            }
+            for review_id, approved in zip(ids, index.approved[positions].tolist())
+            if review_id in by_id
+        ]
+
+    def _get(self, session: Session, source: str) -> Optional[_SourceIndex]:
+        with self._lock:
+            if (
+                source in self._indexes
+                and not self._dirty.get(source)
+                and source not in self._building
+            ):
+                return self._indexes[source]
+            build_lock = self._build_locks.setdefault(source, threading.Lock())
+        with build_lock:
+            with self._lock:
+                present = source in self._indexes
+                current = self._indexes.get(source)
+                dirty = self._dirty.pop(source, set())
+                if present and not dirty:
+                    # Rebuilt by the query we waited on
+                    return current
+                self._building.add(source)
+            try:
+                return self._build(session, source, current, dirty)
+            except BaseException:
+                with self._lock:
+                    self._dirty.setdefault(source, set()).update(dirty)
+                raise
+            finally:
+                with self._lock:
+                    self._building.discard(source)
+
+    def _build(
+        self,
+        session: Session,
+        source: str,
+        current: Optional[_SourceIndex],
+        dirty: Set[str],
+    ) -> Optional[_SourceIndex]:
+        if current is not None and dirty:
+            index = current.updated(dirty, self._load(session, source, dirty))
+        else:
+            index = _SourceIndex.build(self._load(session, source))
+        with self._lock:
+            self.builds += 1
+            # Changes that landed while building stay queued in _dirty
+            self._indexes[source] = index
+        return index
+
+    def query(
+        self,
+        session: Session,
+        filters: ReviewFilters,
+        *,
+        sort: str = "date_desc",
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Optional[Page]:
+        """Same result as ``query_review_page``, or None to use SQL instead."""
+        if not REVIEW_INDEX_ENABLED or filters.text_query or sort not in INDEX_SORTS:
+            return None
+        index = self._get(session, filters.source)
+        if index is None:
+            return None
+        positions, next_cursor = index.page(filters, sort, limit, cursor)
+        return self._rows(session, filters.source, index, positions), next_cursor
+
+
+# Invalidated by response_cache's feed listener, ahead of the generation bump
+review_index = ReviewIndex()
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import html
+import json
+import logging
+import os
+import queue
+import re
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from ..config import SNAPSHOT_DIR, SNAPSHOT_HTML
+from ..models.db import SessionLocal
+from ..models.feed_versions import (
+    add_feed_listener,
+    get_feed_version,
+    remove_feed_listener,
+)
+from ..models.listing_stats import ListingStats, get_listing_stats
+from ..models.reviews import ReviewFilters, query_reviews
+
+logger = logging.getLogger(__name__)
+
+Key = Tuple[str, str]  # (source, listing_id)
+
+# Review fields the public pages render; everything else stays out of the file
+SNAPSHOT_REVIEW_FIELDS = (
+    "review_id",
+    "type",
+    "rating_overall",
+    "category_ratings",
+    "text_public",
+    "submitted_at",
+    "author_name",
+)
+
+
+def snapshot_stem(listing_id: str) -> str:
+    """File name (without extension) of a listing's snapshot.
+
+    Listing IDs are ``hostaway:[account:]slug``; anything outside
+    ``[A-Za-z0-9._-]`` becomes ``_``, e.g. ``hostaway_2b-n1-a-29-shoreditch-heights``.
+    """
+    return re.sub(r"[^A-Za-z0-9._-]", "_", listing_id)
+
+
+def _utcnow() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` in one rename so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        # mkstemp creates the file 0600; the static server and CDN must read it
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _summary(reviews: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ratings = [r["rating_overall"] for r in reviews if r["rating_overall"] is not None]
+    categories: Dict[str, List[float]] = {}
+    for r in reviews:
+        for name, value in (r.get("category_ratings") or {}).items():
+            categories.setdefault(name, []).append(float(value))
+    return {
+        "approved_count": len(reviews),
+        "mean_rating": round(sum(ratings) / len(ratings), 2) if ratings else None,
+        "category_means": {
+            name: round(sum(vals) / len(vals), 2)
+            for name, vals in sorted(categories.items())
+        },
+        "last_review_at": reviews[0]["submitted_at"] if reviews else None,
+    }
+
+
+def build_snapshot(session, source: str, listing_id: str) -> Optional[Dict[str, Any]]:
+    """Approved reviews and summary of one listing; None if it has no reviews."""
+    stats = session.get(ListingStats, (source, listing_id))
+    if stats is None or stats.review_count <= 0:
+        return None
+    # Read the version first, as /reviews/selected does
+    version, _ = get_feed_version(session, source, listing_id)
+    rows = query_reviews(
+        session, ReviewFilters(source=source, listing_id=listing_id, approved=True)
+    )
+    reviews = [{k: r[k] for k in SNAPSHOT_REVIEW_FIELDS} for r in rows]
+    return {
+        "source": source,
+        "listing_id": listing_id,
+        "listing_name": stats.listing_name,
+        "channel": stats.channel,
+        "version": version,
+        "generated_at": _utcnow(),
+        "summary": {"review_count": stats.review_count, **_summary(reviews)},
+        "reviews": reviews,
+    }
+
+
+def render_snapshot_html(snapshot: Dict[str, Any]) -> str:
+    """Self-contained HTML fragment of a snapshot (``rev-*`` classes)."""
+    summary = snapshot["summary"]
+    mean = summary["mean_rating"]
+    cards = []
+    for r in snapshot["reviews"]:
+        rating = r["rating_overall"]
+        chip = (
+            f"<span class='rev-rating'>{rating:.1f}</span>"
+            if rating is not None
+            else ""
+        )
+        meta = f"{html.escape(r['author_name'] or 'Guest')} • {r['submitted_at'][:10]}"
+        cards.append(
+            "<div class='rev-card'><div class='rev-card-head'>"
+            f"<div class='rev-meta'>{meta}</div>{chip}</div>"
+            f"<div class='rev-text'>{html.escape(r['text_public'] or '')}</div></div>"
+        )
+    return (
+        f"<section class='rev-section' data-listing='{html.escape(snapshot['listing_id'])}'>"
+        "<div class='rev-header'><div class='rev-title'>Guest reviews</div>"
+        "<div class='rev-summary'>"
+        f"<div class='rev-avg-box'><div class='rev-avg-num'>"
+        f"{'' if mean is None else f'{mean:.1f}'}</div></div>"
+        f"<div class='rev-count'>{summary['approved_count']} approved</div>"
+        "</div></div>"
+        f"<div class='rev-grid'>{''.join(cards)}</div></section>\n"
+    )
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+class SnapshotPublisher:
+    """Writes per-listing snapshots of approved reviews under ``root``.
+
+    Layout: ``{root}/{source}/{stem}.json`` (plus ``.html`` when enabled) and
+    ``{root}/{source}/index.json``. While started, every committed change to a
+    listing's feed (see ``bump_feed_versions``) queues just that listing; a
+    background thread coalesces queued keys and rewrites their files.
+    """
+
+    def __init__(self, root: Path = SNAPSHOT_DIR, write_html: bool = SNAPSHOT_HTML):
+        self.root = Path(root)
+        self.write_html = write_html
+        self._queue: "queue.Queue[Optional[Set[Key]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.published = 0
+
+    def start(self) -> None:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            add_feed_listener(self.schedule)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._loop, name="snapshot-publisher", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        remove_feed_listener(self.schedule)
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def schedule(self, keys: Iterable[Key]) -> None:
+        self._queue.put(set(keys))
+
+    def wait(self) -> None:
+        """Block until every scheduled key has been published."""
+        self._queue.join()
+
+    def _loop(self) -> None:
+        while True:
+            keys = self._queue.get()
+            if keys is None:
+                self._queue.task_done()
+                return
+            taken = 1
+            stopping = False
+            while True:
+                try:
+                    more = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                taken += 1
+                if more is None:
+                    stopping = True
+                    break
+                keys |= more
+            try:
+                self.publish(keys)
+            except Exception:
+                logger.exception("Snapshot publish failed for %s listings", len(keys))
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def path_for(self, source: str, listing_id: str, ext: str = "json") -> Path:
+        return self.root / source / f"{snapshot_stem(listing_id)}.{ext}"
+
+    def publish(self, keys: Iterable[Key]) -> int:
+        """Rewrite the snapshots of ``keys`` and their sources' indexes."""
+        keys = set(keys)
+        written = 0
+        with SessionLocal() as session:
+            for source, listing_id in sorted(keys):
+                snapshot = build_snapshot(session, source, listing_id)
+                paths = [self.path_for(source, listing_id)]
+                if self.write_html:
+                    paths.append(self.path_for(source, listing_id, "html"))
+                if snapshot is None:
+                    for path in paths:
+                        path.unlink(missing_ok=True)
+                    continue
+                _write_atomic(paths[0], _dumps(snapshot))
+                if self.write_html:
+                    _write_atomic(
+                        paths[1], render_snapshot_html(snapshot).encode("utf-8")
+                    )
+                written += 1
+            for source in sorted({source for source, _ in keys}):
+                self._write_index(session, source)
+        self.published += written
+        return written
+
+    def publish_all(self) -> int:
+        """Rewrite every listing's snapshot, e.g. at startup or from the CLI."""
+        with SessionLocal() as session:
+            stmt = select(ListingStats.source, ListingStats.listing_id)
+            keys = {
+                (source, listing_id) for source, listing_id in session.execute(stmt)
+            }
+        return self.publish(keys)
+
+    def _write_index(self, session, source: str) -> None:
+        listings = [
+            {
+                "listing_id": obj.listing_id,
+                "listing_name": obj.listing_name,
+                "channel": obj.channel,
+                "approved_count": obj.approved_count,
+                "path": f"{source}/{snapshot_stem(obj.listing_id)}.json",
+            }
+            for obj in get_listing_stats(session, source)
+        ]
+        index = {"source": source, "generated_at": _utcnow(), "listings": listings}
+        _write_atomic(self.root / source / "index.json", _dumps(index))
+
+
+snapshot_publisher = SnapshotPublisher()
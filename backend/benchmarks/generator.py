@@ -0,0 +1,99 @@
+"""Deterministic synthetic Hostaway/Google payloads for benchmarks and tests."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+DEFAULT_CATEGORIES = (
+    "cleanliness",
+    "communication",
+    "location",
+    "respect_house_rules",
+    "amenities",
+    "maintenance",
+)
+
+_WORDS = (
+    "great clean quiet noisy spotless smooth check-in location host friendly "
+    "comfortable bed shower kitchen view late dirty lovely central tube bus "
+    "stylish small spacious warm cold wifi towels responsive helpful stay"
+).split()
+_FIRST = ("Alice", "Ben", "Carla", "Dev", "Ema", "Farid", "Gia", "Hugo", "Ines")
+_LAST = ("Johnson", "Wright", "Mendes", "Patel", "Rossi", "Khan", "Smith", "Ng")
+
+
+def generate_hostaway_payload(
+    n_reviews: int,
+    *,
+    n_listings: int = 200,
+    categories: Sequence[str] = DEFAULT_CATEGORIES,
+    start: datetime = datetime(2021, 1, 1),
+    days: int = 3 * 365,
+    null_rating_rate: float = 0.3,
+    host_to_guest_rate: float = 0.2,
+    seed: int = 42,
+    first_id: int = 100000,
+) -> Dict[str, Any]:
+    """Build a Hostaway ``/reviews``-shaped payload with ``n_reviews`` items.
+
+    The same arguments always produce the same payload. ``null_rating_rate``
+    of the reviews omit the top-level rating so the category average is used.
+    """
+    rng = random.Random(seed)
+    listings = [
+        f"{rng.randint(1, 4)}B {rng.choice('NSEW')}{rng.randint(1, 20)} "
+        f"{chr(65 + i % 26)} - {i} {rng.choice(['Shoreditch', 'Camden', 'Soho'])} "
+        f"{rng.choice(['Heights', 'Loft', 'Studio', 'Residence'])}"
+        for i in range(n_listings)
+    ]
+    span = days * 86400
+    items: List[Dict[str, Any]] = []
+    for i in range(n_reviews):
+        cats = rng.sample(list(categories), k=rng.randint(0, len(categories)))
+        review_category = [
+            {"category": c, "rating": rng.randint(4, 10)} for c in cats
+        ]
+        rating: Optional[float] = None
+        if rng.random() >= null_rating_rate:
+            rating = float(rng.randint(5, 10))
+        submitted = start + timedelta(seconds=rng.randrange(span))
+        items.append(
+            {
+                "id": first_id + i,
+                "type": "host-to-guest"
+                if rng.random() < host_to_guest_rate
+                else "guest-to-host",
+                "status": "published",
+                "rating": rating,
+                "publicReview": " ".join(rng.choices(_WORDS, k=rng.randint(5, 30))),
+                "reviewCategory": review_category,
+                "submittedAt": submitted.strftime("%Y-%m-%d %H:%M:%S"),
+                "guestName": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+                "listingName": listings[rng.randrange(n_listings)],
+            }
+        )
+    return {"status": "success", "result": items}
+
+
+def generate_google_place(
+    n_reviews: int, *, place_id: str = "bench-place", seed: int = 42
+) -> Dict[str, Any]:
+    """Build a Places Details ``result`` with ``n_reviews`` reviews."""
+    rng = random.Random(seed)
+    return {
+        "place_id": place_id,
+        "name": "Benchmark Place",
+        "rating": 4.5,
+        "user_ratings_total": n_reviews,
+        "reviews": [
+            {
+                "author_name": f"{rng.choice(_FIRST)} {rng.choice(_LAST)}",
+                "rating": rng.randint(1, 5),
+                "text": " ".join(rng.choices(_WORDS, k=rng.randint(5, 30))),
+                "time": 1_600_000_000 + i * 3600,
+            }
+            for i in range(n_reviews)
+        ],
+    }
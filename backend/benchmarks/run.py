@@ -0,0 +1,224 @@
+"""Benchmark the review pipeline on synthetic portfolios.
+
+Usage::
+
+    python -m backend.benchmarks.run --sizes 10000,100000 --output bench.json
+    python -m backend.benchmarks.run --sizes 10000 --compare bench.json
+
+Results are written as JSON (one entry per benchmark and size) so runs from
+different versions can be compared with ``--compare``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+# Benchmarks use a throwaway database and never call the real Hostaway API.
+# Both must be set before any backend module reads its configuration.
+os.environ["DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="flex-bench-"), "bench.db")
+os.environ["HOSTAWAY_API_KEY"] = ""
+os.environ["GOOGLE_PLACES_API_KEY"] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.app.main import app  # noqa: E402
+from backend.app.models.approvals import (  # noqa: E402
+    get_approvals_for,
+    get_approvals_map,
+    upsert_approvals,
+)
+from backend.app.models.db import SessionLocal, create_db_and_tables  # noqa: E402
+from backend.app.models.reviews import (  # noqa: E402
+    ReviewFilters,
+    iso_to_epoch,
+    query_review_page,
+    upsert_reviews,
+)
+from backend.app.services.google_places import normalize_google_reviews  # noqa: E402
+from backend.app.services.response_cache import response_cache  # noqa: E402
+from backend.app.services.review_index import review_index  # noqa: E402
+from backend.app.services.hostaway_adapter import (  # noqa: E402
+    normalize_hostaway_items,
+    normalize_hostaway_items_bulk,
+)
+
+from .generator import generate_google_place, generate_hostaway_payload  # noqa: E402
+
+
+BENCH_SOURCE = "live"  # served by the API without an upstream when no key is set
+APPROVED_EVERY = 10  # approve one review in ten
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.fmean(samples),
+    }
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def run_size(size: int, repeat: int, listings: int) -> List[Dict[str, Any]]:
+    items = generate_hostaway_payload(size, n_listings=listings)["result"]
+    results: List[Dict[str, Any]] = []
+
+    def record(name: str, fn: Callable[[], Any], times: int = repeat) -> Any:
+        timing = _time(fn, times)
+        results.append({"name": name, "size": size, "repeat": times, **timing})
+        print(f"  {name:<36} {size:>9}  median {timing['median'] * 1000:10.2f} ms")
+
+    record("normalize_hostaway_items", lambda: normalize_hostaway_items(items))
+    record(
+        "normalize_hostaway_items_bulk",
+        lambda: normalize_hostaway_items_bulk(items),
+    )
+    normalized = normalize_hostaway_items_bulk(items)
+
+    with SessionLocal() as session:
+        record(
+            "ingest.upsert_reviews",
+            lambda: upsert_reviews(session, normalized, source=BENCH_SOURCE),
+            times=1,
+        )
+        ids = [r["review_id"] for r in normalized]
+        upsert_approvals(
+            session,
+            [{"review_id": rid, "approved": True} for rid in ids[::APPROVED_EVERY]],
+        )
+        record("get_approvals_map", lambda: get_approvals_map(session))
+        page_ids = ids[:200]
+        record("get_approvals_for[200]", lambda: get_approvals_for(session, page_ids))
+
+        # The predicate mix the dashboard sends most often
+        year_ago = iso_to_epoch(normalized[0]["submitted_at"]) - 365 * 86400
+        filters = ReviewFilters(source=BENCH_SOURCE, min_rating=8, start_ts=year_ago)
+        record(
+            "query_reviews[filtered,all]",
+            lambda: query_review_page(session, filters),
+        )
+        record(
+            "query_reviews[filtered,limit=200]",
+            lambda: query_review_page(session, filters, limit=200),
+        )
+        review_index.query(session, filters)  # build outside the timing
+        record(
+            "review_index[filtered,all]",
+            lambda: review_index.query(session, filters),
+        )
+        record(
+            "review_index[filtered,limit=200]",
+            lambda: review_index.query(session, filters, limit=200),
+        )
+
+    place = generate_google_place(min(size, 10000))
+    record("normalize_google_reviews", lambda: normalize_google_reviews(place))
+
+    client = TestClient(app)
+    base = {"source": BENCH_SOURCE}
+    endpoints = {
+        "GET /reviews/hostaway[limit=200]": ("/api/reviews/hostaway", {"limit": 200}),
+        "GET /reviews/hostaway[minRating=9]": (
+            "/api/reviews/hostaway",
+            {"minRating": 9, "limit": 200},
+        ),
+        "GET /reviews/selected": ("/api/reviews/selected", {}),
+        "GET /reviews/stats": ("/api/reviews/stats", {}),
+        "GET /reviews/trends[week,listing]": (
+            "/api/reviews/trends",
+            {"bucket": "week", "window": 4, "groupBy": "listing"},
+        ),
+    }
+    for name, (path, params) in endpoints.items():
+
+        def get(p=path, q=params):
+            return client.get(p, params={**base, **q})
+
+        def cold(get=get):
+            response_cache.clear()  # time the render, not a cache hit
+            return get()
+
+        record(name, cold)
+        record(f"{name} cached", get)
+    return results
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = {
+            (r["name"], r["size"]): r for r in json.load(f).get("results", [])
+        }
+    print(f"\nComparison with {baseline_path} (median, >1.0 = slower now)")
+    for r in current:
+        old = baseline.get((r["name"], r["size"]))
+        if old is None or not old["median"]:
+            continue
+        ratio = r["median"] / old["median"]
+        flag = "  REGRESSION" if ratio > 1.2 else ""
+        print(f"  {r['name']:<36} {r['size']:>9}  x{ratio:6.2f}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m backend.benchmarks.run")
+    parser.add_argument(
+        "--sizes", default="10000,100000", help="Comma-separated review counts"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--listings", type=int, default=200)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    create_db_and_tables()
+    results: List[Dict[str, Any]] = []
+    for size in (int(s) for s in args.sizes.split(",") if s.strip()):
+        print(f"size={size}")
+        results.extend(run_size(size, args.repeat, args.listings))
+
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nWrote {args.output}")
+    if args.compare:
+        compare(results, args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+
+import pytest
+
+# Point the app at a throwaway SQLite file before any backend module is imported
+_TMP = tempfile.mkdtemp(prefix="flex-tests-")
+os.environ.setdefault("DB_PATH", os.path.join(_TMP, "test.db"))
+os.environ.setdefault("SNAPSHOT_DIR", os.path.join(_TMP, "snapshots"))
+os.environ.setdefault("SNAPSHOTS_ENABLED", "true")
+
+from backend.app.models.db import create_db_and_tables  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _create_tables() -> None:
+    create_db_and_tables()
+
+
+class FakeUpstream:
+    """Minimal threaded HTTP server standing in for Hostaway/Google in tests.
+
+    ``handler(path, query, headers)`` returns ``(status, body_dict, headers)``.
+    """
+
+    def __init__(self, handler) -> None:
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlsplit
+
+        upstream = self
+        self.handler = handler
+        self.requests = []
+        self._lock = threading.Lock()
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                parts = urlsplit(self.path)
+                query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                with upstream._lock:
+                    upstream.requests.append((parts.path, query, dict(self.headers)))
+                status, body, headers = upstream.handler(
+                    parts.path, query, dict(self.headers)
+                )
+                payload = b"" if body is None else json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):  # silence test output
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    @property
+    def calls(self) -> int:
+        return len(self.requests)
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_upstream():
+    servers = []
+
+    def start(handler) -> FakeUpstream:
+        server = FakeUpstream(handler)
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
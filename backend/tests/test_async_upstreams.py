@@ -0,0 +1,89 @@
+import asyncio
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.services import google_places, hostaway_adapter, http_client
+from backend.app.services.hostaway_cache import PayloadCache
+
+
+def test_google_route_uses_async_client(fake_upstream, monkeypatch):
+    def handler(path, query, headers):
+        if path.endswith("findplacefromtext/json"):
+            return 200, {"candidates": [{"place_id": "p-1"}]}, {}
+        return (
+            200,
+            {
+                "result": {
+                    "name": "Stub Place",
+                    "reviews": [{"time": 1700000000, "rating": 4, "text": "Nice"}],
+                }
+            },
+            {},
+        )
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(google_places, "GOOGLE_PLACES_API_KEY", "test-key")
+    monkeypatch.setattr(
+        google_places, "PLACES_FIND_URL", f"{server.base_url}/findplacefromtext/json"
+    )
+    monkeypatch.setattr(
+        google_places, "PLACES_DETAILS_URL", f"{server.base_url}/details/json"
+    )
+
+    with TestClient(app) as client:
+        resp = client.get("/api/reviews/google", params={"query": "Stub Place"})
+    rows = resp.json()["result"]
+    assert [r["review_id"] for r in rows] == ["p-1:1700000000"]
+    assert rows[0]["rating_overall"] == 8.0
+    assert rows[0]["approved"] is False
+    assert server.calls == 2
+
+
+def test_async_cache_misses_share_one_upstream_call(fake_upstream, monkeypatch):
+    def handler(path, query, headers):
+        return 200, {"status": "success", "result": [{"id": 1}]}, {"ETag": '"a"'}
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_BASE", server.base_url)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_KEY", "test-key")
+    cache = PayloadCache(
+        hostaway_adapter.fetch_hostaway_live_payload,
+        aloader=hostaway_adapter.afetch_hostaway_live_payload,
+        ttl=60,
+        stale_ttl=60,
+    )
+
+    async def main():
+        return await asyncio.gather(*(cache.aget() for _ in range(10)))
+
+    results = asyncio.run(main())
+    assert server.calls == 1
+    assert all(r.items == [{"id": 1}] for r in results)
+
+
+def test_client_of_a_previous_loop_is_closed_when_replaced():
+    async def current():
+        return await http_client.get_http_client()
+
+    # Previous loop already closed (e.g. an earlier TestClient)
+    first = asyncio.run(current())
+    second = asyncio.run(current())
+    assert second is not first and first.is_closed
+
+    # Previous loop still running in another thread: closed on that loop
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        third = asyncio.run_coroutine_threadsafe(current(), loop).result(5)
+        fourth = asyncio.run(current())
+        assert fourth is not third
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result(5)
+        assert third.is_closed
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+        asyncio.run(http_client.close_http_client())
@@ -0,0 +1,33 @@
+from backend.app.services.google_places import normalize_google_reviews
+from backend.app.services.hostaway_adapter import normalize_hostaway_items
+from backend.benchmarks.generator import (
+    generate_google_place,
+    generate_hostaway_payload,
+)
+
+
+def test_generator_is_deterministic():
+    a = generate_hostaway_payload(500, n_listings=10, seed=7)
+    b = generate_hostaway_payload(500, n_listings=10, seed=7)
+    assert a == b
+    assert a != generate_hostaway_payload(500, n_listings=10, seed=8)
+
+
+def test_generator_shape_and_spread():
+    items = generate_hostaway_payload(2000, n_listings=25, null_rating_rate=0.3)[
+        "result"
+    ]
+    assert len(items) == 2000
+    assert len({i["id"] for i in items}) == 2000
+    assert len({i["listingName"] for i in items}) <= 25
+    nulls = sum(1 for i in items if i["rating"] is None) / len(items)
+    assert 0.25 < nulls < 0.35
+
+
+def test_generated_payloads_normalize():
+    items = generate_hostaway_payload(200, n_listings=5)["result"]
+    normalized = normalize_hostaway_items(items)
+    assert len(normalized) == 200
+    assert all(r["submitted_at"] for r in normalized)
+    place = generate_google_place(20)
+    assert len(normalize_google_reviews(place)) == 20
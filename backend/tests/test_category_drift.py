@@ -0,0 +1,155 @@
+import random
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend.app.config import DRIFT_EWMA_ALPHA, DRIFT_WINDOW
+from backend.app.main import app
+from backend.app.models.category_drift import (
+    CategoryDrift,
+    DriftState,
+    get_drift_alerts,
+    rebuild_category_drift,
+)
+from backend.app.models.db import SessionLocal
+from backend.app.models.reviews import upsert_reviews
+
+
+def _review(rid: str, listing: str, cats: dict, minute: int) -> dict:
+    return {
+        "review_id": rid,
+        "listing_id": f"hostaway:{listing}",
+        "listing_name": listing.title(),
+        "channel": "hostaway",
+        "type": "guest_to_host",
+        "status": "published",
+        "rating_overall": None,
+        "category_ratings": cats,
+        "text_public": "ok",
+        "submitted_at": f"2024-05-{1 + minute // 1440:02d}T"
+        f"{minute // 60 % 24:02d}:{minute % 60:02d}:00Z",
+        "author_name": None,
+    }
+
+
+def _state(session, source: str, listing: str, category: str) -> DriftState:
+    obj = session.get(CategoryDrift, (source, f"hostaway:{listing}", category))
+    return DriftState(
+        **{
+            f: getattr(obj, f)
+            for f in DriftState.__dataclass_fields__  # every persisted field
+        }
+    )
+
+
+def test_streaming_statistics_match_a_full_recompute():
+    source = "drift-stats"
+    rng = random.Random(7)
+    scores = [float(rng.randint(6, 10)) for _ in range(57)]
+    reviews = [
+        _review(f"d-{i}", "alpha", {"cleanliness": s}, i) for i, s in enumerate(scores)
+    ]
+    shuffled = reviews[:20]
+    rng.shuffle(shuffled)  # order within a batch must not matter
+    with SessionLocal() as session:
+        # Several ingests, with a repeat that must not count twice
+        upsert_reviews(session, shuffled, source=source)
+        upsert_reviews(session, reviews[15:40], source=source)
+        upsert_reviews(session, reviews[40:], source=source)
+        state = _state(session, source, "alpha", "cleanliness")
+
+        recent, baseline = scores[-DRIFT_WINDOW:], scores[:-DRIFT_WINDOW]
+        ewma = scores[0]
+        for s in scores[1:]:
+            ewma += DRIFT_EWMA_ALPHA * (s - ewma)
+        assert state.count == len(scores)
+        assert state.recent == recent
+        assert abs(state.recent_mean - np.mean(recent)) < 1e-9
+        assert abs(state.recent_std - np.std(recent, ddof=1)) < 1e-9
+        assert state.baseline_count == len(baseline)
+        assert abs(state.baseline_mean - np.mean(baseline)) < 1e-9
+        assert abs(state.baseline_std - np.std(baseline, ddof=1)) < 1e-9
+        assert abs(state.ewma - ewma) < 1e-9
+
+        rebuild_category_drift(session)
+        assert _state(session, source, "alpha", "cleanliness") == state
+
+
+def test_sliding_category_is_flagged_and_clears_on_recovery():
+    source = "drift-alerts"
+    steady = [
+        _review(f"s-{i}", "steady", {"cleanliness": 9 + i % 2, "communication": 9}, i)
+        for i in range(40)
+    ]
+    history = [
+        _review(f"h-{i}", "sliding", {"cleanliness": 9 + i % 2, "communication": 9}, i)
+        for i in range(30)
+    ]
+    slide = [
+        _review(f"x-{i}", "sliding", {"cleanliness": 6, "communication": 9}, 30 + i)
+        for i in range(DRIFT_WINDOW)
+    ]
+    with SessionLocal() as session:
+        upsert_reviews(session, steady + history, source=source)
+        assert get_drift_alerts(session, source) == []
+
+        upsert_reviews(session, slide, source=source)
+        alerts = get_drift_alerts(session, source)
+        assert [(a["listing_id"], a["category"]) for a in alerts] == [
+            ("hostaway:sliding", "cleanliness")
+        ]
+        alert = alerts[0]
+        assert alert["direction"] == "down" and alert["z_score"] < -3
+        assert alert["recent_mean"] == 6.0 and alert["baseline_mean"] == 9.5
+        assert alert["listing_name"] == "Sliding"
+        # Raised by the first low scores, not by the end of the batch
+        assert alert["flagged_since"] in {r["submitted_at"] for r in slide[:-1]}
+        assert get_drift_alerts(session, source, direction="up") == []
+        tracked = get_drift_alerts(session, source, flagged_only=False)
+        assert len(tracked) == 4 and tracked[0] == alert
+
+        recovery = [
+            _review(f"y-{i}", "sliding", {"cleanliness": 9 + i % 2}, 40 + i)
+            for i in range(DRIFT_WINDOW)
+        ]
+        upsert_reviews(session, recovery, source=source)
+        assert get_drift_alerts(session, source) == []
+
+
+def test_waves_ingested_newest_first_match_a_rebuild():
+    source = "drift-waves"
+    newest = [
+        _review(f"n-{i}", "waves", {"cleanliness": 5}, 100 + i) for i in range(20)
+    ]
+    older = [_review(f"o-{i}", "waves", {"cleanliness": 10}, i) for i in range(40)]
+    with SessionLocal() as session:
+        # A sync stores the newest wave before the older one
+        upsert_reviews(session, newest, source=source)
+        upsert_reviews(session, older, source=source)
+        alerts = get_drift_alerts(session, source)
+        assert [(a["category"], a["direction"]) for a in alerts] == [
+            ("cleanliness", "down")
+        ]
+        state = _state(session, source, "waves", "cleanliness")
+        assert state.count == 60 and state.recent == [5.0] * DRIFT_WINDOW
+        assert state.last_review_at == newest[-1]["submitted_at"]
+
+        rebuild_category_drift(session)
+        assert _state(session, source, "waves", "cleanliness") == state
+        assert get_drift_alerts(session, source) == alerts
+
+
+def test_alerts_endpoint():
+    client = TestClient(app)
+    res = client.get("/api/alerts", params={"source": "mock", "flaggedOnly": "false"})
+    assert res.status_code == 200
+    rows = res.json()["result"]
+    assert rows and all(not r["flagged"] for r in rows)  # too little history
+    assert {"cleanliness", "communication"} <= {r["category"] for r in rows}
+
+    res = client.get(
+        "/api/alerts", params={"source": "mock", "category": "cleanliness"}
+    )
+    assert res.json() == {"status": "success", "result": []}
+    res = client.get("/api/alerts", params={"source": "mock", "direction": "sideways"})
+    assert res.status_code == 400
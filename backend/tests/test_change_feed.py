@@ -0,0 +1,145 @@
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.approvals import upsert_approvals
+from backend.app.models.change_log import changes_after, latest_change_id
+from backend.app.models.db import SessionLocal
+from backend.app.models.reviews import upsert_reviews
+from backend.app.services import change_feed as feed_module
+from backend.app.services.change_feed import read_events, resume_point
+
+
+def _review(rid: str, text: str = "ok") -> dict:
+    return {
+        "review_id": rid,
+        "listing_id": "hostaway:feed",
+        "listing_name": "Feed",
+        "channel": "hostaway",
+        "type": "guest_to_host",
+        "status": "published",
+        "rating_overall": 9.0,
+        "category_ratings": {"cleanliness": 9},
+        "text_public": text,
+        "submitted_at": "2024-06-01T10:00:00Z",
+        "author_name": None,
+    }
+
+
+def _parse(body: str):
+    """(id, event, data) per SSE frame; comments and retry lines dropped."""
+    frames = []
+    for block in body.split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            name, _, value = line.partition(": ")
+            if name in {"id", "event", "data"}:
+                fields[name] = value
+        if "event" in fields:
+            frames.append(
+                (int(fields["id"]), fields["event"], json.loads(fields["data"]))
+            )
+    return frames
+
+
+def test_change_log_records_new_changed_and_approved_reviews():
+    source = "feed-log"
+    with SessionLocal() as session:
+        start = latest_change_id(session)
+        upsert_reviews(session, [_review("f-1"), _review("f-2")], source=source)
+        upsert_reviews(
+            session, [_review("f-1"), _review("f-2", "edited")], source=source
+        )
+        upsert_approvals(session, [{"review_id": "f-1", "approved": True}])
+        upsert_approvals(session, [{"review_id": "f-1", "approved": True}])  # no flip
+        upsert_approvals(session, [{"review_id": "g-9", "approved": True}])
+
+        changes = changes_after(session, start, source)
+        assert [(c["kind"], c["review_id"]) for c in changes] == [
+            ("review", "f-1"),
+            ("review", "f-2"),
+            ("review", "f-2"),
+            ("approval", "f-1"),
+            ("approval", "g-9"),  # not stored: sent to every source
+        ]
+        assert changes[-1]["source"] is None
+
+        events, cursor, more = read_events(session, source, start)
+        assert cursor == changes[-1]["id"] and not more
+        # Review events carry the current row, approval flag included
+        first = events[0][2]["review"]
+        assert events[0][1] == "review" and first["approved"] is True
+        assert events[2][2]["review"]["text_public"] == "edited"
+        assert events[3][2] == {
+            "source": source,
+            "review_id": "f-1",
+            "listing_id": "hostaway:feed",
+            "approved": True,
+        }
+
+        # Batches report that more changes are pending
+        _, cursor, more = read_events(session, source, start, limit=2)
+        assert cursor == changes[1]["id"] and more
+
+
+def test_resume_point():
+    assert resume_point(None, 40, 10) == (40, False)
+    assert resume_point(25, 40, 10) == (25, False)
+    assert resume_point(9, 40, 10) == (9, False)  # next event (10) still kept
+    assert resume_point(8, 40, 10) == (40, True)  # pruned: refetch
+    assert resume_point(41, 40, 10) == (40, True)  # unknown: refetch
+    assert resume_point(0, 0, None) == (0, False)
+
+
+def test_events_endpoint_resumes_and_pushes_live_changes(monkeypatch):
+    client = TestClient(app)
+    rows = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ]
+    target = next(r for r in rows if not r["approved"])
+    with SessionLocal() as session:
+        before = latest_change_id(session)
+
+    def approve(flag: bool) -> None:
+        res = client.post(
+            "/api/reviews/approve",
+            json={"review_id": target["review_id"], "approved": flag},
+        )
+        assert res.status_code == 200
+
+    approve(True)
+    monkeypatch.setattr(feed_module, "EVENTS_MAX_STREAM_SECONDS", 1.0)
+    monkeypatch.setattr(feed_module, "EVENTS_HEARTBEAT_SECONDS", 10.0)
+    try:
+        # Missed while disconnected: replayed from the log
+        res = client.get(
+            "/api/events",
+            params={"source": "mock"},
+            headers={"Last-Event-ID": str(before)},
+        )
+        assert res.headers["content-type"].startswith("text/event-stream")
+        frames = _parse(res.text)
+        assert [(f[1], f[2]["review_id"], f[2]["approved"]) for f in frames] == [
+            ("approval", target["review_id"], True)
+        ]
+        last_id = frames[-1][0]
+
+        # Committed while connected: the open stream is woken, not polled
+        timer = threading.Timer(0.3, approve, args=(False,))
+        timer.start()
+        res = client.get(
+            "/api/events", params={"source": "mock", "lastEventId": last_id}
+        )
+        timer.join()
+        frames = _parse(res.text)
+        assert [(f[1], f[2]["approved"]) for f in frames] == [("approval", False)]
+        assert frames[0][0] > last_id
+    finally:
+        approve(False)
+
+    res = client.get("/api/events", headers={"Last-Event-ID": str(10**9)})
+    assert [f[1] for f in _parse(res.text)] == ["reset"]
+    res = client.get("/api/events", headers={"Last-Event-ID": "abc"})
+    assert res.status_code == 400
@@ -0,0 +1,70 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from backend.app.main import app
+from backend.app.models.approvals import get_approvals_for, upsert_approval
+from backend.app.models.db import SessionLocal, engine
+from backend.app.models.writer import DbWriter
+
+
+client = TestClient(app)
+
+
+def test_connections_use_wal():
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() > 0
+
+
+def test_queued_jobs_share_one_commit_and_failures_are_isolated():
+    writer = DbWriter()
+    started, gate = threading.Event(), threading.Event()
+    try:
+        blocker = writer.submit(lambda s: (started.set(), gate.wait(5)))
+        started.wait(5)
+        futures = [
+            writer.submit(
+                lambda s, i=i: upsert_approval(
+                    s, review_id=f"writer-{i}", approved=True, commit=False
+                )
+            )
+            for i in range(10)
+        ]
+
+        def boom(session):
+            session.execute(text("INSERT INTO no_such_table VALUES (1)"))
+
+        failing = writer.submit(boom)
+        gate.set()
+        blocker.result(5)
+        for f in futures:
+            f.result(5)
+        with pytest.raises(Exception):
+            failing.result(5)
+        # blocker alone, then the 10 approvals and the failing job together
+        assert writer.batches == 2
+        assert writer.jobs == 12
+    finally:
+        writer.stop()
+    with SessionLocal() as session:
+        flags = get_approvals_for(session, [f"writer-{i}" for i in range(10)])
+    assert flags == {f"writer-{i}": True for i in range(10)}
+
+
+def test_concurrent_approvals_do_not_lock():
+    def approve(i):
+        return client.post(
+            "/api/reviews/approve",
+            json={"review_id": f"concurrent-{i}", "approved": i % 2 == 0},
+        ).status_code
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        statuses = list(pool.map(approve, range(64)))
+    assert statuses == [200] * 64
+    with SessionLocal() as session:
+        flags = get_approvals_for(session, [f"concurrent-{i}" for i in range(64)])
+    assert flags == {f"concurrent-{i}": i % 2 == 0 for i in range(64)}
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.reviews import ReviewFilters
+from backend.app.services.export import iter_review_chunks, parquet_available
+
+
+client = TestClient(app)
+
+
+def _listed(params):
+    return client.get("/api/reviews/hostaway", params=params).json()["result"]
+
+
+def test_ndjson_export_matches_list_endpoint():
+    params = {"source": "mock", "minRating": 8}
+    resp = client.get("/api/reviews/export", params={**params, "format": "ndjson"})
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert rows == _listed(params)
+
+
+def test_csv_export_has_header_and_rows():
+    resp = client.get("/api/reviews/export", params={"source": "mock", "format": "csv"})
+    records = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [r["review_id"] for r in records] == [
+        r["review_id"] for r in _listed({"source": "mock"})
+    ]
+    assert json.loads(records[0]["category_ratings"]) is not None
+
+
+def test_chunks_respect_chunk_size():
+    chunks = list(iter_review_chunks(ReviewFilters(source="mock"), chunk_size=3))
+    assert all(len(c) <= 3 for c in chunks)
+    assert sum(len(c) for c in chunks) == len(_listed({"source": "mock"}))
+
+
+@pytest.mark.skipif(not parquet_available(), reason="pyarrow not installed")
+def test_parquet_export_round_trips():
+    import pyarrow.parquet as pq
+
+    resp = client.get(
+        "/api/reviews/export", params={"source": "mock", "format": "parquet"}
+    )
+    table = pq.read_table(io.BytesIO(resp.content))
+    assert table.column("review_id").to_pylist() == [
+        r["review_id"] for r in _listed({"source": "mock"})
+    ]
+
+
+def test_unknown_format_is_rejected():
+    resp = client.get("/api/reviews/export", params={"format": "xml"})
+    assert resp.status_code == 400
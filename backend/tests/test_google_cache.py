@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.db import SessionLocal
+from backend.app.models import google_cache
+from backend.app.models.google_cache import GoogleCacheEntry, cache_get, cache_put
+from backend.app.services import google_places
+
+
+def _places(fake_upstream, monkeypatch):
+    def handler(path, query, headers):
+        if path.endswith("findplacefromtext/json"):
+            return 200, {"candidates": [{"place_id": "cached-1"}]}, {}
+        review = {"time": 1700000100, "rating": 5, "text": "Great"}
+        return 200, {"result": {"name": "Cached Place", "reviews": [review]}}, {}
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(google_places, "GOOGLE_PLACES_API_KEY", "test-key")
+    monkeypatch.setattr(
+        google_places, "PLACES_FIND_URL", f"{server.base_url}/findplacefromtext/json"
+    )
+    monkeypatch.setattr(
+        google_places, "PLACES_DETAILS_URL", f"{server.base_url}/details/json"
+    )
+    return server
+
+
+def test_places_responses_are_cached_until_refresh(fake_upstream, monkeypatch):
+    server = _places(fake_upstream, monkeypatch)
+    client = TestClient(app)
+    params = {"query": "Cached  Place London"}
+
+    first = client.get("/api/reviews/google", params=params).json()
+    assert server.calls == 2
+    # Same query (modulo case/whitespace) is answered from SQLite
+    again = client.get(
+        "/api/reviews/google", params={"query": "cached place london"}
+    ).json()
+    assert again == first
+    assert server.calls == 2
+
+    client.get("/api/reviews/google", params={**params, "refresh": True})
+    assert server.calls == 4
+
+
+def test_cache_evicts_least_recently_used(monkeypatch):
+    # Distinct, increasing access times so eviction order is deterministic
+    clock = iter(range(1_000_000, 2_000_000))
+    monkeypatch.setattr(
+        google_cache, "time", SimpleNamespace(time=lambda: float(next(clock)))
+    )
+    with SessionLocal() as session:
+        # Eviction counts every kind, so start from an empty table
+        session.query(GoogleCacheEntry).delete()
+        session.commit()
+        for i in range(5):
+            cache_put(session, "evict", f"k{i}", {"i": i}, max_entries=3)
+        keys = {e.key for e in session.query(GoogleCacheEntry)}
+        assert keys == {"k2", "k3", "k4"}
+        # A read refreshes k2, so the next insert evicts k3 instead
+        assert cache_get(session, "evict", "k2", ttl=60) == {"i": 2}
+        cache_put(session, "evict", "k5", {"i": 5}, max_entries=3)
+        keys = {e.key for e in session.query(GoogleCacheEntry)}
+        assert keys == {"k2", "k4", "k5"}
+        assert cache_get(session, "evict", "k4", ttl=60) == {"i": 4}
+        assert cache_get(session, "evict", "k4", ttl=-1) is None
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from backend.app.models.db import SessionLocal
+from backend.app.models.reviews import ReviewFilters, query_reviews
+from backend.app.services.hostaway_accounts import (
+    HostawayAccount,
+    ingest_accounts,
+    parse_accounts,
+)
+from backend.app.services.hostaway_adapter import normalize_hostaway_items
+
+
+def _item(i: int) -> dict:
+    return {
+        "id": 7000 + i,
+        "type": "guest-to-host",
+        "status": "published",
+        "rating": 9,
+        "reviewCategory": [],
+        "submittedAt": f"2024-03-01 10:00:{i % 60:02d}",
+        # Same listing names in every account
+        "listingName": f"City Flat {i % 3}",
+    }
+
+
+def _paged(feed):
+    def handler(path, query, headers):
+        offset, limit = int(query["offset"]), int(query["limit"])
+        return 200, {"status": "success", "result": feed[offset : offset + limit]}, {}
+
+    return handler
+
+
+def test_namespaced_normalization_keeps_accounts_apart():
+    items = [_item(1)]
+    a = normalize_hostaway_items(items, account_id="100")[0]
+    b = normalize_hostaway_items(items, account_id="200")[0]
+    plain = normalize_hostaway_items(items)[0]
+    assert (a["review_id"], a["listing_id"]) == ("100:7001", "hostaway:100:city-flat-1")
+    assert a["listing_id"] != b["listing_id"] and a["review_id"] != b["review_id"]
+    assert a["account_id"] == "100" and plain["account_id"] is None
+    assert plain["listing_id"] == "hostaway:city-flat-1"
+
+
+def test_parse_accounts_validates():
+    accounts = parse_accounts('[{"id": 1, "key": "k", "rate": 2}]')
+    assert accounts[0].account_id == "1" and accounts[0].name == "1"
+    assert accounts[0].rate == 2
+    assert parse_accounts("") == ()
+    for raw in ("{", '{"id": 1}', '[{"id": 1}]', '[{"id":1,"key":"a"},{"id":1,"key":"b"}]'):
+        with pytest.raises(ValueError):
+            parse_accounts(raw)
+
+
+def test_accounts_fetched_in_parallel_and_slow_one_does_not_block(fake_upstream):
+    release = threading.Event()
+    fast_feed = [_item(i) for i in range(25)]
+    fast = fake_upstream(_paged(fast_feed))
+
+    def slow_handler(path, query, headers):
+        release.wait(5)
+        return _paged(fast_feed[:5])(path, query, headers)
+
+    slow = fake_upstream(slow_handler)
+    broken = fake_upstream(lambda p, q, h: (500, {"status": "fail"}, {"Retry-After": "0"}))
+    accounts = [
+        HostawayAccount("901", "key-a", "fast", base_url=fast.base_url, rate=0),
+        HostawayAccount("902", "key-b", "slow", base_url=slow.base_url, rate=0),
+        HostawayAccount("903", "key-c", "broken", base_url=broken.base_url, rate=0),
+    ]
+
+    seen_fast_before_slow = []
+
+    def watch():
+        # The fast account is stored while the slow one is still blocked
+        for _ in range(200):
+            with SessionLocal() as session:
+                rows = query_reviews(session, ReviewFilters(source="live"))
+            if any(r["review_id"].startswith("901:") for r in rows):
+                seen_fast_before_slow.append(True)
+                break
+            threading.Event().wait(0.02)
+        release.set()
+
+    watcher = threading.Thread(target=watch)
+    watcher.start()
+    results = {r.name: r for r in ingest_accounts(accounts, page_size=10)}
+    watcher.join()
+
+    assert seen_fast_before_slow
+    assert results["fast"].fetched == 25 and results["fast"].error is None
+    assert results["slow"].fetched == 5
+    assert results["broken"].error and results["broken"].fetched == 0
+    assert fast.requests[0][2]["Authorization"] == "Bearer key-a"
+    assert fast.requests[0][0] == "/accounts/901/reviews"
+
+    with SessionLocal() as session:
+        rows = query_reviews(session, ReviewFilters(source="live"))
+    fast_rows = [r for r in rows if r["account_id"] == "901"]
+    slow_rows = [r for r in rows if r["account_id"] == "902"]
+    assert len(fast_rows) == 25 and len(slow_rows) == 5
+    assert {r["listing_id"] for r in slow_rows} <= {
+        f"hostaway:902:city-flat-{i}" for i in range(3)
+    }
+
+
+def test_account_rate_limit_spaces_requests(fake_upstream):
+    server = fake_upstream(_paged([_item(i) for i in range(20)]))
+    account = HostawayAccount("911", "k", base_url=server.base_url, rate=20)
+    (result,) = ingest_accounts([account], page_size=5)
+    assert result.fetched == 20
+    # 5 requests (4 full pages and an empty one) at 20/s take at least 0.2s
+    assert server.calls == 5 and result.seconds >= 0.19
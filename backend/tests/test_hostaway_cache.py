@@ -0,0 +1,86 @@
+import threading
+import time
+
+from backend.app.services import hostaway_adapter
+from backend.app.services.hostaway_cache import PayloadCache
+
+
+ITEMS = [
+    {
+        "id": 1,
+        "type": "guest-to-host",
+        "status": "published",
+        "rating": 9,
+        "reviewCategory": [],
+        "submittedAt": "2024-06-01 10:00:00",
+        "listingName": "Live Loft",
+    }
+]
+
+
+def _hostaway(fake_upstream, monkeypatch, delay=0.0):
+    def handler(path, query, headers):
+        time.sleep(delay)
+        if headers.get("If-None-Match") == '"v1"':
+            return 304, None, {"ETag": '"v1"'}
+        return 200, {"status": "success", "result": ITEMS}, {"ETag": '"v1"'}
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_BASE", server.base_url)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_KEY", "test-key")
+    return server
+
+
+def test_concurrent_misses_share_one_upstream_call(fake_upstream, monkeypatch):
+    server = _hostaway(fake_upstream, monkeypatch, delay=0.2)
+    cache = PayloadCache(
+        hostaway_adapter.fetch_hostaway_live_payload, ttl=60, stale_ttl=60
+    )
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get())) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert server.calls == 1
+    assert all(r is not None and r.items == ITEMS for r in results)
+    assert cache.get().version == 1
+    assert cache.stats.hits >= 1
+
+
+def test_stale_entry_served_while_revalidating_with_etag(fake_upstream, monkeypatch):
+    server = _hostaway(fake_upstream, monkeypatch)
+    now = [0.0]
+    cache = PayloadCache(
+        hostaway_adapter.fetch_hostaway_live_payload,
+        ttl=10,
+        stale_ttl=100,
+        clock=lambda: now[0],
+    )
+    first = cache.get()
+    now[0] = 50.0
+    stale = cache.get()
+    assert stale is first
+    assert cache.stats.stale_hits == 1
+    for _ in range(50):
+        if server.calls == 2 and cache.snapshot()["age_seconds"] == 0:
+            break
+        time.sleep(0.02)
+    assert server.calls == 2
+    assert server.requests[-1][2].get("If-None-Match") == '"v1"'
+    assert cache.stats.not_modified == 1
+    # A 304 keeps the payload version, so consumers do not re-ingest
+    assert cache.get().version == 1
+
+
+def test_cache_metrics_endpoint():
+    from fastapi.testclient import TestClient
+
+    from backend.app.main import app
+
+    resp = TestClient(app).get("/metrics/cache")
+    assert resp.status_code == 200
+    stats = resp.json()["result"]["hostaway"]
+    assert {"hits", "misses", "stale_hits", "age_seconds"} <= stats.keys()
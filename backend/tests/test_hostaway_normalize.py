@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from backend.app.config import DATA_DIR
+from backend.app.services.hostaway_adapter import (
+    normalize_hostaway_items,
+    normalize_hostaway_items_bulk,
+)
+from backend.benchmarks.generator import generate_hostaway_payload
+
+
+def test_bulk_matches_per_item_on_mock_data():
+    with (DATA_DIR / "hostaway_mock.json").open(encoding="utf-8") as f:
+        items = json.load(f)["result"]
+    approvals = {str(items[0]["id"]): True}
+    assert normalize_hostaway_items_bulk(items, approvals) == normalize_hostaway_items(
+        items, approvals
+    )
+
+
+def test_bulk_matches_per_item_on_generated_portfolio():
+    items = generate_hostaway_payload(5000, n_listings=40, null_rating_rate=0.4)[
+        "result"
+    ]
+    assert normalize_hostaway_items_bulk(items) == normalize_hostaway_items(items)
+
+
+def test_bulk_matches_per_item_on_edge_cases():
+    items = [
+        # tie on submittedAt: original order must be kept
+        {"id": 1, "listingName": "A", "submittedAt": "2024-01-01 10:00:00"},
+        {"id": 2, "listingName": "A", "submittedAt": "2024-01-01 10:00:00"},
+        # unparseable top-level rating is None, not the category mean
+        {
+            "id": 3,
+            "rating": "n/a",
+            "reviewCategory": [{"category": "clean", "rating": 9}],
+            "submittedAt": "2024-02-01 10:00:00",
+        },
+        # category mean that needs correct rounding; None ratings skipped
+        {
+            "id": 4,
+            "type": "host-to-guest",
+            "listingName": "  Flat #1, Soho!  ",
+            "reviewCategory": [
+                {"category": "a", "rating": 10},
+                {"category": "b", "rating": 9},
+                {"category": "c", "rating": 9},
+                {"category": None, "rating": 7},
+                {"category": "d", "rating": None},
+            ],
+            "submittedAt": "2023-05-06 07:08:09",
+            "guestName": "",
+        },
+        {"id": 5, "reviewCategory": [], "submittedAt": "2022-12-31 23:59:59"},
+    ]
+    assert normalize_hostaway_items_bulk(items) == normalize_hostaway_items(items)
+    assert normalize_hostaway_items_bulk([]) == []
+
+
+def test_bulk_rejects_missing_timestamp():
+    with pytest.raises(ValueError):
+        normalize_hostaway_items_bulk([{"id": 1, "submittedAt": None}])
@@ -0,0 +1,133 @@
+from backend.app.models.category_drift import get_drift_alerts, rebuild_category_drift
+from backend.app.models.db import SessionLocal
+from backend.app.models.reviews import ReviewFilters, query_reviews
+from backend.app.models.sync_state import reset_sync_state
+from backend.app.services import hostaway_adapter, hostaway_sync
+from backend.app.services.hostaway_sync import SYNC_NAME, sync_hostaway_reviews
+
+
+def _item(i: int) -> dict:
+    return {
+        "id": 50000 + i,
+        "type": "guest-to-host",
+        "status": "published",
+        "rating": 8,
+        "reviewCategory": [],
+        # later ids are newer
+        "submittedAt": f"2024-{1 + i // 250:02d}-01 00:{(i // 60) % 60:02d}:{i % 60:02d}",
+        "listingName": f"Sync Flat {i % 7}",
+    }
+
+
+def test_paginated_sync_is_incremental_and_retries(fake_upstream, monkeypatch):
+    feed = [_item(i) for i in range(230)]
+    throttled = set()
+
+    def handler(path, query, headers):
+        offset, limit = int(query["offset"]), int(query["limit"])
+        if offset not in throttled:
+            throttled.add(offset)
+            return 429, {"status": "fail"}, {"Retry-After": "0"}
+        ordered = sorted(feed, key=lambda x: (x["submittedAt"], x["id"]), reverse=True)
+        page = ordered[offset : offset + limit]
+        return 200, {"status": "success", "result": page}, {}
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_BASE", server.base_url)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_KEY", "test-key")
+
+    with SessionLocal() as session:
+        reset_sync_state(session, SYNC_NAME)
+        first = sync_hostaway_reviews(session, page_size=50, concurrency=3)
+        assert first.fetched == 230
+        stored = query_reviews(session, ReviewFilters(source="live"))
+        assert {str(x["id"]) for x in feed} <= {r["review_id"] for r in stored}
+
+        feed.extend(_item(i) for i in range(230, 240))
+        second = sync_hostaway_reviews(
+            session, page_size=50, concurrency=3, overlap=0
+        )
+        # Only the first wave is needed to reach the previous high-water mark
+        assert second.fetched <= 150
+        assert second.hwm_review_id == 50239
+        stored = query_reviews(session, ReviewFilters(source="live"))
+        assert "50239" in {r["review_id"] for r in stored}
+
+        # An edit behind the mark is picked up while inside the overlap window
+        feed[200]["publicReview"] = "edited after the first sync"
+        third = sync_hostaway_reviews(
+            session, page_size=50, concurrency=3, overlap=60
+        )
+        assert third.fetched < 240 and third.written == 1
+        stored = query_reviews(session, ReviewFilters(source="live"))
+        assert {r["review_id"]: r for r in stored}["50200"][
+            "text_public"
+        ] == "edited after the first sync"
+
+
+def test_sync_of_newest_first_waves_flags_drift_like_a_rebuild(
+    fake_upstream, monkeypatch
+):
+    # 40 older reviews score 10 on cleanliness, the 20 newest score 5
+    feed = [
+        {
+            "id": 60000 + i,
+            "type": "guest-to-host",
+            "status": "published",
+            "rating": 8,
+            "reviewCategory": [
+                {"category": "cleanliness", "rating": 10 if i < 40 else 5}
+            ],
+            "submittedAt": f"2024-07-{1 + i // 24:02d} {i % 24:02d}:00:00",
+            "listingName": "Drift Flat",
+        }
+        for i in range(60)
+    ]
+
+    def handler(path, query, headers):
+        offset, limit = int(query["offset"]), int(query["limit"])
+        ordered = sorted(feed, key=lambda x: (x["submittedAt"], x["id"]), reverse=True)
+        page = ordered[offset : offset + limit]
+        return 200, {"status": "success", "result": page}, {}
+
+    server = fake_upstream(handler)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_BASE", server.base_url)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_KEY", "test-key")
+
+    def drift_flat_alerts(session):
+        return [
+            (a["category"], a["direction"], a["z_score"])
+            for a in get_drift_alerts(session, "live")
+            if a["listing_name"] == "Drift Flat"
+        ]
+
+    replayed = []
+    replay = hostaway_sync.replay_category_drift
+
+    def spy(session, source, listing_ids):
+        replayed.append(set(listing_ids))
+        return replay(session, source, listing_ids)
+
+    monkeypatch.setattr(hostaway_sync, "replay_category_drift", spy)
+
+    with SessionLocal() as session:
+        reset_sync_state(session, SYNC_NAME)
+        sync_hostaway_reviews(session, page_size=10, concurrency=2)
+        alerts = drift_flat_alerts(session)
+        assert [a[:2] for a in alerts] == [("cleanliness", "down")]
+        # Older waves reached the listing after newer ones: replayed once
+        assert len(replayed) == 1 and len(replayed[0]) == 1
+        rebuild_category_drift(session)
+        assert drift_flat_alerts(session) == alerts
+
+        # An incremental run re-reading stored reviews plus newer ones
+        # streams the new ones and replays nothing
+        feed.extend(
+            {**feed[-1], "id": 60100 + i, "submittedAt": f"2024-07-04 0{i}:00:00"}
+            for i in range(3)
+        )
+        sync_hostaway_reviews(session, page_size=10, concurrency=2, overlap=86400)
+        assert len(replayed) == 1
+        alerts = drift_flat_alerts(session)
+        rebuild_category_drift(session)
+        assert drift_flat_alerts(session) == alerts
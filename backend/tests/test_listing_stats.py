@@ -0,0 +1,157 @@
+from fastapi.testclient import TestClient
+
+from backend.app.api import reviews as reviews_api
+from backend.app.main import app
+from backend.app.models.approvals import upsert_approvals
+from backend.app.models.db import SessionLocal
+from backend.app.models.listing_stats import (
+    check_listing_stats,
+    get_listing_stats,
+    rebuild_listing_stats,
+)
+from backend.app.models.reviews import upsert_reviews
+
+
+def _review(rid: str, listing: str, rating, cats, day: int) -> dict:
+    return {
+        "review_id": rid,
+        "listing_id": f"hostaway:{listing}",
+        "listing_name": listing.title(),
+        "channel": "hostaway",
+        "type": "guest_to_host",
+        "status": "published",
+        "rating_overall": rating,
+        "category_ratings": cats,
+        "text_public": "ok",
+        "submitted_at": f"2024-03-{day:02d}T10:00:00Z",
+        "author_name": None,
+    }
+
+
+def test_rollups_follow_ingest_and_approvals_incrementally():
+    source = "rollup-test"
+    with SessionLocal() as session:
+        upsert_reviews(
+            session,
+            [
+                _review("r-1", "alpha", 8.0, {"cleanliness": 8}, 1),
+                _review("r-2", "alpha", None, {"cleanliness": 6}, 2),
+                _review("r-3", "beta", 10.0, {}, 3),
+            ],
+            source=source,
+        )
+        upsert_approvals(
+            session,
+            [
+                {"review_id": "r-1", "approved": True},
+                {"review_id": "r-3", "approved": True},
+            ],
+        )
+        # r-2 gains a rating and r-3 moves to alpha: deltas, not a recompute
+        upsert_reviews(
+            session,
+            [
+                _review("r-2", "alpha", 6.0, {"cleanliness": 6}, 2),
+                _review("r-3", "alpha", 10.0, {}, 4),
+            ],
+            source=source,
+        )
+        upsert_approvals(session, [{"review_id": "r-1", "approved": False}])
+
+        rows = {s.listing_id: s for s in get_listing_stats(session, source)}
+        alpha = rows["hostaway:alpha"]
+        assert set(rows) == {"hostaway:alpha"}
+        assert (alpha.review_count, alpha.rated_count) == (3, 3)
+        assert alpha.rating_sum == 24.0
+        assert alpha.approved_count == 1
+        assert alpha.category_sums == {"cleanliness": 14.0}
+        assert alpha.category_counts == {"cleanliness": 2}
+        assert alpha.last_review_at == "2024-03-04T10:00:00Z"
+        assert not [p for p in check_listing_stats(session) if p["source"] == source]
+
+        rebuild_listing_stats(session)
+        assert check_listing_stats(session) == []
+
+
+def test_last_review_date_drops_when_latest_review_is_redated_or_moved():
+    source = "rollup-redate"
+    with SessionLocal() as session:
+        upsert_reviews(
+            session,
+            [
+                _review("d-1", "gamma", 8.0, {}, 1),
+                _review("d-2", "gamma", 9.0, {}, 20),
+                _review("d-3", "delta", 7.0, {}, 5),
+            ],
+            source=source,
+        )
+        # The latest gamma review is re-dated earlier...
+        upsert_reviews(session, [_review("d-2", "gamma", 9.0, {}, 10)], source=source)
+        gamma = get_listing_stats(session, source, "hostaway:gamma")[0]
+        assert gamma.last_review_at == "2024-03-10T10:00:00Z"
+
+        # ...then moves to delta, leaving gamma with d-1 only
+        upsert_reviews(session, [_review("d-2", "delta", 9.0, {}, 3)], source=source)
+        rows = {s.listing_id: s for s in get_listing_stats(session, source)}
+        assert rows["hostaway:gamma"].last_review_at == "2024-03-01T10:00:00Z"
+        assert rows["hostaway:delta"].last_review_at == "2024-03-05T10:00:00Z"
+        assert not [p for p in check_listing_stats(session) if p["source"] == source]
+
+
+def test_listings_endpoint_matches_reviews_and_filters_by_prefix():
+    client = TestClient(app)
+    reviews = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ]
+    listings = client.get("/api/listings", params={"source": "mock"}).json()["result"]
+    by_id = {x["listing_id"]: x for x in listings}
+    assert set(by_id) == {r["listing_id"] for r in reviews}
+    for listing_id, row in by_id.items():
+        own = [r for r in reviews if r["listing_id"] == listing_id]
+        rated = [r["rating_overall"] for r in own if r["rating_overall"] is not None]
+        assert row["review_count"] == len(own)
+        assert row["listing_name"] == own[0]["listing_name"]
+        assert row["last_review_at"] == max(r["submitted_at"] for r in own)
+        if rated:
+            assert row["average_rating"] == round(sum(rated) / len(rated), 2)
+
+    name = listings[0]["listing_name"]
+    prefixed = client.get(
+        "/api/listings", params={"source": "mock", "q": name[:3].upper()}
+    ).json()["result"]
+    assert prefixed and all(
+        x["listing_name"].lower().startswith(name[:3].lower()) for x in prefixed
+    )
+    none = client.get("/api/listings", params={"source": "mock", "q": "%"}).json()
+    assert none["result"] == []
+
+
+async def _no_warm(source):
+    return None
+
+
+def test_listings_endpoint_pages_with_a_cursor(monkeypatch):
+    # Read a test-only source as stored, without the mock/live mapping
+    monkeypatch.setattr(reviews_api, "resolve_source", lambda session, source: source)
+    monkeypatch.setattr(reviews_api, "awarm_source", _no_warm)
+    source = "listing-pages"
+    with SessionLocal() as session:
+        upsert_reviews(
+            session,
+            [_review(f"p-{i}", f"page{i:02d}", 8.0, {}, 1) for i in range(5)],
+            source=source,
+        )
+    client = TestClient(app)
+    names, cursor = [], None
+    while True:
+        params = {"source": source, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/api/listings", params=params).json()
+        names += [x["listing_name"] for x in page["result"]]
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    assert names == [f"Page{i:02d}" for i in range(5)]
+    bad = client.get("/api/listings", params={"source": source, "cursor": "WzFd"})
+    assert bad.status_code == 400
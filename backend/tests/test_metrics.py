@@ -0,0 +1,59 @@
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.services import hostaway_adapter
+from backend.app.services.metrics import Histogram, render_metrics
+
+
+client = TestClient(app)
+
+
+def _value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_histogram_renders_cumulative_buckets():
+    h = Histogram("demo_seconds", "demo", ("route",), buckets=(0.1, 1.0))
+    h.observe(0.05, "/a")
+    h.observe(0.5, "/a")
+    h.observe(5.0, "/a")
+    lines = h.render()
+    assert 'demo_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'demo_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'demo_seconds_count{route="/a"} 3' in lines
+
+
+def test_requests_are_recorded_by_route_template_and_status():
+    client.get("/api/reviews/hostaway", params={"source": "mock"})
+    client.get("/api/reviews/hostaway", params={"source": "mock", "sort": "nope"})
+    client.get("/no/such/path")
+    resp = client.get("/metrics")
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = resp.text
+    ok = 'http_request_duration_seconds_count{method="GET",'
+    assert _value(text, ok + 'route="/api/reviews/hostaway",status="200"}') >= 1
+    assert _value(text, ok + 'route="/api/reviews/hostaway",status="400"}') >= 1
+    assert _value(text, ok + 'route="<unmatched>",status="404"}') >= 1
+    assert _value(
+        text, 'http_response_size_bytes_sum{method="GET",route="/api/reviews/hostaway"}'
+    )
+    for stage in ("upstream", "filter", "serialize"):
+        assert f'review_stage_duration_seconds_count{{stage="{stage}"}}' in text
+
+
+def test_upstream_calls_are_counted(monkeypatch, fake_upstream):
+    server = fake_upstream(lambda path, query, headers: (503, {}, {}))
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_BASE", server.base_url)
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_API_KEY", "key")
+    monkeypatch.setattr(hostaway_adapter, "HOSTAWAY_ACCOUNT_ID", "1")
+    prefix = 'upstream_requests_total{upstream="hostaway",outcome="503"}'
+    before = _value(render_metrics(), prefix) or 0
+    status, items, _ = hostaway_adapter.fetch_hostaway_live_payload()
+    assert (status, items) == (503, [])
+    text = render_metrics()
+    assert _value(text, prefix) == before + 1
+    assert 'upstream_request_duration_seconds_count{upstream="hostaway"}' in text
@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.services import response_cache as cache_module
+from backend.app.services.response_cache import ResponseCache, response_cache
+
+
+client = TestClient(app)
+
+
+def test_repeated_filters_hit_until_an_approval_changes_the_source():
+    params = {"source": "mock", "minRating": 8}
+    first = client.get("/api/reviews/hostaway", params=params)
+    hits = response_cache.stats.hits
+    second = client.get("/api/reviews/hostaway", params=params)
+    assert response_cache.stats.hits == hits + 1
+    assert second.content == first.content
+
+    # A different filter tuple is its own entry
+    other = client.get("/api/reviews/hostaway", params={**params, "minRating": 9})
+    assert other.content != first.content
+
+    rid = first.json()["result"][0]["review_id"]
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": True})
+    fresh = client.get("/api/reviews/hostaway", params=params).json()["result"]
+    assert {r["review_id"]: r for r in fresh}[rid]["approved"] is True
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": False})
+    fresh = client.get("/api/reviews/hostaway", params=params).json()["result"]
+    assert {r["review_id"]: r for r in fresh}[rid]["approved"] is False
+
+
+def test_stats_are_cached_per_filters():
+    params = {"source": "mock", "type": "guest_to_host"}
+    a = client.get("/api/reviews/stats", params=params)
+    hits = response_cache.stats.hits
+    b = client.get("/api/reviews/stats", params=params)
+    assert response_cache.stats.hits == hits + 1 and a.json() == b.json()
+
+
+def test_generations_are_per_source_and_bodies_rendered_stale_are_dropped():
+    cache = ResponseCache(max_entries=2)
+    gen = cache.generation("mock")
+    cache.put("mock", "a", gen, b"1")
+    cache.put("live", "a", cache.generation("live"), b"2")
+    cache.bump([("live", "hostaway:x")])
+    assert cache.get("mock", "a") == b"1"
+    assert cache.get("live", "a") is None
+
+    # Rendered before the bump: not stored
+    gen = cache.generation("mock")
+    cache.bump([("mock", "hostaway:x")])
+    cache.put("mock", "b", gen, b"3")
+    assert cache.get("mock", "b") is None
+
+
+def test_index_is_invalidated_before_the_generation_moves(monkeypatch):
+    seen = []
+
+    def invalidate(keys):
+        seen.append(response_cache.generation("order-test"))
+
+    monkeypatch.setattr(cache_module.review_index, "invalidate", invalidate)
+    before = response_cache.generation("order-test")
+    cache_module._on_feed_change({("order-test", "hostaway:1")})
+    assert seen == [before]
+    assert response_cache.generation("order-test") == before + 1
+
+
+def test_lru_evicts_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    for key in "abc":
+        cache.put("mock", key, 0, b"xx")
+    assert cache.get("mock", "a") is None and cache.get("mock", "c") == b"xx"
+    cache.put("mock", "big", 0, b"x" * 9)
+    assert cache.snapshot()["bytes"] <= 10
+    cache.put("mock", "huge", 0, b"x" * 11)
+    assert cache.get("mock", "huge") is None
@@ -0,0 +1,246 @@
+import itertools
+import threading
+
+import pytest
+
+from backend.app.models.approvals import upsert_approvals
+from backend.app.models.db import SessionLocal
+from backend.app.models.feed_versions import add_feed_listener, remove_feed_listener
+from backend.app.models.reviews import (
+    ReviewFilters,
+    iso_to_epoch,
+    query_review_page,
+    upsert_reviews,
+)
+from backend.app.services.hostaway_adapter import normalize_hostaway_items
+from backend.app.services.review_index import INDEX_SORTS, ReviewIndex
+from backend.benchmarks.generator import generate_hostaway_payload
+
+SOURCE = "index-test"
+
+
+@pytest.fixture(scope="module")
+def portfolio():
+    items = generate_hostaway_payload(600, n_listings=8, null_rating_rate=0.2, seed=3)
+    reviews = normalize_hostaway_items(items["result"])
+    with SessionLocal() as session:
+        upsert_reviews(session, reviews, source=SOURCE)
+        upsert_approvals(
+            session,
+            [{"review_id": r["review_id"], "approved": True} for r in reviews[::3]],
+        )
+    return reviews
+
+
+def _pages(fn, filters, sort, limit):
+    rows, cursor, pages = [], None, 0
+    while True:
+        page, cursor = fn(filters, sort, limit, cursor)
+        rows.extend(page)
+        pages += 1
+        if not cursor or limit is None:
+            return rows, pages
+
+
+def test_index_matches_sql_for_filters_sorts_and_pages(portfolio):
+    index = ReviewIndex()
+    reviews = sorted(portfolio, key=lambda r: r["submitted_at"])
+    mid_ts = reviews[len(reviews) // 2]["submitted_at"]
+    with SessionLocal() as session:
+
+        def via_sql(f, sort, limit, cursor):
+            return query_review_page(session, f, sort=sort, limit=limit, cursor=cursor)
+
+        def via_index(f, sort, limit, cursor):
+            return index.query(session, f, sort=sort, limit=limit, cursor=cursor)
+
+        combos = itertools.product(
+            (None, reviews[0]["listing_id"], "hostaway:missing"),
+            (None, "guest_to_host"),
+            (None, 7.5),
+            (None, True, False),
+            (None, iso_to_epoch(mid_ts) + 0.5),
+        )
+        for listing, rtype, rating, approved, start in combos:
+            filters = ReviewFilters(
+                source=SOURCE,
+                listing_id=listing,
+                review_type=rtype,
+                min_rating=rating,
+                approved=approved,
+                start_ts=start,
+            )
+            for sort in ("date_desc", "date_asc", "rating_desc", "rating_asc"):
+                for limit in (None, 37):
+                    expected = _pages(via_sql, filters, sort, limit)
+                    assert _pages(via_index, filters, sort, limit) == expected
+
+
+def test_index_is_patched_after_approvals_and_ingest(portfolio):
+    index = ReviewIndex()
+    add_feed_listener(index.invalidate)
+    try:
+        with SessionLocal() as session:
+            filters = ReviewFilters(source=SOURCE, approved=True)
+            before, _ = index.query(session, filters)
+            target = next(
+                r
+                for r in portfolio
+                if r["review_id"] not in {x["review_id"] for x in before}
+            )
+            upsert_approvals(
+                session, [{"review_id": target["review_id"], "approved": True}]
+            )
+            after, _ = index.query(session, filters)
+            assert target["review_id"] in {r["review_id"] for r in after}
+            assert len(after) == len(before) + 1
+
+            upsert_reviews(
+                session, [{**target, "text_public": "patched"}], source=SOURCE
+            )
+            rows, _ = index.query(
+                session, ReviewFilters(source=SOURCE, listing_id=target["listing_id"])
+            )
+            assert {r["review_id"]: r for r in rows}[target["review_id"]][
+                "text_public"
+            ] == "patched"
+            sql_rows, _ = query_review_page(session, ReviewFilters(source=SOURCE))
+            assert index.query(session, ReviewFilters(source=SOURCE))[0] == sql_rows
+    finally:
+        remove_feed_listener(index.invalidate)
+        with SessionLocal() as session:
+            upsert_approvals(
+                session, [{"review_id": target["review_id"], "approved": False}]
+            )
+
+
+def test_changed_listings_are_patched_or_spliced_not_rebuilt():
+    source = "index-splice-test"
+    items = generate_hostaway_payload(120, n_listings=4, null_rating_rate=0.2, seed=5)
+    # Approvals are keyed by review_id alone: keep clear of the portfolio's
+    reviews = [
+        {**r, "review_id": f"splice-{r['review_id']}"}
+        for r in normalize_hostaway_items(items["result"])
+    ]
+    index = ReviewIndex()
+    add_feed_listener(index.invalidate)
+    try:
+        with SessionLocal() as session:
+            upsert_reviews(session, reviews, source=source)
+            index.query(session, ReviewFilters(source=source))
+            built = index._indexes[source]
+
+            # An approval flip patches the flag; the sort order is shared
+            upsert_approvals(
+                session, [{"review_id": reviews[0]["review_id"], "approved": True}]
+            )
+            index.query(session, ReviewFilters(source=source))
+            patched = index._indexes[source]
+            assert patched is not built and patched.ids is built.ids
+            assert patched.rating_order is built.rating_order
+            assert not built.approved.any() and patched.approved.sum() == 1
+
+            # New reviews, one tying an existing timestamp, one in a new
+            # listing on another channel, are spliced in at their positions
+            upsert_reviews(
+                session,
+                [
+                    {**reviews[5], "review_id": "splice-0-tie", "rating_overall": 9.5},
+                    {
+                        **reviews[7],
+                        "review_id": "splice-new",
+                        "listing_id": "hostaway:new",
+                        "channel": "airbnb",
+                    },
+                ],
+                source=source,
+            )
+
+            def via_sql(f, sort, limit, cursor):
+                return query_review_page(
+                    session, f, sort=sort, limit=limit, cursor=cursor
+                )
+
+            def via_index(f, sort, limit, cursor):
+                return index.query(session, f, sort=sort, limit=limit, cursor=cursor)
+
+            for filters in (
+                ReviewFilters(source=source),
+                ReviewFilters(source=source, channel="airbnb"),
+                ReviewFilters(source=source, listing_id="hostaway:new"),
+                ReviewFilters(source=source, approved=True),
+            ):
+                for sort in INDEX_SORTS:
+                    for limit in (None, 11):
+                        expected = _pages(via_sql, filters, sort, limit)
+                        assert _pages(via_index, filters, sort, limit) == expected
+            assert len(index.query(session, ReviewFilters(source=source))[0]) == 122
+    finally:
+        remove_feed_listener(index.invalidate)
+        with SessionLocal() as session:
+            upsert_approvals(
+                session, [{"review_id": reviews[0]["review_id"], "approved": False}]
+            )
+
+
+def test_index_defers_text_search_and_rejects_bad_cursor(portfolio):
+    index = ReviewIndex()
+    with SessionLocal() as session:
+        assert (
+            index.query(session, ReviewFilters(source=SOURCE, text_query="x")) is None
+        )
+        with pytest.raises(ValueError):
+            index.query(session, ReviewFilters(source=SOURCE), limit=1, cursor="WzFd")
+
+
+def test_queries_wait_for_a_rebuild_instead_of_reading_the_old_index(
+    portfolio, monkeypatch
+):
+    index = ReviewIndex()
+    filters = ReviewFilters(source=SOURCE, approved=True)
+    with SessionLocal() as session:
+        before = {r["review_id"] for r in index.query(session, filters)[0]}
+        target = next(r for r in portfolio if r["review_id"] not in before)
+        upsert_approvals(
+            session, [{"review_id": target["review_id"], "approved": True}]
+        )
+    index.invalidate([(SOURCE, target["listing_id"])])
+
+    loading, release = threading.Event(), threading.Event()
+    load = index._load
+
+    def slow_load(*args, **kwargs):
+        rows = load(*args, **kwargs)
+        loading.set()
+        assert release.wait(5)
+        return rows
+
+    monkeypatch.setattr(index, "_load", slow_load)
+    results = {}
+
+    def run(name):
+        with SessionLocal() as session:
+            results[name] = {r["review_id"] for r in index.query(session, filters)[0]}
+
+    builder = threading.Thread(target=run, args=("builder",))
+    reader = threading.Thread(target=run, args=("reader",))
+    try:
+        builder.start()
+        assert loading.wait(5)
+        # The rebuild is in flight: this query must not get the old index
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive()
+        release.set()
+        builder.join(5)
+        reader.join(5)
+        assert results["builder"] == results["reader"] == before | {
+            target["review_id"]
+        }
+        assert index.builds == 2
+    finally:
+        release.set()
+        with SessionLocal() as session:
+            upsert_approvals(
+                session, [{"review_id": target["review_id"], "approved": False}]
+            )
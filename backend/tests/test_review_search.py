@@ -0,0 +1,177 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from sqlalchemy import create_engine, text
+
+from backend.app.models.db import Base, SessionLocal, engine
+from backend.app.models.review_search import build_fts_query, create_review_fts
+from backend.app.models.reviews import (
+    Review,
+    ReviewFilters,
+    migrate_review_ids,
+    query_reviews,
+    upsert_reviews,
+)
+
+
+client = TestClient(app)
+
+
+def _search(**params):
+    resp = client.get("/api/reviews/hostaway", params={"source": "mock", **params})
+    assert resp.status_code == 200, resp.text
+    return resp.json()
+
+
+def test_build_fts_query_quotes_terms_and_keeps_operators():
+    assert build_fts_query("check-in") == '"check-in"'
+    assert build_fts_query('noise OR "very clean" clean*') == (
+        '"noise" OR "very clean" "clean"*'
+    )
+    assert build_fts_query("AND OR") is None
+    assert build_fts_query("clean NOT noise") == '"clean" NOT "noise"'
+    for q in ("NOT noise", "clean OR NOT noise"):
+        with pytest.raises(ValueError):
+            build_fts_query(q)
+    assert build_fts_query("") is None
+
+
+def test_text_search_filters_ranks_and_highlights():
+    rows = _search(q="noisy")["result"]
+    assert rows
+    for r in rows:
+        assert "noisy" in r["text_public"].lower()
+        assert "<mark>" in r["snippet"]
+    # Punctuation in terms is safe; prefix queries widen the match
+    assert _search(q="check-in")["result"]
+    prefixed = _search(q="spot*")["result"]
+    assert any("spotless" in r["text_public"].lower() for r in prefixed)
+
+
+def test_text_search_combines_with_filters_and_pagination():
+    everything = _search(q="the OR a OR and")["result"]
+    seen, cursor = [], None
+    while True:
+        params = {"q": "the OR a OR and", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = _search(**params)
+        seen += [r["review_id"] for r in page["result"]]
+        cursor = page["nextCursor"]
+        if not cursor:
+            break
+    assert seen == [r["review_id"] for r in everything]
+    high = _search(q="the OR a OR and", minRating=9)["result"]
+    assert all(r["rating_overall"] >= 9 for r in high)
+
+
+def test_leading_not_is_rejected():
+    for path in ("/api/reviews/hostaway", "/api/reviews/stats"):
+        resp = client.get(path, params={"source": "mock", "q": "NOT noisy"})
+        assert resp.status_code == 400
+
+
+def test_snippet_escapes_review_text():
+    review = {
+        "review_id": "xss-1",
+        "listing_id": "hostaway:xss",
+        "listing_name": "Xss",
+        "channel": "hostaway",
+        "type": "guest_to_host",
+        "status": "published",
+        "rating_overall": 9.0,
+        "category_ratings": {},
+        "text_public": "Loved it <script>alert(1)</script> & the zebracake",
+        "submitted_at": "2024-06-01T10:00:00Z",
+        "author_name": None,
+    }
+    with SessionLocal() as session:
+        upsert_reviews(session, [review], source="snippet-test")
+        filters = ReviewFilters(
+            source="snippet-test", text_query=build_fts_query("zebracake")
+        )
+        [row] = query_reviews(session, filters)
+    assert "<script>" not in row["snippet"]
+    assert "&lt;script&gt;" in row["snippet"]
+    assert "&amp; the <mark>zebracake</mark>" in row["snippet"]
+
+
+def _word_review(review_id, word):
+    return {
+        "review_id": review_id,
+        "listing_id": "hostaway:vacuum",
+        "listing_name": "Vacuum",
+        "channel": "hostaway",
+        "type": "guest_to_host",
+        "status": "published",
+        "rating_overall": 8.0,
+        "category_ratings": {},
+        "text_public": f"A stay with {word}",
+        "submitted_at": "2024-06-01T10:00:00Z",
+        "author_name": None,
+    }
+
+
+def _matches(session, source, word):
+    filters = ReviewFilters(source=source, text_query=build_fts_query(word))
+    return [row["review_id"] for row in query_reviews(session, filters)]
+
+
+def test_search_survives_vacuum_after_deletes():
+    words = ["quokka", "narwhal", "axolotl", "pangolin"]
+    reviews = [_word_review(f"vac-{i}", word) for i, word in enumerate(words)]
+    with SessionLocal() as session:
+        upsert_reviews(session, reviews, source="vacuum-test")
+        session.execute(
+            text("DELETE FROM reviews WHERE review_id IN ('vac-0', 'vac-2')")
+        )
+        session.commit()
+    with engine.connect() as conn:
+        conn.execution_options(isolation_level="AUTOCOMMIT").execute(
+            text("VACUUM")
+        )
+    with SessionLocal() as session:
+        assert _matches(session, "vacuum-test", "narwhal") == ["vac-1"]
+        assert _matches(session, "vacuum-test", "pangolin") == ["vac-3"]
+        assert _matches(session, "vacuum-test", "quokka") == []
+
+
+def test_store_without_review_ids_is_migrated(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(legacy)
+    with SessionLocal(bind=legacy) as session:
+        upsert_reviews(session, [_word_review("old-1", "wombat")], source="legacy")
+    # Recreate ``reviews`` as older versions had it: no ``id`` column
+    columns = ", ".join(c.name for c in Review.__table__.columns if c.name != "id")
+    with legacy.begin() as conn:
+        conn.execute(text(f"CREATE TABLE old AS SELECT {columns} FROM reviews"))
+        conn.execute(text("DROP TABLE reviews"))
+        conn.execute(text("ALTER TABLE old RENAME TO reviews"))
+
+    assert migrate_review_ids(legacy)
+    create_review_fts(legacy)
+    assert not migrate_review_ids(legacy)
+    with SessionLocal(bind=legacy) as session:
+        assert _matches(session, "legacy", "wombat") == ["old-1"]
+        upsert_reviews(
+            session,
+            [_word_review("old-1", "wombat"), _word_review("old-2", "wombat")],
+            source="legacy",
+        )
+        assert sorted(_matches(session, "legacy", "wombat")) == ["old-1", "old-2"]
+
+
+def test_relevance_sort_requires_query():
+    resp = client.get(
+        "/api/reviews/hostaway", params={"source": "mock", "sort": "relevance"}
+    )
+    assert resp.status_code == 400
+
+
+def test_stats_and_export_accept_text_query():
+    rows = _search(q="noisy")["result"]
+    stats = client.get("/api/reviews/stats", params={"source": "mock", "q": "noisy"})
+    assert stats.json()["result"]["portfolio"]["count"] == len(rows)
+    export = client.get("/api/reviews/export", params={"source": "mock", "q": "noisy"})
+    assert len(export.text.splitlines()) == len(rows)
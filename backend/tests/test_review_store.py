@@ -0,0 +1,226 @@
+from fastapi.testclient import TestClient
+
+from backend.app.api.reviews import DEFAULT_PAGE_SIZE
+from backend.app.api import reviews as reviews_api
+from backend.app.main import app
+from backend.app.models.db import SessionLocal
+from backend.app.models.change_log import latest_change_id
+from backend.app.models.reviews import (
+    Review,
+    ReviewFilters,
+    query_reviews,
+    upsert_reviews,
+)
+from backend.app.services.hostaway_adapter import (
+    load_hostaway_reviews,
+    normalize_hostaway_items,
+)
+from backend.app.services.ingest import ingest_source
+from backend.benchmarks.generator import generate_hostaway_payload
+
+
+client = TestClient(app)
+
+
+def test_store_matches_normalized_mock_payload():
+    with SessionLocal() as session:
+        ingest_source("mock")
+        stored = query_reviews(session, ReviewFilters(source="mock"))
+    expected = load_hostaway_reviews()
+    assert [r["review_id"] for r in stored] == [r["review_id"] for r in expected]
+    assert stored[0] == expected[0]
+
+
+def test_reingesting_unchanged_reviews_writes_nothing():
+    reviews = load_hostaway_reviews()
+    with SessionLocal() as session:
+        upsert_reviews(session, reviews, source="reingest")
+        stamps = dict(
+            session.query(Review.review_id, Review.ingested_at).filter_by(
+                source="reingest"
+            )
+        )
+        head = latest_change_id(session)
+        assert upsert_reviews(session, reviews, source="reingest") == 0
+        edited = [{**reviews[0], "text_public": "edited"}, *reviews[1:]]
+        assert upsert_reviews(session, edited, source="reingest") == 1
+        after = dict(
+            session.query(Review.review_id, Review.ingested_at).filter_by(
+                source="reingest"
+            )
+        )
+        assert latest_change_id(session) == head + 1
+    unchanged = [rid for rid in stamps if rid != reviews[0]["review_id"]]
+    assert all(after[rid] == stamps[rid] for rid in unchanged)
+
+
+def test_hostaway_route_filters_from_store():
+    resp = client.get(
+        "/api/reviews/hostaway",
+        params={"source": "mock", "minRating": 9, "startDate": "2024-01-01T00:00:00Z"},
+    )
+    assert resp.status_code == 200
+    rows = resp.json()["result"]
+    assert rows
+    for r in rows:
+        assert r["rating_overall"] >= 9
+        assert r["submitted_at"] >= "2024-01-01"
+
+
+def test_selected_reflects_approvals():
+    rid = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ][0]["review_id"]
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": True})
+    selected = client.get("/api/reviews/selected", params={"source": "mock"}).json()
+    assert rid in {r["review_id"] for r in selected["result"]}
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": False})
+    selected = client.get("/api/reviews/selected", params={"source": "mock"}).json()
+    assert rid not in {r["review_id"] for r in selected["result"]}
+
+
+def test_hostaway_route_keyset_pagination_covers_all_rows():
+    full = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()
+    assert full["nextCursor"] is None
+    for sort in ("date_desc", "rating_desc", "rating_asc"):
+        seen, cursor = [], None
+        while True:
+            params = {"source": "mock", "limit": 2, "sort": sort}
+            if cursor:
+                params["cursor"] = cursor
+            page = client.get("/api/reviews/hostaway", params=params).json()
+            assert len(page["result"]) <= 2
+            seen.extend(r["review_id"] for r in page["result"])
+            cursor = page["nextCursor"]
+            if not cursor:
+                break
+        assert sorted(seen) == sorted(r["review_id"] for r in full["result"])
+        assert len(seen) == len(set(seen))
+    ratings = [
+        r["rating_overall"]
+        for r in client.get(
+            "/api/reviews/hostaway", params={"source": "mock", "sort": "rating_desc"}
+        ).json()["result"]
+    ]
+    assert ratings == sorted(ratings, key=lambda x: -1 if x is None else x, reverse=True)
+
+
+async def _no_warm(source):
+    return None
+
+
+def test_hostaway_route_pages_by_default(monkeypatch):
+    # Read a test-only source as stored, without the mock/live mapping
+    monkeypatch.setattr(reviews_api, "resolve_source", lambda session, source: source)
+    monkeypatch.setattr(reviews_api, "awarm_source", _no_warm)
+    items = generate_hostaway_payload(DEFAULT_PAGE_SIZE + 30, n_listings=3)
+    with SessionLocal() as session:
+        upsert_reviews(
+            session, normalize_hostaway_items(items["result"]), source="paged"
+        )
+    body = client.get("/api/reviews/hostaway", params={"source": "paged"}).json()
+    assert len(body["result"]) == DEFAULT_PAGE_SIZE and body["nextCursor"]
+    params = {"source": "paged", "cursor": body["nextCursor"]}
+    rest = client.get("/api/reviews/hostaway", params=params).json()
+    assert len(rest["result"]) == 30 and rest["nextCursor"] is None
+
+
+def test_hostaway_route_rejects_bad_cursor():
+    resp = client.get(
+        "/api/reviews/hostaway", params={"source": "mock", "limit": 1, "cursor": "xx"}
+    )
+    assert resp.status_code == 400
+
+
+def test_cursor_with_wrong_value_types_is_rejected():
+    import pytest
+
+    from backend.app.models.reviews import (
+        ReviewFilters,
+        encode_cursor,
+        query_review_page,
+    )
+
+    bad = [
+        ("date_desc", [{}, []]),
+        ("date_asc", ["x", "y"]),
+        ("date_desc", [True, "id"]),
+        ("rating_desc", [9.5, "late", "id"]),
+    ]
+    with SessionLocal() as session:
+        for sort, values in bad:
+            with pytest.raises(ValueError):
+                query_review_page(
+                    session,
+                    ReviewFilters(source="mock"),
+                    sort=sort,
+                    limit=1,
+                    cursor=encode_cursor(values),
+                )
+    # The SQL path (text search) answers 400, not 500
+    resp = client.get(
+        "/api/reviews/hostaway",
+        params={
+            "source": "mock",
+            "q": "stay",
+            "sort": "date_desc",
+            "limit": 1,
+            "cursor": encode_cursor([{}, []]),
+        },
+    )
+    assert resp.status_code == 400
+
+
+def test_approval_lookup_only_returns_requested_ids():
+    from backend.app.models.approvals import get_approvals_for, upsert_approval
+
+    with SessionLocal() as session:
+        upsert_approval(session, review_id="lookup-1", approved=True)
+        upsert_approval(session, review_id="lookup-2", approved=False)
+        found = get_approvals_for(session, ["lookup-1", "lookup-2", "missing"])
+    assert found == {"lookup-1": True, "lookup-2": False}
+
+
+def test_bulk_approve_applies_all_items():
+    rows = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ]
+    items = [
+        {"review_id": r["review_id"], "approved": True, "listing_id": r["listing_id"]}
+        for r in rows[:3]
+    ]
+    resp = client.post("/api/reviews/approve/bulk", json={"items": items})
+    assert resp.json() == {"status": "success", "result": {"updated": 3}}
+    ids = {i["review_id"] for i in items}
+
+    def selected_ids():
+        resp = client.get("/api/reviews/selected", params={"source": "mock"})
+        return {r["review_id"] for r in resp.json()["result"]}
+
+    assert ids <= selected_ids()
+    off = [{**i, "approved": False} for i in items]
+    client.post("/api/reviews/approve/bulk", json={"items": off})
+    assert not ids & selected_ids()
+
+
+def test_stats_match_review_list():
+    params = {"source": "mock", "type": "guest_to_host"}
+    rows = client.get("/api/reviews/hostaway", params=params).json()["result"]
+    stats = client.get("/api/reviews/stats", params=params).json()["result"]
+    portfolio = stats["portfolio"]
+    rated = [r["rating_overall"] for r in rows if r["rating_overall"] is not None]
+    assert portfolio["count"] == len(rows)
+    assert portfolio["mean_rating"] == round(sum(rated) / len(rated), 2)
+    assert portfolio["rating_sum"] == sum(rated)
+    assert sum(x["rating_sum"] for x in stats["listings"]) == sum(rated)
+    assert portfolio["approved_count"] == sum(r["approved"] for r in rows)
+    assert portfolio["by_type"] == {"guest_to_host": len(rows)}
+    cleanliness = [
+        r["category_ratings"]["cleanliness"]
+        for r in rows
+        if "cleanliness" in r["category_ratings"]
+    ]
+    assert portfolio["category_means"]["cleanliness"] == round(
+        sum(cleanliness) / len(cleanliness), 2
+    )
+    assert sum(x["count"] for x in stats["listings"]) == len(rows)
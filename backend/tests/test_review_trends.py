@@ -0,0 +1,105 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.db import SessionLocal
+from backend.app.models.review_trends import compute_review_trends
+from backend.app.models.reviews import ReviewFilters, query_reviews, upsert_reviews
+from backend.app.services.hostaway_adapter import normalize_hostaway_items
+from backend.benchmarks.generator import generate_hostaway_payload
+
+SOURCE = "trend-test"
+
+
+@pytest.fixture(scope="module")
+def reviews():
+    items = generate_hostaway_payload(400, n_listings=4, null_rating_rate=0.2, seed=11)
+    normalized = normalize_hostaway_items(items["result"])
+    with SessionLocal() as session:
+        upsert_reviews(session, normalized, source=SOURCE)
+        return query_reviews(session, ReviewFilters(source=SOURCE))
+
+
+def _week(r) -> date:
+    day = datetime.fromisoformat(r["submitted_at"].replace("Z", "+00:00"))
+    day = day.astimezone(timezone.utc).date()
+    return day - timedelta(days=day.weekday())
+
+
+def test_weekly_listing_trends_match_a_brute_force_rollup(reviews):
+    with SessionLocal() as session:
+        trends = compute_review_trends(
+            session,
+            ReviewFilters(source=SOURCE),
+            bucket="week",
+            window=4,
+            by_listing=True,
+        )
+    by_key = defaultdict(list)
+    for r in reviews:
+        by_key[(r["listing_id"], _week(r))].append(r)
+
+    assert {s["listing_id"] for s in trends["series"]} == {
+        r["listing_id"] for r in reviews
+    }
+    for series in trends["series"]:
+        lid = series["listing_id"]
+        for point in series["points"]:
+            week = date.fromisoformat(point["bucket"])
+            assert week.weekday() == 0
+            own = by_key[(lid, week)]
+            rated = [
+                r["rating_overall"] for r in own if r["rating_overall"] is not None
+            ]
+            assert point["count"] == len(own)
+            assert point["mean_rating"] == (
+                round(sum(rated) / len(rated), 2) if rated else None
+            )
+            # Rolling: the last four calendar weeks, weighted by rated reviews
+            window = [
+                r
+                for k in range(4)
+                for r in by_key[(lid, week - timedelta(weeks=k))]
+                if r["rating_overall"] is not None
+            ]
+            expected = (
+                round(sum(r["rating_overall"] for r in window) / len(window), 2)
+                if window
+                else None
+            )
+            assert point["rolling_mean_rating"] == pytest.approx(expected, abs=0.011)
+            for name, mean in point["category_means"].items():
+                values = [
+                    r["category_ratings"][name]
+                    for r in own
+                    if name in r["category_ratings"]
+                ]
+                assert mean == round(sum(values) / len(values), 2)
+
+
+def test_portfolio_monthly_counts_add_up_and_filters_apply(reviews):
+    with SessionLocal() as session:
+        all_months = compute_review_trends(session, ReviewFilters(source=SOURCE))
+        high = compute_review_trends(
+            session, ReviewFilters(source=SOURCE, min_rating=9)
+        )
+    (series,) = all_months["series"]
+    assert series["listing_id"] is None
+    assert sum(p["count"] for p in series["points"]) == len(reviews)
+    assert "rolling_mean_rating" not in series["points"][0]
+    high_total = sum(p["count"] for p in high["series"][0]["points"])
+    assert high_total == sum(1 for r in reviews if (r["rating_overall"] or 0) >= 9)
+
+
+def test_trends_endpoint_validates_parameters():
+    client = TestClient(app)
+    ok = client.get("/api/reviews/trends", params={"source": "mock", "bucket": "day"})
+    assert ok.status_code == 200 and ok.json()["result"]["bucket"] == "day"
+    assert (
+        client.get("/api/reviews/trends", params={"bucket": "year"}).status_code == 400
+    )
+    assert client.get("/api/reviews/trends", params={"groupBy": "x"}).status_code == 400
+    assert client.get("/api/reviews/trends", params={"window": 0}).status_code == 422
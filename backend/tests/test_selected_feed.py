@@ -0,0 +1,162 @@
+import gzip
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+from backend.app.api.reviews import _not_modified
+from backend.app.main import app
+from backend.app.models.db import SessionLocal
+from backend.app.models.reviews import upsert_reviews
+from backend.app.services.compression import CompressionMiddleware, choose_encoding
+from backend.app.services.ingest import ingest_source
+
+client = TestClient(app)
+
+
+def test_selected_revalidates_with_etag_until_listing_changes():
+    ingest_source("mock")
+    review = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ][0]
+    rid, listing = review["review_id"], review["listing_id"]
+    params = {"source": "mock", "listingId": listing}
+
+    first = client.get("/api/reviews/selected", params=params)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"') and first.headers["last-modified"]
+
+    again = client.get(
+        "/api/reviews/selected", params=params, headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["etag"] == etag
+
+    # An approval flip changes the listing's version
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": True})
+    changed = client.get(
+        "/api/reviews/selected", params=params, headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert rid in {r["review_id"] for r in changed.json()["result"]}
+    etag = changed.headers["etag"]
+
+    # Re-ingesting identical reviews keeps it; edited review text bumps it
+    ingest_source("mock")
+    assert (
+        client.get(
+            "/api/reviews/selected", params=params, headers={"If-None-Match": etag}
+        ).status_code
+        == 304
+    )
+    with SessionLocal() as session:
+        upsert_reviews(session, [{**review, "text_public": "Edited"}], source="mock")
+    edited = client.get(
+        "/api/reviews/selected", params=params, headers={"If-None-Match": etag}
+    )
+    assert edited.status_code == 200
+    assert edited.headers["etag"] != etag
+
+    ingest_source("mock")
+    client.post("/api/reviews/approve", json={"review_id": rid, "approved": False})
+
+
+def test_other_listings_keep_their_etag():
+    rows = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ]
+    listings = sorted({r["listing_id"] for r in rows})
+    assert len(listings) >= 2
+    params = {"source": "mock", "listingId": listings[1]}
+    etag = client.get("/api/reviews/selected", params=params).headers["etag"]
+    target = next(r for r in rows if r["listing_id"] == listings[0])
+    client.post(
+        "/api/reviews/approve",
+        json={"review_id": target["review_id"], "approved": True},
+    )
+    resp = client.get(
+        "/api/reviews/selected", params=params, headers={"If-None-Match": etag}
+    )
+    assert resp.status_code == 304
+    client.post(
+        "/api/reviews/approve",
+        json={"review_id": target["review_id"], "approved": False},
+    )
+
+
+def test_if_modified_since_respects_etag_and_second_resolution():
+    etag = 'W/"abc"'
+    past = format_datetime(datetime(2024, 6, 1, tzinfo=timezone.utc), usegmt=True)
+    # If-None-Match wins over If-Modified-Since in both directions
+    assert _not_modified(etag, past, '"abc"', "garbage")
+    assert not _not_modified(etag, past, 'W/"old"', past)
+    assert _not_modified(etag, past, None, past)
+    assert not _not_modified(etag, past, None, "garbage")
+    # A change in the current second may be followed by another in the same
+    # second, so that Last-Modified never validates
+    now = format_datetime(datetime.now(timezone.utc), usegmt=True)
+    later = datetime.now(timezone.utc) + timedelta(seconds=5)
+    assert not _not_modified(etag, now, None, format_datetime(later, usegmt=True))
+
+
+def test_large_responses_are_gzipped_small_ones_are_not():
+    resp = client.get(
+        "/api/reviews/hostaway",
+        params={"source": "mock"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert resp.headers.get("content-encoding") == "gzip"
+    assert "Accept-Encoding" in resp.headers["vary"]
+    assert resp.json()["status"] == "success"  # decoded by the client
+
+    raw = client.get(
+        "/api/reviews/hostaway",
+        params={"source": "mock"},
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert "content-encoding" not in raw.headers
+    assert len(gzip.compress(raw.content)) < len(raw.content)
+
+    small = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_streamed_export_is_compressed_in_chunks():
+    resp = client.get(
+        "/api/reviews/export",
+        params={"source": "mock", "format": "ndjson"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert resp.headers.get("content-encoding") == "gzip"
+    assert resp.text.count("\n") > 1
+
+
+def test_range_responses_are_not_compressed():
+    body = b"x" * 4096
+
+    async def partial(request):
+        return Response(
+            body[:2048],
+            status_code=206,
+            headers={"Content-Range": f"bytes 0-2047/{len(body)}"},
+        )
+
+    async def ranged(request):
+        return Response(body, headers={"Content-Range": f"bytes */{len(body)}"})
+
+    plain = Starlette(routes=[Route("/partial", partial), Route("/ranged", ranged)])
+    ranged_client = TestClient(CompressionMiddleware(plain))
+    for path in ("/partial", "/ranged"):
+        resp = ranged_client.get(path, headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in resp.headers
+        assert "content-range" in resp.headers
+    assert len(ranged_client.get("/partial").content) == 2048
+
+
+def test_choose_encoding_honours_q_values():
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0") is None
+    assert choose_encoding("") is None
@@ -0,0 +1,76 @@
+import json
+import stat
+
+from fastapi.testclient import TestClient
+
+from backend.app.main import app
+from backend.app.models.approvals import upsert_approval
+from backend.app.models.db import SessionLocal
+from backend.app.services.ingest import ingest_source
+from backend.app.services.snapshots import SnapshotPublisher, snapshot_stem
+
+client = TestClient(app)
+
+
+def test_snapshots_follow_approvals_for_affected_listings_only(tmp_path):
+    ingest_source("mock")
+    rows = client.get("/api/reviews/hostaway", params={"source": "mock"}).json()[
+        "result"
+    ]
+    target = rows[0]
+    other = next(r for r in rows if r["listing_id"] != target["listing_id"])
+
+    publisher = SnapshotPublisher(root=tmp_path)
+    assert publisher.publish_all() >= 2
+    path = publisher.path_for("mock", target["listing_id"])
+    other_path = publisher.path_for("mock", other["listing_id"])
+    other_mtime = other_path.stat().st_mtime_ns
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    index = json.loads((tmp_path / "mock" / "index.json").read_text())
+    assert {x["listing_id"] for x in index["listings"]} >= {
+        target["listing_id"],
+        other["listing_id"],
+    }
+
+    publisher.start()
+    try:
+        with SessionLocal() as session:
+            upsert_approval(session, review_id=target["review_id"], approved=True)
+        publisher.wait()
+        snap = json.loads(path.read_text())
+        assert target["review_id"] in {r["review_id"] for r in snap["reviews"]}
+        assert snap["summary"]["approved_count"] == len(snap["reviews"])
+        assert "approved" not in snap["reviews"][0]
+        html = publisher.path_for("mock", target["listing_id"], "html").read_text()
+        assert "rev-card" in html
+        assert other_path.stat().st_mtime_ns == other_mtime
+
+        with SessionLocal() as session:
+            upsert_approval(session, review_id=target["review_id"], approved=False)
+        publisher.wait()
+        snap = json.loads(path.read_text())
+        assert target["review_id"] not in {r["review_id"] for r in snap["reviews"]}
+    finally:
+        publisher.stop()
+    assert not list(tmp_path.rglob(".*.json.*"))  # no temp files left behind
+
+
+def test_snapshot_stem_is_file_safe():
+    assert snapshot_stem("hostaway:61148:flat-1") == "hostaway_61148_flat-1"
+
+
+def test_published_snapshots_are_served_as_static_files():
+    from backend.app.services.snapshots import snapshot_publisher
+
+    ingest_source("mock")
+    snapshot_publisher.publish_all()
+    index = client.get("/snapshots/mock/index.json")
+    assert index.status_code == 200
+    first = index.json()["listings"][0]
+    resp = client.get(f"/snapshots/{first['path']}")
+    assert resp.status_code == 200
+    assert resp.json()["listing_id"] == first["listing_id"]
+    again = client.get(
+        f"/snapshots/{first['path']}", headers={"If-None-Match": resp.headers["etag"]}
+    )
+    assert again.status_code == 304
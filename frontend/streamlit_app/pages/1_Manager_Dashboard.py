@@ -1,10 +1,16 @@
 import datetime as dt
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 import streamlit as st
 
-from utils.api_client import approve_review, get_reviews, get_google_reviews
+from utils.api_client import (
+    approve_reviews_bulk,
+    get_google_reviews,
+    get_listings,
+    get_review_pages,
+    get_review_stats,
+)
 from utils.theme import render_kpi, render_badge
 
 
@@ -12,10 +18,31 @@ st.set_page_config(page_title="Manager Dashboard", layout="wide")
 st.title("Manager Dashboard")
 
 
+PAGE_SIZE = 200
+
+
+# Reviews and stats are not cached here: the API caches each filter
+# combination and invalidates it when approvals or ingests change the data
+def fetch_reviews(
+    params: Dict[str, Any], pages: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Fetch the first ``pages`` pages; also report whether more rows exist."""
+    rows: List[Dict[str, Any]] = []
+    has_more = False
+    for page in get_review_pages(params, page_size=PAGE_SIZE, max_pages=pages):
+        rows.extend(page.get("result", []))
+        has_more = bool(page.get("nextCursor"))
+    return rows, has_more
+
+
 @st.cache_data(ttl=60)
-def fetch_reviews(params: Dict[str, Any]) -> List[Dict[str, Any]]:
-    data = get_reviews(params)
-    return data.get("result", [])
+def fetch_listings(src: str) -> Dict[str, str]:
+    """Listing name -> listing ID, ordered by name."""
+    return {x["listing_name"]: x["listing_id"] for x in get_listings(src)}
+
+
+def fetch_stats(params: Dict[str, Any]) -> Dict[str, Any]:
+    return get_review_stats(params).get("result", {})
 
 
 with st.sidebar:
@@ -28,12 +55,20 @@ with st.sidebar:
         "Type", options=["All", "guest_to_host", "host_to_guest"], index=0
     )
     status = st.selectbox("Status", options=["All", "published"], index=0)
+    search = st.text_input(
+        "Search review text",
+        placeholder='e.g. noise, "check-in", clean*',
+    )
     source = st.selectbox(
         "Data source",
         options=["auto", "mock", "live"],
         index=0,
         help="Use 'mock' for provided JSON; 'live' if you have Hostaway API credentials",
     )
+    listing_ids = fetch_listings(source)
+    listings = list(listing_ids)
+    # Filtered by the API, so the table, paging and KPIs all cover the listing
+    selected_listing = st.selectbox("Listing", options=["All"] + listings, index=0)
 
 params = {
     "startDate": dt.datetime.combine(start_date, dt.time.min).isoformat() + "Z",
@@ -45,35 +80,36 @@ if review_type != "All":
     params["type"] = review_type
 if status != "All":
     params["status"] = status
+if search.strip():
+    params["q"] = search.strip()
+if selected_listing != "All":
+    params["listingId"] = listing_ids[selected_listing]
+
+# Reset paging whenever the filters change
+if st.session_state.get("review_params") != params:
+    st.session_state["review_params"] = dict(params)
+    st.session_state["review_pages"] = 1
 
-reviews = fetch_reviews(params)
+reviews, has_more = fetch_reviews(params, st.session_state["review_pages"])
 df = pd.DataFrame(reviews)
+stats = fetch_stats(params)
+listing_stats = stats.get("listings", [])
 
 if df.empty:
     st.info("No reviews match the current filters. Adjust filters to see results.")
-    listings: List[str] = []
-else:
-    listings = (
-        sorted(df["listing_name"].dropna().unique().tolist())
-        if "listing_name" in df.columns
-        else []
-    )
-
-with st.sidebar:
-    selected_listings = st.multiselect(
-        "Listings", options=listings, default=listings if listings else []
-    )
 
-if selected_listings and not df.empty and "listing_name" in df.columns:
-    df = df[df["listing_name"].isin(selected_listings)]
-
-if not df.empty:
-    # KPI cards (styled)
+# KPIs come from the server-side aggregates, so they cover every matching
+# review rather than just the pages loaded into the table
+kpi_rows = listing_stats
+if kpi_rows:
+    total = sum(x["count"] for x in kpi_rows)
+    rated = sum(x["rated_count"] for x in kpi_rows)
+    rating_sum = sum(x["rating_sum"] for x in kpi_rows)
     kpi_html = (
         "<div class='flx-kpi-grid'>"
-        + render_kpi("Reviews", str(len(df)))
-        + render_kpi("Average rating", f"{df['rating_overall'].dropna().mean():.2f}")
-        + render_kpi("Approved", str(int(df["approved"].sum())))
+        + render_kpi("Reviews", str(total))
+        + render_kpi("Average rating", f"{rating_sum / rated:.2f}" if rated else "-")
+        + render_kpi("Approved", str(sum(x["approved_count"] for x in kpi_rows)))
         + "</div>"
     )
     st.markdown(kpi_html, unsafe_allow_html=True)
@@ -108,34 +144,44 @@ if not df.empty:
         }
     )
     st.dataframe(show_df, hide_index=True, use_container_width=True)
+    if has_more and st.button("Load more", key="load_more_reviews_btn"):
+        st.session_state["review_pages"] += 1
+        st.rerun()
 
 if not df.empty:
     st.divider()
     st.subheader("Approval actions")
     ids = df["review_id"].astype(str).tolist()
     selected_ids = st.multiselect("Select review IDs", options=ids)
+    listing_by_id = dict(zip(ids, df["listing_id"].tolist()))
+
+    def approval_items(review_ids: List[str], approved: bool) -> List[Dict[str, Any]]:
+        return [
+            {
+                "review_id": rid,
+                "approved": approved,
+                "channel": "hostaway",
+                "listing_id": listing_by_id.get(rid),
+            }
+            for rid in review_ids
+        ]
+
     col_a, col_b = st.columns(2)
     with col_a:
         if (
             st.button("Approve selected", type="primary", key="approve_selected_btn")
             and selected_ids
         ):
-            for rid in selected_ids:
-                row = df[df["review_id"].astype(str) == rid].iloc[0]
-                approve_review(review_id=str(rid), approved=True, channel="hostaway", listing_id=row["listing_id"])  # type: ignore
+            approve_reviews_bulk(approval_items(selected_ids, True))
             st.success(f"Approved {len(selected_ids)} review(s)")
-            st.cache_data.clear()
             st.rerun()
     with col_b:
         if (
             st.button("Unapprove selected", key="unapprove_selected_btn")
             and selected_ids
         ):
-            for rid in selected_ids:
-                row = df[df["review_id"].astype(str) == rid].iloc[0]
-                approve_review(review_id=str(rid), approved=False, channel="hostaway", listing_id=row["listing_id"])  # type: ignore
+            approve_reviews_bulk(approval_items(selected_ids, False))
             st.success(f"Unapproved {len(selected_ids)} review(s)")
-            st.cache_data.clear()
             st.rerun()
 
 st.divider()
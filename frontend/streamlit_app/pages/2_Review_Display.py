@@ -3,7 +3,13 @@ from typing import Dict, List
 import pandas as pd
 import streamlit as st
 
-from utils.api_client import get_reviews, get_selected_reviews
+from utils.api_client import (
+    get_all_reviews,
+    get_listing_snapshot,
+    get_listings,
+    get_review_stats,
+    get_selected_reviews,
+)
 from utils.theme import inject_theme, render_stars
 
 
@@ -50,13 +56,7 @@ with st.sidebar:
 
 @st.cache_data(ttl=60)
 def all_listings(src: str) -> List[Dict]:
-    res = get_reviews({"source": src})
-    rows = res.get("result", [])
-    # Build unique listing list
-    seen = {}
-    for r in rows:
-        seen[r["listing_id"]] = r["listing_name"]
-    return [{"listing_id": k, "listing_name": v} for k, v in seen.items()]
+    return get_listings(src)
 
 
 listings = all_listings(source)
@@ -70,14 +70,17 @@ listing_display = {
 choice = st.selectbox("Select a listing", options=list(listing_display.keys()))
 selected_listing_id = listing_display[choice]
 
-data = get_selected_reviews(selected_listing_id, source)
-rows = data.get("result", [])
-if not rows:
+# Static snapshot first: no database or upstream work per page view
+snapshot = get_listing_snapshot(selected_listing_id, source)
+rows = snapshot["reviews"] if snapshot else []
+if not snapshot:
+    data = get_selected_reviews(selected_listing_id, source)
+    rows = data.get("result", [])
+if not rows and not snapshot:
     # Try fetching via the main reviews endpoint with approved=true using the same source
-    data = get_reviews(
+    rows = get_all_reviews(
         {"source": source, "listingId": selected_listing_id, "approved": True}
     )
-    rows = data.get("result", [])
 
 if not rows:
     st.warning("No approved reviews yet for this listing.")
@@ -93,12 +96,16 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-avg = (
-    sum([r.get("rating_overall") or 0 for r in rows])
-    / max(1, len([r for r in rows if r.get("rating_overall") is not None]))
-    if rows
-    else 0
+summary = (
+    snapshot["summary"]
+    if snapshot
+    else get_review_stats(
+        {"source": source, "listingId": selected_listing_id, "approved": True}
+    )
+    .get("result", {})
+    .get("portfolio", {})
 )
+avg = summary.get("mean_rating") or 0
 st.markdown(
     f"""
     <div class='rev-container'>
@@ -1,5 +1,6 @@
 import os
-from typing import Any, Dict, Optional
+import re
+from typing import Any, Dict, Iterator, List, Optional
 
 import requests
 from dotenv import load_dotenv
@@ -28,6 +29,56 @@ def get_reviews(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     return api_get("/api/reviews/hostaway", params=params)
 
 
+def get_review_pages(
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = 500,
+    max_pages: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield keyset-paginated responses from /api/reviews/hostaway in order."""
+    query: Dict[str, Any] = {**(params or {}), "limit": page_size}
+    pages = 0
+    while True:
+        page = get_reviews(query)
+        yield page
+        pages += 1
+        cursor = page.get("nextCursor")
+        if not cursor or (max_pages is not None and pages >= max_pages):
+            return
+        query["cursor"] = cursor
+
+
+def get_all_reviews(
+    params: Optional[Dict[str, Any]] = None, page_size: int = 500
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for page in get_review_pages(params, page_size=page_size):
+        rows.extend(page.get("result", []))
+    return rows
+
+
+def get_review_stats(params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Portfolio and per-listing KPIs; accepts the same filters as get_reviews."""
+    return api_get("/api/reviews/stats", params=params)
+
+
+def get_listings(
+    source: Optional[str] = None, prefix: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Listing index: IDs, names, channel, counts, average rating, last review."""
+    params: Dict[str, Any] = {"limit": 1000}
+    if source:
+        params["source"] = source
+    if prefix:
+        params["q"] = prefix
+    rows: List[Dict[str, Any]] = []
+    while True:
+        page = api_get("/api/listings", params=params)
+        rows.extend(page.get("result", []))
+        if not page.get("nextCursor"):
+            return rows
+        params["cursor"] = page["nextCursor"]
+
+
 def approve_review(
     review_id: str,
     approved: bool,
@@ -45,6 +96,14 @@ def approve_review(
     )
 
 
+def approve_reviews_bulk(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Approve/unapprove many reviews in one request.
+
+    Each item has ``review_id``, ``approved`` and optional ``channel``/``listing_id``.
+    """
+    return api_post("/api/reviews/approve/bulk", {"items": items})
+
+
 def get_selected_reviews(
     listing_id: Optional[str] = None, source: Optional[str] = None
 ) -> Dict[str, Any]:
@@ -56,6 +115,25 @@ def get_selected_reviews(
     return api_get("/api/reviews/selected", params=params)
 
 
+def get_listing_snapshot(
+    listing_id: str, source: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """Pre-rendered approved reviews and summary of a listing, or None.
+
+    Reads the static file the backend publishes under /snapshots; ``auto``
+    tries live before mock. Callers fall back to the API when it is missing.
+    """
+    stem = re.sub(r"[^A-Za-z0-9._-]", "_", listing_id)
+    sources = ["live", "mock"] if (source or "auto") == "auto" else [source]
+    for src in sources:
+        resp = requests.get(f"{API_BASE_URL}/snapshots/{src}/{stem}.json", timeout=20)
+        if resp.status_code == 404:
+            continue
+        resp.raise_for_status()
+        return resp.json()
+    return None
+
+
 def get_google_reviews(
     query: Optional[str] = None,
     place_id: Optional[str] = None,
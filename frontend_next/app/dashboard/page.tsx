@@ -1,28 +1,55 @@
 "use client"
-import { useEffect, useMemo, useState } from 'react'
-import { approveReview, getReviews, type NormalizedReview } from '@/lib/api'
+import { useEffect, useState } from 'react'
+import { approveReview, getReviews, getReviewStats, subscribeReviewEvents, type NormalizedReview, type ReviewSummary } from '@/lib/api'
 
 export default function DashboardPage() {
   const [rows, setRows] = useState<NormalizedReview[]>([])
   const [loading, setLoading] = useState(true)
   const [source, setSource] = useState<'auto' | 'mock' | 'live'>('auto')
   const [minRating, setMinRating] = useState(0)
+  const [cursor, setCursor] = useState<string | null>(null)
+  const [summary, setSummary] = useState<ReviewSummary | null>(null)
+  const [reloads, setReloads] = useState(0)
 
   useEffect(() => {
     const run = async () => {
       setLoading(true)
       const res = await getReviews({ source, minRating })
       setRows(res.result)
+      setCursor(res.nextCursor)
       setLoading(false)
     }
     run()
+  }, [source, minRating, reloads])
+
+  // Apply other managers' approvals and new reviews as deltas instead of refetching
+  useEffect(() => {
+    return subscribeReviewEvents({
+      onApproval: e => setRows(prev => prev.map(x => x.review_id === e.review_id ? { ...x, approved: e.approved } : x)),
+      onReview: ({ review }) => setRows(prev => {
+        if (prev.some(x => x.review_id === review.review_id)) {
+          return prev.map(x => x.review_id === review.review_id ? review : x)
+        }
+        // Same rule as the server's minRating filter: unrated reviews never match
+        const matches = review.rating_overall !== null && review.rating_overall >= minRating
+        return matches ? [review, ...prev] : prev
+      }),
+      onReset: () => setReloads(n => n + 1),
+    }, source)
   }, [source, minRating])
 
-  const avg = useMemo(() => {
-    const nums = rows.map(r => r.rating_overall).filter((n): n is number => n != null)
-    if (!nums.length) return 0
-    return +(nums.reduce((a, b) => a + b, 0) / nums.length).toFixed(2)
-  }, [rows])
+  useEffect(() => {
+    getReviewStats({ source, minRating }).then(res => setSummary(res.result.portfolio))
+  }, [source, minRating, rows])
+
+  const loadMore = async () => {
+    if (!cursor) return
+    const res = await getReviews({ source, minRating }, cursor)
+    setRows(prev => [...prev, ...res.result])
+    setCursor(res.nextCursor)
+  }
+
+  const avg = summary?.mean_rating ?? 0
 
   return (
     <main className="container-narrow py-8 space-y-6">
@@ -47,9 +74,9 @@ export default function DashboardPage() {
       </div>
 
       <div className="grid md:grid-cols-3 gap-3">
-        <div className="card p-4"><div className="text-neutral-400 text-sm">Reviews</div><div className="text-2xl font-bold">{rows.length}</div></div>
+        <div className="card p-4"><div className="text-neutral-400 text-sm">Reviews</div><div className="text-2xl font-bold">{summary?.count ?? rows.length}</div></div>
         <div className="card p-4"><div className="text-neutral-400 text-sm">Average rating</div><div className="text-2xl font-bold">{avg}</div></div>
-        <div className="card p-4"><div className="text-neutral-400 text-sm">Approved</div><div className="text-2xl font-bold">{rows.filter(r => r.approved).length}</div></div>
+        <div className="card p-4"><div className="text-neutral-400 text-sm">Approved</div><div className="text-2xl font-bold">{summary?.approved_count ?? 0}</div></div>
       </div>
 
       <div className="card overflow-hidden">
@@ -88,6 +115,11 @@ export default function DashboardPage() {
           </tbody>
         </table>
       </div>
+      {cursor && !loading && (
+        <div className="flex justify-center">
+          <button onClick={loadMore} className="card px-4 py-2">Load more</button>
+        </div>
+      )}
     </main>
   )
 }
@@ -1,19 +1,17 @@
 "use client"
 import { useEffect, useMemo, useState } from 'react'
-import { getReviews, getSelected, type NormalizedReview } from '@/lib/api'
+import { getAllReviews, getListings, getListingSnapshot, getSelected, type SnapshotReview } from '@/lib/api'
 
 export default function PropertyPage() {
   const [source, setSource] = useState<'auto' | 'mock' | 'live'>('auto')
   const [listings, setListings] = useState<{ id: string; name: string }[]>([])
   const [listingId, setListingId] = useState<string>('')
-  const [rows, setRows] = useState<NormalizedReview[]>([])
+  const [rows, setRows] = useState<SnapshotReview[]>([])
 
   useEffect(() => {
     const run = async () => {
-      const res = await getReviews({ source })
-      const seen = new Map<string, string>()
-      res.result.forEach(r => seen.set(r.listing_id, r.listing_name))
-      const arr = Array.from(seen.entries()).map(([id, name]) => ({ id, name }))
+      const res = await getListings({ source })
+      const arr = res.result.map(l => ({ id: l.listing_id, name: l.listing_name }))
       setListings(arr)
       if (arr.length && !listingId) setListingId(arr[0].id)
     }
@@ -23,10 +21,16 @@ export default function PropertyPage() {
   useEffect(() => {
     const run = async () => {
       if (!listingId) return
+      // Static snapshot first; the API is only a fallback
+      const snap = await getListingSnapshot(listingId, source)
+      if (snap) {
+        setRows(snap.reviews)
+        return
+      }
       const sel = await getSelected(listingId, source)
-      let data = sel.result
+      let data: SnapshotReview[] = sel.result
       if (!data.length) {
-        const alt = await getReviews({ source, listingId, approved: true })
+        const alt = await getAllReviews({ source, listingId, approved: true })
         data = alt.result
       }
       setRows(data)
@@ -10,6 +10,7 @@ export type NormalizedReview = {
   text_public: string | null
   submitted_at: string
   author_name: string | null
+  account_id?: string | null
   approved: boolean
 }
 
@@ -38,9 +39,83 @@ async function http<T>(path: string, init?: RequestInit): Promise<T> {
   return res.json() as Promise<T>
 }
 
-export async function getReviews(params: Record<string, string | number | boolean> = {}) {
+export type ReviewPage = { status: string; result: NormalizedReview[]; nextCursor: string | null }
+
+export const PAGE_SIZE = 200
+
+// Fetch one keyset-paginated page; pass the previous page's nextCursor to continue
+export async function getReviews(
+  params: Record<string, string | number | boolean> = {},
+  cursor?: string | null,
+  limit: number = PAGE_SIZE,
+) {
+  const query = new URLSearchParams(params as Record<string, string>)
+  query.set('limit', String(limit))
+  if (cursor) query.set('cursor', cursor)
+  return http<ReviewPage>(`/api/reviews/hostaway?${query.toString()}`)
+}
+
+export async function getAllReviews(params: Record<string, string | number | boolean> = {}) {
+  const rows: NormalizedReview[] = []
+  let cursor: string | null = null
+  do {
+    const page: ReviewPage = await getReviews(params, cursor)
+    rows.push(...page.result)
+    cursor = page.nextCursor
+  } while (cursor)
+  return { status: 'success', result: rows }
+}
+
+export type ReviewSummary = {
+  count: number
+  rated_count: number
+  rating_sum: number
+  mean_rating: number | null
+  median_rating: number | null
+  approved_count: number
+  approval_rate: number | null
+  category_means: Record<string, number>
+  by_type: Record<string, number>
+  by_status: Record<string, number>
+}
+
+export type ReviewStats = {
+  portfolio: ReviewSummary
+  listings: (ReviewSummary & { listing_id: string; listing_name: string })[]
+}
+
+export async function getReviewStats(params: Record<string, string | number | boolean> = {}) {
   const query = new URLSearchParams(params as Record<string, string>)
-  return http<{ status: string; result: NormalizedReview[] }>(`/api/reviews/hostaway?${query.toString()}`)
+  return http<{ status: string; result: ReviewStats }>(`/api/reviews/stats?${query.toString()}`)
+}
+
+export type ListingSummary = {
+  listing_id: string
+  listing_name: string
+  channel: string
+  review_count: number
+  approved_count: number
+  average_rating: number | null
+  last_review_at: string | null
+}
+
+type ListingPage = { status: string; result: ListingSummary[]; nextCursor: string | null }
+
+// Listing index for pickers, every page; `q` filters by name prefix
+export async function getListings(params: { source?: string; q?: string } = {}) {
+  const query = new URLSearchParams()
+  if (params.source) query.set('source', params.source)
+  if (params.q) query.set('q', params.q)
+  query.set('limit', '1000')
+  const rows: ListingSummary[] = []
+  let cursor: string | null = null
+  do {
+    if (cursor) query.set('cursor', cursor)
+    const page: ListingPage = await http<ListingPage>(`/api/listings?${query.toString()}`)
+    rows.push(...page.result)
+    cursor = page.nextCursor
+  } while (cursor)
+  return { status: 'success', result: rows }
 }
 
 export async function approveReview(review_id: string, approved: boolean, listing_id?: string) {
@@ -50,6 +125,37 @@ export async function approveReview(review_id: string, approved: boolean, listin
   })
 }
 
+export type ApproveItem = { review_id: string; approved: boolean; channel?: string; listing_id?: string }
+
+export async function approveReviewsBulk(items: ApproveItem[]) {
+  return http<{ status: string; result: { updated: number } }>(`/api/reviews/approve/bulk`, {
+    method: 'POST',
+    body: JSON.stringify({ items: items.map(i => ({ channel: 'hostaway', ...i })) }),
+  })
+}
+
+export type ApprovalEvent = { source: string | null; review_id: string; listing_id: string | null; approved: boolean }
+export type ReviewEvent = { source: string; review: NormalizedReview }
+
+export type ReviewEventHandlers = {
+  onApproval?: (e: ApprovalEvent) => void
+  onReview?: (e: ReviewEvent) => void
+  // The server could not resume from our last event: refetch everything
+  onReset?: () => void
+}
+
+// Live approval changes and new/edited reviews from /api/events.
+// EventSource reconnects by itself and resumes with Last-Event-ID. Returns a close function.
+export function subscribeReviewEvents(handlers: ReviewEventHandlers, source?: string) {
+  const query = new URLSearchParams()
+  if (source) query.set('source', source)
+  const events = new EventSource(buildUrl(`/api/events?${query.toString()}`))
+  events.addEventListener('approval', e => handlers.onApproval?.(JSON.parse((e as MessageEvent).data)))
+  events.addEventListener('review', e => handlers.onReview?.(JSON.parse((e as MessageEvent).data)))
+  events.addEventListener('reset', () => handlers.onReset?.())
+  return () => events.close()
+}
+
 export async function getSelected(listingId?: string, source?: string) {
   const query = new URLSearchParams()
   if (listingId) query.set('listingId', listingId)
@@ -57,6 +163,41 @@ export async function getSelected(listingId?: string, source?: string) {
   return http<{ status: string; result: NormalizedReview[] }>(`/api/reviews/selected?${query.toString()}`)
 }
 
+export type SnapshotReview = Pick<
+  NormalizedReview,
+  'review_id' | 'type' | 'rating_overall' | 'category_ratings' | 'text_public' | 'submitted_at' | 'author_name'
+>
+
+export type ListingSnapshot = {
+  source: string
+  listing_id: string
+  listing_name: string
+  channel: string
+  version: number
+  generated_at: string
+  summary: {
+    review_count: number
+    approved_count: number
+    mean_rating: number | null
+    category_means: Record<string, number>
+    last_review_at: string | null
+  }
+  reviews: SnapshotReview[]
+}
+
+// Static per-listing snapshot published by the backend; null when missing.
+// 'auto' tries live before mock. Served as plain files, so the browser may cache.
+export async function getListingSnapshot(listingId: string, source: string = 'auto') {
+  const stem = listingId.replace(/[^A-Za-z0-9._-]/g, '_')
+  for (const src of source === 'auto' ? ['live', 'mock'] : [source]) {
+    const res = await fetch(buildUrl(`/snapshots/${src}/${stem}.json`))
+    if (res.status === 404) continue
+    if (!res.ok) throw new Error(`HTTP ${res.status} snapshot ${src}/${stem}`)
+    return (await res.json()) as ListingSnapshot
+  }
+  return null
+}
+
 export async function getGoogleReviews(params: { query?: string; placeId?: string; listingId?: string }) {
   const query = new URLSearchParams()
   if (params.query) query.set('query', params.query)